@@ -0,0 +1,261 @@
+import argparse
+import sys
+
+
+# ============================================================================
+# 명령행 도구
+# ============================================================================
+#
+# 조회용 하위 명령은 필요한 모듈만 함수 안에서 import 하므로 matplotlib을 로드하지 않는다.
+#   python cli.py steps                          step별 태그 수
+#   python cli.py tags 19 --file data.h5         step 19 태그 (파일의 컬럼명/설명 포함)
+#   python cli.py info data.h5                   파일 메타데이터 요약 (데이터는 읽지 않음)
+#   python cli.py search "LP drum level HRSG-2" --file a.h5 b.h5   태그명/설명 검색 (관련도 순)
+#   python cli.py events data.h5 --step 19       step 19 DIO 이벤트 (해당 컬럼만 로드)
+#   python cli.py kpi data.h5                    설비 KPI 요약
+#   python cli.py ingest data.h5 --store store   새 export를 증분 저장소에 추가 (마지막 시각 이후 행만)
+#   python cli.py kpi store --start 2024-08-31   저장소의 해당 구간만 읽어 KPI 계산
+#   python cli.py quality data.h5                데이터 품질 점검 (문제가 있는 태그 요약)
+#   python cli.py startup data/ --workers 4      디렉터리 기동 리포트
+#   python cli.py run job.json --workers 4       작업 명세대로 일괄 렌더링 (utils/batch.py)
+#   python cli.py run job.json --report r.pdf    모든 그림을 PDF(또는 .html) 리포트 하나로 출력
+#   python cli.py run job.json --export export   step 데이터를 컬럼형(.npy + manifest)으로도 내보내기
+
+
+def _write_table(table, output=None):
+    # output이 있으면 CSV로 저장, 없으면 화면 출력
+    if output:
+        table.to_csv(output, index=False, encoding='utf-8-sig')
+        print(f"✅ 저장: {output} ({len(table)}행)")
+    else:
+        import pandas as pd
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(table.to_string(index=False))
+
+
+def _step_tags(step):
+    from utils.step_tags import step_tags
+
+    if not 1 <= step <= len(step_tags):
+        raise SystemExit(f"❌ step 번호는 1~{len(step_tags)} 범위여야 합니다: {step}")
+    return list(dict.fromkeys(step_tags[step - 1]))
+
+
+def cmd_steps(args):
+    from utils.step_tags import step_tags
+
+    for i, tags in enumerate(step_tags):
+        if tags or args.all:
+            print(f"Step {i + 1:02d}: {len(tags)}개")
+
+
+def cmd_tags(args):
+    tags = _step_tags(args.step)
+    if not args.file:
+        print('\n'.join(tags))
+        return
+
+    import pandas as pd
+    from utils.load_file import load_hdf5_schema
+    from utils.local_store import build_tag_index
+
+    schema = load_hdf5_schema(args.file)
+    tag_columns = build_tag_index(schema)
+    _write_table(pd.DataFrame({'tag': tags, 'column': [tag_columns.get(tag) for tag in tags]}), args.output)
+
+
+def cmd_info(args):
+    from utils.load_file import load_hdf5_schema, print_metadata_summary
+
+    schema = load_hdf5_schema(args.file)
+    print(f"컬럼: {len(schema.columns)}개")
+    print_metadata_summary(schema)
+
+
+def cmd_search(args):
+    import pandas as pd
+    from utils.tag_search import TagSearchIndex
+
+    index = TagSearchIndex.from_files(args.file, cache_dir=args.cache_dir, refresh=args.refresh)
+    hits = index.search(args.query, args.limit)
+    table = pd.DataFrame(hits, columns=['tag', 'description', 'score', 'matched', 'files'])
+    table['files'] = table['files'].map(', '.join)
+    _write_table(table, args.output)
+
+
+def cmd_events(args):
+    from utils.load_file import load_hdf5_schema, load_hdf5_columns
+    from utils.local_store import build_tag_index
+    from utils.data_extraction import update_signal_catalog
+    from utils.events import detect_dio_events
+
+    tags = _step_tags(args.step)
+    tag_columns = build_tag_index(load_hdf5_schema(args.file))
+    tag_columns = {tag: tag_columns[tag] for tag in tags if tag in tag_columns}
+    df = load_hdf5_columns(args.file, [args.time_column] + list(tag_columns.values()))
+    df.attrs = {}
+
+    catalog = update_signal_catalog({}, df, tag_columns)
+    dio_tags = [tag for tag, entry in catalog.items() if entry['type'] == 'dio']
+    frame = df[[tag_columns[tag] for tag in dio_tags]].set_axis(dio_tags, axis=1)
+    frame[args.time_column] = df[args.time_column]
+
+    events, _ = detect_dio_events(frame, dio_tags, args.time_column)
+    _write_table(events[events['position'] > 0], args.output)
+
+
+def cmd_ingest(args):
+    from utils.local_store import ingest_hdf5_file
+
+    for file_path in args.file:
+        ingest_hdf5_file(file_path, args.store, time_column=args.time_column)
+
+
+def cmd_kpi(args):
+    from pathlib import Path
+
+    if Path(args.file).is_dir():
+        from utils.kpi import store_kpis
+
+        details, summary = store_kpis(args.file, args.start, args.end)
+    else:
+        from utils.kpi import file_kpis
+
+        details, summary = file_kpis(args.file, cache_dir=args.cache_dir, refresh=args.refresh,
+                                     quality_mask=args.quality_mask)
+    if summary is not None:
+        _write_table(details if args.details else summary, args.output)
+
+
+def cmd_quality(args):
+    from utils.quality import file_quality
+
+    signal_types = None
+    if args.store:
+        from utils.local_store import load_store_index
+        index = load_store_index(args.store) or {}
+        signal_types = {tag: entry['type'] for tag, entry in index.get('signal_catalog', {}).items()}
+    intervals, summary = file_quality(args.file, stuck_s=args.stuck_s, cache_dir=args.cache_dir,
+                                      refresh=args.refresh, signal_types=signal_types, all_tags=args.all_tags)
+    if summary is not None:
+        _write_table(intervals if args.intervals else summary[summary['bad_ratio'] > 0], args.output)
+
+
+def cmd_startup(args):
+    from utils.startup_report import startup_report
+
+    report = startup_report(args.directory, args.pattern, args.workers, startup_gap=args.startup_gap,
+                            cache_dir=args.cache_dir, refresh=args.refresh)
+    _write_table(report, args.output)
+
+
+def cmd_run(args):
+    from utils.batch import load_job_spec, run_job
+
+    job = load_job_spec(args.spec)
+    for name in ('output_dir', 'cache_dir', 'report', 'export'):
+        if getattr(args, name):
+            job[name] = getattr(args, name)
+    if args.dry_run:
+        from utils.batch import plan_job
+
+        tasks, cached = plan_job(job)
+        print(f"렌더링 {len(tasks)}개, 캐시 사용 {cached}개")
+        for task in tasks:
+            print(f"  Step {task['step']:02d} {task['window']['name'] if task['window'] else '전체'} 파일 {task['files']}")
+        return
+    run_job(job, workers=args.workers)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='HDF5 export 분석 도구')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('steps', help='step별 태그 수')
+    p.add_argument('--all', action='store_true', help='태그가 없는 step도 표시')
+    p.set_defaults(func=cmd_steps)
+
+    p = sub.add_parser('tags', help='step 태그 목록')
+    p.add_argument('step', type=int)
+    p.add_argument('--file', help='HDF5 파일 (주면 태그별 컬럼명 표시)')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_tags)
+
+    p = sub.add_parser('info', help='파일 메타데이터 요약')
+    p.add_argument('file')
+    p.set_defaults(func=cmd_info)
+
+    p = sub.add_parser('search', help='태그명/설명 검색')
+    p.add_argument('query')
+    p.add_argument('--file', nargs='+', required=True, help='HDF5 파일 (여러 개면 태그를 합쳐 검색)')
+    p.add_argument('--limit', type=int, default=20)
+    p.add_argument('--cache-dir', default='.cache')
+    p.add_argument('--refresh', action='store_true')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser('events', help='step DIO 이벤트')
+    p.add_argument('file')
+    p.add_argument('--step', type=int, required=True)
+    p.add_argument('--time-column', default='Date')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_events)
+
+    p = sub.add_parser('ingest', help='export 파일을 증분 저장소에 추가')
+    p.add_argument('file', nargs='+')
+    p.add_argument('--store', required=True, help='저장소 디렉터리 (없으면 생성)')
+    p.add_argument('--time-column', default='Date')
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser('kpi', help='설비 KPI')
+    p.add_argument('file', help='HDF5 파일 또는 증분 저장소 디렉터리')
+    p.add_argument('--start', help='저장소 구간 시작 (저장소일 때만, 예: 오늘 날짜)')
+    p.add_argument('--end', help='저장소 구간 끝 (저장소일 때만)')
+    p.add_argument('--details', action='store_true', help='요약 대신 동작별 상세 출력')
+    p.add_argument('--quality-mask', action='store_true', help='품질 점검의 나쁜 구간을 제외하고 계산')
+    p.add_argument('--cache-dir', default='.cache')
+    p.add_argument('--refresh', action='store_true')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_kpi)
+
+    p = sub.add_parser('quality', help='데이터 품질 점검')
+    p.add_argument('file')
+    p.add_argument('--intervals', action='store_true', help='요약 대신 문제 구간 전체 출력 (시간 간격 이상 포함)')
+    p.add_argument('--stuck-s', type=float, default=600, help='측정 태그가 이 시간(초) 이상 같은 값이면 고착')
+    p.add_argument('--store', help='신호 종류(DIO/아날로그)를 가져올 로컬 저장소 디렉터리 (signal_catalog)')
+    p.add_argument('--all-tags', action='store_true', help='step 태그만이 아니라 파일의 모든 컬럼 점검')
+    p.add_argument('--cache-dir', default='.cache')
+    p.add_argument('--refresh', action='store_true')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_quality)
+
+    p = sub.add_parser('startup', help='디렉터리 기동 리포트')
+    p.add_argument('directory')
+    p.add_argument('--pattern', default='*.h5')
+    p.add_argument('--workers', type=int)
+    p.add_argument('--startup-gap', default='6h')
+    p.add_argument('--cache-dir', default='.cache')
+    p.add_argument('--refresh', action='store_true')
+    p.add_argument('--output', help='CSV 저장 경로')
+    p.set_defaults(func=cmd_startup)
+
+    p = sub.add_parser('run', help='작업 명세(JSON)대로 일괄 렌더링')
+    p.add_argument('spec', help='작업 명세 JSON 파일')
+    p.add_argument('--workers', type=int, help='렌더링 프로세스 수 (명세 값보다 우선)')
+    p.add_argument('--output-dir')
+    p.add_argument('--cache-dir')
+    p.add_argument('--report', help='리포트 경로 (.pdf 또는 .html, 주면 모든 그림을 리포트 하나로 출력)')
+    p.add_argument('--export', help='컬럼형 내보내기 디렉터리 (utils/columnar.py read_step으로 읽음)')
+    p.add_argument('--dry-run', action='store_true', help='계획만 출력')
+    p.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from utils.interlock import Condition, check_conditions
+
+
+def _frame():
+    return pd.DataFrame({
+        'Date': pd.date_range('2024-08-01', periods=4, freq='s'),
+        'A': [1.0, 1.0, 0.0, 1.0],
+        'B': [0.0, np.nan, 1.0, 0.0],
+    })
+
+
+def test_not_nan_sample_is_not_true():
+    signal_types = {'A': 'dio', 'B': 'dio'}
+    result = Condition('NOT B').evaluate(_frame(), signal_types=signal_types)
+    assert result.tolist() == [True, False, False, True]
+
+
+def test_not_missing_tag_never_holds():
+    df = _frame()
+    assert not Condition('NOT MISSING-TAG').evaluate(df).any()
+    assert not Condition('A AND NOT MISSING-TAG').evaluate(df).any()
+    assert check_conditions(df, {'permissive': 'NOT MISSING-TAG'}).empty
+
+
+def test_three_valued_and_or():
+    signal_types = {'A': 'dio', 'B': 'dio'}
+    df = _frame()
+    # 참 OR 알 수 없음 = 참, 거짓 AND 알 수 없음 = 거짓 → NOT은 참
+    assert Condition('A OR B').evaluate(df, signal_types=signal_types)[1]
+    assert Condition('NOT (B AND MISSING-TAG)').evaluate(df, signal_types=signal_types).tolist() == \
+        [True, False, False, True]
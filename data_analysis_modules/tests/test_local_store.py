@@ -0,0 +1,29 @@
+import pandas as pd
+
+from utils.local_store import append_to_store, build_tag_index, load_store, load_store_index
+from utils.tag_metadata import dedup_column_names
+
+
+def _export(tags, start, rows):
+    # 컬럼명은 설명에서 만들어지므로 설명이 같으면 export마다 '.1', '.2' 접미사 위치가 달라짐
+    descriptions = ['Date'] + ['Drum level'] * len(tags)
+    columns = dedup_column_names(descriptions)
+    df = pd.DataFrame(rows, columns=columns[1:])
+    df.insert(0, 'Date', pd.date_range(start, periods=len(rows), freq='s'))
+    df.attrs['header_metadata'] = {'tag_name': ['', 'TIME'] + tags, 'description': [''] + descriptions}
+    return df
+
+
+def test_append_aligns_columns_by_tag(tmp_path):
+    append_to_store(_export(['A', 'B'], '2024-08-01 00:00:00', [[1.0, 2.0], [3.0, 4.0]]), tmp_path)
+    append_to_store(_export(['C', 'A', 'B'], '2024-08-01 00:00:02', [[9.0, 5.0, 6.0]]), tmp_path)
+
+    df = load_store(tmp_path)
+    tag_columns = build_tag_index(df)
+    assert df[tag_columns['A']].tolist() == [1.0, 3.0, 5.0]
+    assert df[tag_columns['B']].tolist() == [2.0, 4.0, 6.0]
+    assert df[tag_columns['C']].isna().tolist() == [True, True, False]
+
+    index = load_store_index(tmp_path)
+    assert index['tag_index'] == tag_columns
+    assert set(index['signal_catalog']) == {'A', 'B', 'C'}
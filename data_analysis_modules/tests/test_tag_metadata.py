@@ -0,0 +1,59 @@
+import io
+
+import pandas as pd
+
+from utils.local_store import build_tag_index
+from utils.tag_metadata import build_tag_resolution, dedup_column_names
+
+
+TAGS = ['', 'TIME', 'LIT-H1-01', 'LIT-H2-01', 'PIT-H1-02']
+DESCRIPTIONS = ['', 'Date', 'Drum level', 'Drum level', 'Drum level']
+COLUMNS = ['Date', 'Drum level', 'Drum level.1', 'Drum level.2']
+
+
+def test_dedup_matches_pandas_suffixes():
+    for names in (['A', 'A', 'A'], ['A', 'A', 'A.1'], ['A', 'B', 'A', 'B', 'A']):
+        header = ','.join(names) + '\n' + ','.join('0' * len(names)) + '\n'
+        assert dedup_column_names(names) == list(pd.read_csv(io.StringIO(header)).columns)
+
+
+def test_duplicate_descriptions_resolve_to_suffixed_columns():
+    resolution = build_tag_resolution(COLUMNS, TAGS, DESCRIPTIONS)
+    assert resolution == {'TIME': ['Date'], 'LIT-H1-01': ['Drum level'],
+                          'LIT-H2-01': ['Drum level.1'], 'PIT-H1-02': ['Drum level.2']}
+
+
+def test_header_with_and_without_index_slot():
+    with_slot = build_tag_resolution(COLUMNS, TAGS, DESCRIPTIONS)
+    without_slot = build_tag_resolution(COLUMNS, TAGS[1:], DESCRIPTIONS[1:])
+    assert with_slot == without_slot
+
+
+def test_column_subset_resolves_by_name():
+    # load_hdf5_columns처럼 일부 컬럼만 읽은 DataFrame도 설명 기준으로 정확히 찾음
+    resolution = build_tag_resolution(['Date', 'Drum level.1'], TAGS, DESCRIPTIONS)
+    assert resolution == {'TIME': ['Date'], 'LIT-H2-01': ['Drum level.1']}
+
+
+def test_duplicate_tag_keeps_every_column():
+    tags = ['', 'TIME', 'LIT-H1-01', 'LIT-H1-01']
+    resolution = build_tag_resolution(COLUMNS[:3], tags, DESCRIPTIONS[:4])
+    assert resolution['LIT-H1-01'] == ['Drum level', 'Drum level.1']
+
+    df = pd.DataFrame(columns=COLUMNS[:3])
+    df.attrs['header_metadata'] = {'tag_name': tags, 'description': DESCRIPTIONS[:4]}
+    assert build_tag_index(df)['LIT-H1-01'] == 'Drum level'
+
+
+def test_positional_fallback_when_columns_are_not_descriptions():
+    columns = ['c0', 'c1', 'c2', 'c3']
+    expected = {'TIME': ['c0'], 'LIT-H1-01': ['c1'], 'LIT-H2-01': ['c2'], 'PIT-H1-02': ['c3']}
+    assert build_tag_resolution(columns, TAGS, DESCRIPTIONS) == expected
+    assert build_tag_resolution(columns, TAGS[1:], DESCRIPTIONS[1:]) == expected
+    assert build_tag_resolution(columns, TAGS) == expected
+
+
+def test_blank_tags_are_skipped():
+    tags = ['', 'TIME', 'nan', 'LIT-H2-01', '']
+    resolution = build_tag_resolution(COLUMNS, tags, DESCRIPTIONS)
+    assert resolution == {'TIME': ['Date'], 'LIT-H2-01': ['Drum level.1']}
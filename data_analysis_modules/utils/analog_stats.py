@@ -0,0 +1,256 @@
+import hashlib
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .local_store import build_tag_index
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir, write_cache_tables
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 아날로그 태그 통계 및 이상 점수 (step 구간 단위)
+# ============================================================================
+#
+# step의 아날로그 태그들을 (샘플 수, 태그 수) float 행렬 하나로 만든 뒤
+# 모든 통계를 축 0 방향 NumPy 연산으로 한 번에 계산한다.
+#   - min / max / mean / std / 백분위수
+#   - 변화율(초당) 최소/최대와 그 시각
+#   - 이동 z-score: 직전 window개 샘플의 평균/표준편차를 누적합(cumsum)으로 구해
+#     |z| > z_threshold 인 샘플을 이상으로 표시
+# 결과는 태그당 1행 테이블이며, 파일별 캐시에 저장해 월별로 비교할 수 있다.
+
+STATS_VERSION = 1
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _time_seconds(df, time_column, n):
+    if time_column in df.columns:
+        times = pd.DatetimeIndex(df[time_column])
+        return times.to_numpy(), (times - times[0]).total_seconds().to_numpy() if n else np.empty(0)
+    return None, np.arange(n, dtype=float)
+
+
+def rolling_zscore(values, window, min_periods=None):
+    """
+    직전 window개 샘플 기준 이동 z-score (누적합 기반, 열별 독립)
+
+    Parameters:
+    - values: (n, k) float 배열 (NaN 허용)
+    - window: 기준 샘플 수
+    - min_periods: 기준 구간의 최소 유효 샘플 수 (None이면 window의 절반)
+
+    Returns:
+    - (n, k) z-score 배열 (유효 샘플이 min_periods 미만이거나 표준편차 0이면 NaN)
+    """
+    min_periods = max(2, window // 2 if min_periods is None else min_periods)
+    n = len(values)
+    valid = ~np.isnan(values)
+
+    # 누적합 정밀도를 위해 열 평균을 빼고 계산
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        center = np.nanmean(values, axis=0)
+    x = np.where(valid, values - np.nan_to_num(center), 0.0)
+
+    zeros = np.zeros((1, values.shape[1]))
+    c1 = np.vstack([zeros, np.cumsum(x, axis=0)])
+    c2 = np.vstack([zeros, np.cumsum(x * x, axis=0)])
+    cn = np.vstack([zeros, np.cumsum(valid, axis=0)])
+
+    # 샘플 i의 기준 구간: [i - window, i) (자기 자신 제외)
+    end = np.arange(n)
+    start = np.maximum(end - window, 0)
+    count = cn[end] - cn[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (c1[end] - c1[start]) / count
+        var = (c2[end] - c2[start]) / count - mean * mean
+        std = np.sqrt(np.maximum(var, 0.0) * count / (count - 1))
+        z = (x - mean) / std
+
+    z[(count < min_periods) | ~valid | ~(std > 0)] = np.nan
+    return z
+
+
+def analog_statistics(df, tags, tag_columns=None, time_column='Date', signal_types=None, time_range=None,
+                      percentiles=DEFAULT_PERCENTILES, window=60, z_threshold=4.0):
+    """
+    아날로그 태그들의 통계와 이상 점수를 한 번에 계산
+
+    Parameters:
+    - df: DataFrame (원본 또는 컬럼=태그명)
+    - tags: 태그 리스트 (DIO로 판별된 태그는 제외됨)
+    - tag_columns: {tag: 컬럼명} (None이면 header_metadata 태그 인덱스, 없으면 컬럼명)
+    - time_column: 시간 컬럼명
+    - signal_types: {tag: 'dio'/'analog'} (None이면 데이터로 판별)
+    - time_range: (start, end) step 구간 (None이면 전체)
+    - percentiles: 백분위수 리스트
+    - window: 이동 z-score 기준 샘플 수
+    - z_threshold: 이상 판정 |z| 기준
+
+    Returns:
+    - DataFrame (인덱스=태그): count, missing, min, max, mean, std, p*, roc_min, roc_max,
+      roc_min_time, roc_max_time, z_max, anomalies, anomaly_ratio, first_anomaly_time
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    tag_columns = {tag: tag_columns[tag] for tag in dict.fromkeys(tags)
+                   if tag in tag_columns and tag_columns[tag] in df.columns and tag_columns[tag] != time_column}
+
+    if time_range is not None and time_column in df.columns:
+        times = df[time_column]
+        i0 = times.searchsorted(pd.Timestamp(time_range[0]), side='left')
+        i1 = times.searchsorted(pd.Timestamp(time_range[1]), side='right')
+        df = df.iloc[i0:i1]
+
+    if signal_types is None or any(tag not in signal_types for tag in tag_columns):
+        catalog = update_signal_catalog({}, df, tag_columns)
+        signal_types = {**{tag: entry['type'] for tag, entry in catalog.items()}, **(signal_types or {})}
+    analog_columns = {tag: col for tag, col in tag_columns.items() if signal_types.get(tag) == 'analog'}
+
+    if not analog_columns or len(df) == 0:
+        return pd.DataFrame()
+
+    numeric = to_numeric_tag_frame(df, analog_columns, signal_types)
+    tag_list = list(numeric.columns)
+    values = numeric.to_numpy(dtype=float)
+    times, seconds = _time_seconds(df, time_column, len(values))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        valid = ~np.isnan(values)
+        result = {
+            'count': valid.sum(axis=0),
+            'missing': (~valid).sum(axis=0),
+            'min': np.nanmin(values, axis=0),
+            'max': np.nanmax(values, axis=0),
+            'mean': np.nanmean(values, axis=0),
+            'std': np.nanstd(values, axis=0),
+        }
+        quantiles = np.nanpercentile(values, percentiles, axis=0)
+        for p, row in zip(percentiles, np.atleast_2d(quantiles)):
+            result[f'p{p:g}'] = row
+
+        # 변화율 (초당): 인접 샘플 차분 / 시간 차
+        dt = np.diff(seconds)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            roc = np.diff(values, axis=0) / np.where(dt > 0, dt, np.nan)[:, None]
+        result['roc_min'] = np.nanmin(roc, axis=0) if len(roc) else np.full(len(tag_list), np.nan)
+        result['roc_max'] = np.nanmax(roc, axis=0) if len(roc) else np.full(len(tag_list), np.nan)
+
+        z = np.abs(rolling_zscore(values, window))
+        result['z_max'] = np.nanmax(z, axis=0)
+
+    anomalies = z > z_threshold
+    result['anomalies'] = anomalies.sum(axis=0)
+    result['anomaly_ratio'] = result['anomalies'] / np.maximum(result['count'], 1)
+
+    stats = pd.DataFrame(result, index=pd.Index(tag_list, name='tag'))
+
+    if times is not None:
+        def time_at(positions, found):
+            out = pd.Series(pd.NaT, index=stats.index, dtype='datetime64[ns]')
+            out[found] = times[positions[found]]
+            return out
+
+        # 변화율 극값 시각 (roc[i]는 샘플 i → i+1 구간이므로 도착 샘플 i+1의 시각)
+        has_roc = ~np.isnan(result['roc_min'])
+        if len(roc):
+            stats['roc_min_time'] = time_at(np.argmin(np.nan_to_num(roc, nan=np.inf), axis=0) + 1, has_roc)
+            stats['roc_max_time'] = time_at(np.argmax(np.nan_to_num(roc, nan=-np.inf), axis=0) + 1, has_roc)
+        else:
+            stats['roc_min_time'] = stats['roc_max_time'] = pd.NaT
+        stats['first_anomaly_time'] = time_at(np.argmax(anomalies, axis=0), anomalies.any(axis=0))
+
+    return stats
+
+
+def step_statistics(df, steps=None, tag_columns=None, time_column='Date', **options):
+    """
+    step별 아날로그 태그 통계 (step_tags 기준)
+
+    Parameters:
+    - df: 원본 DataFrame
+    - steps: step 번호 리스트 (1부터, None이면 태그가 있는 전체 step)
+    - options: analog_statistics 옵션 (time_range, window, z_threshold, ...)
+
+    Returns:
+    - DataFrame [step, tag, ...통계]
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    if steps is None:
+        steps = [i + 1 for i, tags in enumerate(step_tags) if tags]
+
+    # 신호 종류는 모든 step 태그에 대해 한 번만 판별
+    all_tags = {tag: tag_columns[tag] for step in steps for tag in step_tags[step - 1] if tag in tag_columns}
+    catalog = update_signal_catalog({}, df, all_tags)
+    signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+
+    frames = []
+    for step in steps:
+        stats = analog_statistics(df, step_tags[step - 1], tag_columns, time_column, signal_types, **options)
+        if not stats.empty:
+            frames.append(stats.reset_index().assign(step=step))
+
+    if not frames:
+        return pd.DataFrame()
+    result = pd.concat(frames, ignore_index=True)
+    return result[['step'] + [col for col in result.columns if col != 'step']]
+
+
+def file_step_statistics(file_path, steps=None, time_column='Date', cache_dir=DEFAULT_CACHE_DIR,
+                         refresh=False, **options):
+    """
+    export 파일의 step별 아날로그 통계 (파일 내용과 옵션이 같으면 캐시 사용)
+
+    Returns:
+    - DataFrame (step_statistics와 같음), 로드 실패 시 None
+    """
+    key_options = {'version': STATS_VERSION, 'steps': steps, 'time_column': time_column, **options}
+    key = hashlib.sha1(json.dumps(key_options, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+    cache_path = file_cache_dir(file_path, cache_dir) / f'analog_stats_{key}.h5'
+
+    if cache_path.exists() and not refresh:
+        print(f"♻️  통계 캐시 사용: {cache_path}")
+        return pd.read_hdf(cache_path, 'stats')
+
+    # step 태그 컬럼만 로드 (파일 전체를 읽지 않음)
+    try:
+        schema = load_hdf5_schema(file_path)
+        tag_columns = build_tag_index(schema) or {col: col for col in schema.columns}
+        used_steps = steps if steps is not None else [i + 1 for i, tags in enumerate(step_tags) if tags]
+        tag_columns = {tag: tag_columns[tag] for step in used_steps for tag in step_tags[step - 1]
+                       if tag in tag_columns}
+        df = load_hdf5_columns(file_path, [time_column] + list(dict.fromkeys(tag_columns.values())))
+        df.attrs = {}
+    except Exception as e:
+        print(f"❌ 로드 실패: {file_path} ({e})")
+        return None
+
+    stats = step_statistics(df, steps, tag_columns, time_column=time_column, **options)
+
+    write_cache_tables(cache_path, {'stats': stats})
+
+    print(f"✅ 아날로그 통계 계산 완료: {len(stats)}행")
+    return stats
+
+
+def compare_statistics(tables_by_label, stat='mean'):
+    """
+    여러 파일(월)의 통계 테이블을 한 항목 기준으로 나란히 비교
+
+    Parameters:
+    - tables_by_label: {라벨(예: '2024-08'): step_statistics 결과}
+    - stat: 비교할 통계 컬럼
+
+    Returns:
+    - DataFrame (행: (step, tag), 열: 라벨)
+    """
+    columns = {label: table.set_index(['step', 'tag'])[stat] for label, table in tables_by_label.items()
+               if not table.empty}
+    return pd.DataFrame(columns)
@@ -0,0 +1,415 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .tag_metadata import file_metadata
+from .data_extraction import update_signal_catalog
+from .pyramid import build_pyramid
+from .file_cache import DEFAULT_CACHE_DIR, file_fingerprint
+from .render_cache import RenderCache
+from .report_writer import ReportWriter, save_figure
+from .columnar import export_step, is_current
+from .quality import file_quality, apply_quality_mask
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 작업 명세(job spec) 기반 일괄 렌더링
+# ============================================================================
+#
+# 명세 하나에 파일, step, 시간 구간, 출력 형식, 병렬 수, 캐시 위치를 적으면
+#   1) 계획 : (step × 구간 × 파일 그룹) 렌더링 작업 목록을 만들고 렌더링 캐시에 있는 작업은 제외
+#   2) 준비 : 남은 작업에 필요한 파일만, 파일당 한 번, 모든 step 태그의 합집합 컬럼만 로드
+#             (신호 종류 판별과 다중 해상도 요약도 파일당 한 번)
+#   3) 렌더 : 작업을 프로세스에 나눠 그림 (데이터는 작업 프로세스 초기화 시 한 번만 전달)
+# export를 지정하면 준비한 데이터를 파일 × step별 컬럼형 디렉터리로도 내보낸다 (utils/columnar.py,
+# 원본 파일과 태그가 같으면 다시 쓰지 않음).
+# report를 지정하면 step별 파일 대신 그림을 순서대로 PDF/HTML 리포트 하나에 바로 써 넣는다.
+#
+# 명세 예 (JSON):
+#   {"files": [{"path": "data_2024-08.h5", "label": "2024-08"}, "data_2024-09.h5"],
+#    "steps": [1, 2, 3], "windows": [{"name": "startup", "start": "2024-08-01 06:00", "end": "2024-08-01 09:00"}],
+#    "formats": ["png"], "dpi": 150, "workers": 4, "output_dir": "output_plots", "cache_dir": ".cache",
+#    "report": "output_plots/report.pdf", "export": "export"}
+
+JOB_DEFAULTS = {
+    'files': [],
+    'steps': None,             # None이면 태그가 있는 전체 step
+    'windows': None,           # None이면 전체 구간 하나
+    'formats': ['png'],        # png, svg, pdf, webp, jpg, ...
+    'dpi': 150,
+    'quality': 80,             # webp/jpg/avif 압축 품질
+    'bbox': None,              # 'tight'는 저장할 때마다 레이아웃을 다시 계산 (plot_* 레이아웃을 그대로 사용)
+    'report': None,            # '.pdf' 또는 '.html' 경로를 주면 모든 그림을 리포트 하나로 출력
+    'report_format': 'webp',   # HTML 리포트 이미지 형식
+    'backend': 'subplots',     # subplots, stacked, density
+    'pyramid': True,
+    'quality_mask': False,     # True면 품질 점검(utils/quality.py)의 결측/잘못된 값/고착 구간을 NaN으로 바꿔 그림
+    'compare': True,           # True: 모든 파일을 한 그림에 겹침, False: 파일별로 따로 그림
+    'output_dir': 'output_plots',
+    'cache_dir': str(DEFAULT_CACHE_DIR),
+    'workers': 1,
+    'export': None,            # 디렉터리를 주면 <export>/<파일 label>/stepNN 으로 컬럼형 내보내기
+    'export_compress': False,  # True면 압축 저장 (메모리 매핑 불가)
+    'time_column': 'Date',
+}
+
+PLOT_KINDS = ('dio', 'analog')
+
+
+def load_job_spec(path):
+    """
+    JSON 작업 명세 파일 로드 (기본값 채움)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return normalize_job(json.load(f))
+
+
+def normalize_job(spec):
+    """
+    작업 명세에 기본값을 채우고 files/windows/steps 형식을 통일
+
+    Returns:
+    - dict: files는 [{'path', 'label'}], windows는 [{'name', 'start', 'end'}] 또는 [None]
+    """
+    job = {**JOB_DEFAULTS, **spec}
+
+    files = []
+    for entry in job['files']:
+        entry = {'path': entry} if isinstance(entry, str) else dict(entry)
+        entry.setdefault('label', Path(entry['path']).stem)
+        files.append(entry)
+    job['files'] = files
+
+    if job['steps'] is None:
+        job['steps'] = [i + 1 for i, tags in enumerate(step_tags) if tags]
+    job['windows'] = [dict(w) if w is not None else None for w in job['windows']] if job['windows'] else [None]
+    if isinstance(job['formats'], str):
+        job['formats'] = [job['formats']]
+    return job
+
+
+def _output_stem(step, window, group_label):
+    parts = [group_label] if group_label else []
+    parts.append(f'step{step:02d}')
+    if window is not None:
+        parts.append(window['name'])
+    return '_'.join(parts)
+
+
+def iter_tasks(job):
+    """
+    명세의 (step × 구간 × 파일 그룹) 렌더링 작업을 step 순서대로 생성
+
+    Yields:
+    - {'step', 'tags', 'window', 'time_range', 'files'(파일 위치 리스트), 'group', 'title'}
+    """
+    if job['compare'] or len(job['files']) == 1:
+        groups = [(list(range(len(job['files']))), '')]
+    else:
+        groups = [([i], entry['label']) for i, entry in enumerate(job['files'])]
+
+    for step in job['steps']:
+        tags = step_tags[step - 1]
+        if not tags:
+            continue
+        for window in job['windows']:
+            time_range = (window['start'], window['end']) if window is not None else None
+            for indices, group_label in groups:
+                title = ' '.join(part for part in (f'Step {step:02d}', window['name'] if window else '', group_label)
+                                 if part)
+                yield {'step': step, 'tags': tags, 'window': window, 'time_range': time_range,
+                       'files': indices, 'group': group_label, 'title': title}
+
+
+def plan_job(job, render_cache=None):
+    """
+    렌더링 작업 계획 (캐시에 모든 결과가 있는 작업은 출력만 하고 제외)
+
+    Parameters:
+    - job: normalize_job 결과
+    - render_cache: RenderCache (None이면 job['cache_dir']로 생성)
+
+    Returns:
+    - tasks: 렌더링이 필요한 작업 리스트 (iter_tasks 항목 + 'outputs': {kind: {fmt: (경로, 캐시 키)}})
+    - cached: 캐시로 처리된 작업 수
+    """
+    render_cache = render_cache or RenderCache(job['cache_dir'])
+    output_dir = Path(job['output_dir'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fingerprints = [file_fingerprint(entry['path'], job['cache_dir']) for entry in job['files']]
+
+    tasks, cached = [], 0
+    for task in iter_tasks(job):
+        style = {'labels': [job['files'][i]['label'] for i in task['files']], 'pyramid': job['pyramid'],
+                 'bbox': job['bbox'], 'backend': job['backend'], 'quality': job['quality'],
+                 'quality_mask': job['quality_mask']}
+        stem = _output_stem(task['step'], task['window'], task['group'])
+
+        outputs, complete = {}, True
+        for kind in PLOT_KINDS:
+            outputs[kind] = {}
+            for fmt in job['formats']:
+                path = output_dir / f'{stem}_{kind}.{fmt}'
+                key = render_cache.make_key([fingerprints[i] for i in task['files']], kind, task['tags'],
+                                            task['time_range'], job['dpi'], style, suffix=f'.{fmt}')
+                outputs[kind][fmt] = (str(path), key)
+                # 모든 출력을 확인해야 캐시에 없는 이전 출력 파일이 지워짐 (단락 평가하지 않음)
+                hit = render_cache.fetch(key, path)
+                complete = complete and hit is not False
+
+        if complete:
+            cached += 1
+            continue
+        tasks.append({**task, 'outputs': outputs})
+
+    return tasks, cached
+
+
+def plan_exports(job):
+    """
+    내보내기 계획 (원본 파일 지문/태그/옵션이 같은 기존 내보내기는 제외)
+
+    Returns:
+    - exports: [{'step', 'tags', 'files': [파일 위치], 'path', 'source'}]
+    - current: 이미 최신인 내보내기 수
+    """
+    if not job['export']:
+        return [], 0
+
+    exports, current = [], 0
+    for i, entry in enumerate(job['files']):
+        fingerprint = file_fingerprint(entry['path'], job['cache_dir'])
+        for step in job['steps']:
+            tags = list(dict.fromkeys(step_tags[step - 1]))
+            if not tags:
+                continue
+            path = Path(job['export']) / entry['label'] / f'step{step:02d}'
+            source = {'file': str(entry['path']), 'fingerprint': fingerprint, 'step': step,
+                      'tags': hashlib.sha1(json.dumps(tags).encode('utf-8')).hexdigest()[:16],
+                      'time_column': job['time_column'], 'compress': bool(job['export_compress']),
+                      'quality_mask': bool(job['quality_mask'])}
+            if is_current(path, source):
+                current += 1
+                continue
+            exports.append({'step': step, 'tags': tags, 'files': [i], 'path': str(path), 'source': source})
+    return exports, current
+
+
+def write_exports(exports, prepared, job):
+    """
+    준비된 파일 데이터로 step별 컬럼형 내보내기 실행
+
+    Returns:
+    - int: 내보낸 디렉터리 수
+    """
+    for export in exports:
+        item = prepared[export['files'][0]]
+        manifest = export_step(item['frame'], export['tags'], item['signal_types'], item['descriptions'],
+                               export['path'], job['time_column'], job['export_compress'], export['source'])
+        print(f"  ✅ 내보내기: {export['path']} (태그 {len(manifest['columns']) - 1}개, {manifest['rows']}행)")
+    return len(exports)
+
+
+def prepare_file(file_path, tags, time_column='Date', pyramid=True, quality_mask=False, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    파일 하나에서 태그 합집합 컬럼만 한 번 로드해 렌더링 입력 생성
+
+    quality_mask=True면 파일 품질 점검 결과(file_quality, 캐시 사용)의 나쁜 구간을 NaN으로 바꾼다.
+
+    Returns:
+    - dict: frame (컬럼=태그명 + 시간 컬럼), descriptions {tag: 설명},
+      signal_types {tag: 'dio'/'analog'}, pyramid (태그 기준, pyramid=False면 None)
+    """
+    schema = load_hdf5_schema(file_path)
+    metadata = file_metadata(schema)
+    tag_columns = {tag: metadata['tag_columns'][tag][0] for tag in dict.fromkeys(tags) if tag in metadata['tag_columns']}
+
+    df = load_hdf5_columns(file_path, [time_column] + list(tag_columns.values()))
+    df.attrs = {}
+    frame = pd.DataFrame({tag: df[col] for tag, col in tag_columns.items()})
+    if time_column in df.columns:
+        frame[time_column] = df[time_column]
+
+    identity = {tag: tag for tag in tag_columns}
+    catalog = update_signal_catalog({}, frame, identity)
+    signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+    if quality_mask:
+        intervals, _ = file_quality(file_path, time_column=time_column, cache_dir=cache_dir,
+                                    tags=list(tag_columns))
+        if intervals is not None:
+            frame = apply_quality_mask(frame, intervals, identity)
+    level = build_pyramid(frame, identity, signal_types, time_column) if pyramid else None
+
+    print(f"✅ 준비 완료: {Path(file_path).name} 태그 {len(tag_columns)}개, {len(frame)}행")
+    return {'frame': frame, 'descriptions': metadata['descriptions'], 'signal_types': signal_types, 'pyramid': level}
+
+
+# 작업 프로세스 공유 상태 (파일 데이터를 작업마다 다시 보내지 않도록 초기화 시 1회 전달)
+_worker_state = {}
+
+
+def _init_worker(prepared, job):
+    from .visualization import setup_korean_font
+
+    setup_korean_font()
+    _worker_state.update(prepared=prepared, job=job)
+
+
+def _render_task(task):
+    return render_task(task, _worker_state['prepared'], _worker_state['job'])
+
+
+def render_figures(task, prepared, job):
+    """
+    작업 하나의 그림 생성 (DIO → 아날로그 순서로 하나씩)
+
+    Yields:
+    - (kind, fig): fig는 그릴 신호가 없으면 None (호출한 쪽에서 저장 후 닫음)
+    """
+    from .visualization import backend_plotters
+
+    time_column = job['time_column']
+    inputs = [prepared[i] for i in task['files']]
+    labels = [job['files'][i]['label'] for i in task['files']]
+
+    # 모든 파일에 있는 태그만, step 순서대로
+    present = [tag for tag in dict.fromkeys(task['tags']) if all(tag in item['frame'].columns for item in inputs)]
+    signal_types = inputs[0]['signal_types'] if inputs else {}
+    signals = {'dio': [tag for tag in present if signal_types.get(tag) == 'dio'],
+               'analog': [tag for tag in present if signal_types.get(tag) != 'dio']}
+
+    frames = [item['frame'] for item in inputs]
+    pyramids = [item['pyramid'] for item in inputs] if job['pyramid'] else None
+    descriptions = inputs[0]['descriptions'] if inputs else {}
+
+    plotters = dict(zip(PLOT_KINDS, backend_plotters(job['backend'])))
+
+    for kind in PLOT_KINDS:
+        # 요약 레벨은 저장 해상도(job['dpi']) 기준 픽셀 수로 선택
+        fig = plotters[kind](frames, signals[kind], time_column, descriptions, labels, pyramids=pyramids,
+                             time_range=task['time_range'], dpi=job['dpi']) if signals[kind] else None
+        yield kind, fig
+
+
+def render_task(task, prepared, job):
+    """
+    작업 하나 렌더링 후 저장 (DIO/아날로그 그림을 각 형식으로)
+
+    Returns:
+    - {kind: True(저장됨) / False(그릴 신호 없음)}
+    """
+    import matplotlib.pyplot as plt
+
+    saved = {}
+    for kind, fig in render_figures(task, prepared, job):
+        saved[kind] = fig is not None
+        if fig is not None:
+            for fmt, (path, _) in task['outputs'][kind].items():
+                # 캐시와 하드 링크된 이전 출력을 덮어쓰지 않도록 먼저 지움
+                Path(path).unlink(missing_ok=True)
+                save_figure(fig, path, job['dpi'], job['quality'], job['bbox'])
+            plt.close(fig)
+
+    return saved
+
+
+def _prepare_inputs(job, tasks):
+    # 작업에 필요한 파일만, 파일마다 모든 작업 태그의 합집합으로 한 번 로드
+    needed_tags = {}
+    for task in tasks:
+        for i in task['files']:
+            needed_tags.setdefault(i, {}).update(dict.fromkeys(task['tags']))
+    return {i: prepare_file(job['files'][i]['path'], list(tags), job['time_column'], job['pyramid'],
+                            job['quality_mask'], job['cache_dir'])
+            for i, tags in sorted(needed_tags.items())}
+
+
+def write_report(job):
+    """
+    모든 작업의 그림을 step 순서대로 리포트 하나(PDF/HTML)에 스트리밍 출력
+
+    그림은 만들자마자 리포트에 쓰고 닫으므로 메모리에는 그림 하나만 남는다.
+    리포트는 페이지 순서가 있으므로 현재 프로세스에서 순서대로 그린다.
+
+    Returns:
+    - dict: pages (리포트 페이지 수), files (로드한 파일 수), exported (내보낸 step 디렉터리 수)
+    """
+    from .visualization import setup_korean_font
+
+    tasks = list(iter_tasks(job))
+    exports, _ = plan_exports(job)
+    prepared = _prepare_inputs(job, tasks + exports)
+    write_exports(exports, prepared, job)
+    setup_korean_font()
+
+    with ReportWriter(job['report'], job['report_format'], job['dpi'], job['quality']) as writer:
+        for task in tasks:
+            for kind, fig in render_figures(task, prepared, job):
+                if fig is not None:
+                    writer.add(fig, f"{task['title']} {'DIO' if kind == 'dio' else '아날로그'}")
+            print(f"  ✅ {task['title']}")
+
+    return {'pages': writer.pages, 'files': len(prepared), 'exported': len(exports)}
+
+
+def run_job(spec, workers=None):
+    """
+    작업 명세 실행 (계획 → 필요한 파일만 1회 로드 → 렌더 작업을 프로세스에 분배)
+
+    Parameters:
+    - spec: 작업 명세 dict 또는 JSON 파일 경로
+    - workers: 프로세스 수 (None이면 명세의 workers)
+
+    Returns:
+    - dict: rendered (새로 렌더링한 작업 수), cached (캐시로 처리한 작업 수), files (로드한 파일 수),
+      exported (내보낸 step 디렉터리 수)
+      (report가 있으면 write_report 결과)
+    """
+    job = load_job_spec(spec) if isinstance(spec, (str, Path)) else normalize_job(spec)
+    workers = workers or job['workers'] or os.cpu_count() or 1
+    if job['report']:
+        return write_report(job)
+
+    render_cache = RenderCache(job['cache_dir'])
+    tasks, cached = plan_job(job, render_cache)
+    exports, current = plan_exports(job)
+    print(f"\n{'='*70}")
+    print(f"작업 계획: 렌더링 {len(tasks)}개, 캐시 사용 {cached}개 (출력: {job['output_dir']})")
+    if job['export']:
+        print(f"내보내기 {len(exports)}개, 최신 {current}개 (출력: {job['export']})")
+    print(f"{'='*70}")
+
+    if not tasks and not exports:
+        return {'rendered': 0, 'cached': cached, 'files': 0, 'exported': 0}
+
+    prepared = _prepare_inputs(job, tasks + exports)
+    write_exports(exports, prepared, job)
+
+    # 태그가 많은 작업부터 배정해 프로세스 간 부하를 고르게
+    tasks = sorted(tasks, key=lambda task: -len(task['tags']))
+    results = []
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                                 initargs=(prepared, job)) as executor:
+            futures = {executor.submit(_render_task, task): task for task in tasks}
+            for future in as_completed(futures):
+                results.append((futures[future], future.result()))
+    else:
+        _init_worker(prepared, job)
+        results = [(task, _render_task(task)) for task in tasks]
+
+    # 렌더링 캐시 기록은 부모 프로세스에서
+    for task, saved in results:
+        for kind, outputs in task['outputs'].items():
+            for path, key in outputs.values():
+                render_cache.store(key, path if saved[kind] else None)
+        print(f"  ✅ Step {task['step']:02d} {', '.join(kind for kind, ok in saved.items() if ok) or '그림 없음'}")
+
+    print(f"\n✅ 렌더링 {len(results)}개 완료, 캐시 사용 {cached}개 (출력: {job['output_dir']})")
+    return {'rendered': len(results), 'cached': cached, 'files': len(prepared), 'exported': len(exports)}
@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data_extraction import to_numeric_tag_frame
+
+
+# ============================================================================
+# step 데이터 컬럼형 내보내기 (메모리 매핑으로 바로 읽는 .npy 묶음)
+# ============================================================================
+#
+# step 하나를 디렉터리 하나로 내보낸다.
+#   manifest.json : 행 수, 시간 컬럼, 태그별 설명/신호 종류/저장 형식, 원본 파일 지문
+#   c0000.npy ... : 컬럼별 배열 (시간은 datetime64, 태그는 숫자 변환 후 값)
+# 고유값이 DICTIONARY_MAX개 이하인 컬럼(DIO는 항상)은 사전 인코딩해서
+# uint8 코드만 저장하고 사전(고유값 목록)은 manifest에 둔다 (float64 대비 1/8 크기).
+# .npy는 헤더만 읽으면 되므로 np.load(mmap_mode='r')로 파싱 없이 바로 매핑된다.
+# compress=True면 같은 배열을 columns.npz(zip 압축) 하나로 저장한다 (매핑 대신 압축 해제).
+#
+# 읽기:
+#   arrays, manifest = open_step('export/2024-08/step19')     # 매핑된 원본 배열 (사전 컬럼은 코드)
+#   df = read_step('export/2024-08/step19')                    # 디코딩된 DataFrame (컬럼=태그명)
+
+COLUMNAR_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+ARCHIVE_NAME = 'columns.npz'
+DICTIONARY_MAX = 256
+
+
+def _dictionary_encode(values):
+    # 고유값이 DICTIONARY_MAX개 이하면 (uint8 코드, 사전), 아니면 None
+    dictionary, codes = np.unique(values, return_inverse=True, equal_nan=True)
+    if len(dictionary) > DICTIONARY_MAX:
+        return None
+    return codes.astype(np.uint8), dictionary
+
+
+def _json_values(values):
+    # NaN은 JSON null로
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def export_step(frame, tags, signal_types, descriptions, path, time_column='Date', compress=False, source=None):
+    """
+    step 하나의 데이터를 컬럼형 디렉터리로 내보내기
+
+    Parameters:
+    - frame: 컬럼=태그명 DataFrame (시간 컬럼 포함, batch.prepare_file 결과의 frame)
+    - tags: 내보낼 태그 리스트 (frame에 없는 태그는 제외)
+    - signal_types: {tag: 'dio'/'analog'}
+    - descriptions: {tag: 설명}
+    - path: 출력 디렉터리 (있으면 교체)
+    - time_column: 시간 컬럼명
+    - compress: True면 columns.npz로 압축 저장 (메모리 매핑 불가)
+    - source: manifest에 기록할 원본 정보 (파일 경로/지문 등, is_current 비교용)
+
+    Returns:
+    - dict: manifest
+    """
+    path = Path(path)
+    tags = [tag for tag in dict.fromkeys(tags) if tag in frame.columns and tag != time_column]
+    numeric = to_numeric_tag_frame(frame, {tag: tag for tag in tags}, signal_types)
+
+    arrays, columns = {}, []
+    if time_column in frame.columns:
+        arrays['c0000'] = frame[time_column].to_numpy()
+        columns.append({'name': time_column, 'file': 'c0000', 'kind': 'time',
+                        'dtype': str(arrays['c0000'].dtype), 'encoding': 'plain'})
+
+    for tag in tags:
+        name = f'c{len(columns):04d}'
+        values = numeric[tag].to_numpy(dtype=float)
+        entry = {'name': tag, 'file': name, 'kind': signal_types.get(tag, 'analog'),
+                 'description': descriptions.get(tag, '')}
+        encoded = _dictionary_encode(values)
+        if encoded is not None:
+            arrays[name], dictionary = encoded
+            entry.update(encoding='dictionary', dtype='float64', dictionary=_json_values(dictionary))
+        else:
+            arrays[name] = values
+            entry.update(encoding='plain', dtype='float64')
+        columns.append(entry)
+
+    manifest = {'version': COLUMNAR_VERSION, 'rows': len(frame), 'time_column': time_column,
+                'compressed': bool(compress), 'source': source, 'columns': columns}
+
+    # 임시 디렉터리에 다 쓴 뒤 교체 (중간에 실패해도 이전 내보내기는 그대로)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    if compress:
+        np.savez_compressed(tmp / ARCHIVE_NAME, **arrays)
+    else:
+        for name, values in arrays.items():
+            np.save(tmp / f'{name}.npy', values)
+    with open(tmp / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return manifest
+
+
+def load_manifest(path):
+    """
+    내보내기 디렉터리의 manifest 로드 (없거나 손상되면 None)
+    """
+    try:
+        with open(Path(path) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(path, source):
+    """
+    같은 원본(source)과 형식 버전으로 이미 내보낸 디렉터리인지 확인
+    """
+    manifest = load_manifest(path)
+    return manifest is not None and manifest.get('version') == COLUMNAR_VERSION and manifest.get('source') == source
+
+
+def open_step(path, mmap=True):
+    """
+    내보낸 step 열기 (배열은 디코딩하지 않고 저장된 그대로)
+
+    Parameters:
+    - path: 내보내기 디렉터리
+    - mmap: True면 np.load(mmap_mode='r')로 매핑 (압축 저장은 항상 메모리로 읽음)
+
+    Returns:
+    - arrays: {컬럼명: 배열} (사전 인코딩 컬럼은 uint8 코드, decode_column으로 값 복원)
+    - manifest: dict
+    """
+    path = Path(path)
+    manifest = load_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"내보내기 manifest가 없습니다: {path / MANIFEST_NAME}")
+
+    if manifest['compressed']:
+        with np.load(path / ARCHIVE_NAME) as archive:
+            arrays = {entry['name']: archive[entry['file']] for entry in manifest['columns']}
+    else:
+        mode = 'r' if mmap else None
+        arrays = {entry['name']: np.load(path / f"{entry['file']}.npy", mmap_mode=mode)
+                  for entry in manifest['columns']}
+    return arrays, manifest
+
+
+def decode_column(arrays, manifest, name):
+    """
+    컬럼 하나의 값 배열 (사전 인코딩이면 사전[코드]로 복원)
+    """
+    entry = next(entry for entry in manifest['columns'] if entry['name'] == name)
+    values = arrays[name]
+    if entry['encoding'] == 'dictionary':
+        dictionary = np.array([np.nan if v is None else v for v in entry['dictionary']], dtype=float)
+        return dictionary[values]
+    return values
+
+
+def read_step(path, columns=None, mmap=True):
+    """
+    내보낸 step을 DataFrame으로 읽기 (extract_target_tags + 숫자 변환 결과와 같은 모양)
+
+    Parameters:
+    - path: 내보내기 디렉터리
+    - columns: 읽을 태그 리스트 (None이면 전체, 시간 컬럼은 항상 포함)
+
+    Returns:
+    - DataFrame (컬럼=태그명, df.attrs에 descriptions/signal_types)
+    """
+    arrays, manifest = open_step(path, mmap)
+    time_column = manifest['time_column']
+    names = [entry['name'] for entry in manifest['columns']]
+    if columns is not None:
+        wanted = set(columns) | {time_column}
+        names = [name for name in names if name in wanted]
+
+    df = pd.DataFrame({name: decode_column(arrays, manifest, name) for name in names})
+    tag_entries = [entry for entry in manifest['columns'] if entry['kind'] != 'time' and entry['name'] in names]
+    df.attrs = {'descriptions': {entry['name']: entry['description'] for entry in tag_entries},
+                'signal_types': {entry['name']: entry['kind'] for entry in tag_entries}}
+    return df
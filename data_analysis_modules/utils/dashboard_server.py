@@ -0,0 +1,253 @@
+import json
+import struct
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_with_metadata
+from .tag_metadata import file_metadata
+from .tag_search import TagSearchIndex, query_tokens
+from .local_store import load_store, load_store_index, load_store_pyramids
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .pyramid import build_pyramid, pyramid_window
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 대시보드 백엔드 (로컬 HTTP 서비스)
+# ============================================================================
+#
+# GET /                      브라우저용 대시보드 페이지 (캔버스에 직접 그림)
+# GET /api/steps             step 목록 [{step, n_tags}]
+# GET /api/steps/<n>         step n(1부터)의 태그 목록 (설명, 신호 종류, 데이터 존재 여부)
+# GET /api/tags?q=&limit=    태그명/설명 검색 (역색인, 관련도 순)
+# GET /api/series?tags=a,b&start=&end=&points=&format=json|bin
+#                            시간 구간 데이터 (요약 레벨 우선, 짧은 구간은 원본)
+#
+# format=bin 응답: [uint32 헤더 길이][JSON 헤더][float64 배열들] (리틀 엔디언)
+#   헤더: {'series': [{'tag', 'freq', 'n', 'fields': [...]}, ...]}
+#   각 태그마다 fields 순서대로 n개 float64 배열이 이어짐 (t는 epoch ms)
+
+DASHBOARD_HTML = Path(__file__).with_name('dashboard.html')
+
+
+class DashboardData:
+    """
+    대시보드가 조회하는 파일 단위 데이터 (원본, 태그 인덱스, 신호 종류, 요약 피라미드)
+    """
+
+    def __init__(self, df, pyramid=None, signal_types=None, time_column='Date'):
+        self.df = df
+        self.time_column = time_column
+        self.metadata = file_metadata(df)
+        self.tag_index = {tag: columns[0] for tag, columns in self.metadata['tag_columns'].items()
+                          if columns[0] != time_column}
+        if not self.tag_index and '_column_mapping' in df.attrs:
+            self.tag_index = {tag: col for tag, col in df.attrs['_column_mapping'].items() if col != time_column}
+
+        self.tag_descriptions = {tag: desc for tag, desc in self.metadata['descriptions'].items()
+                                 if tag in self.tag_index}
+        self.search_index = TagSearchIndex.from_metadata(self.metadata, tags=self.tag_index)
+
+        if signal_types is None:
+            catalog = update_signal_catalog({}, df, self.tag_index)
+            signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+        self.signal_types = signal_types
+
+        if pyramid is None:
+            pyramid = build_pyramid(df, self.tag_index, self.signal_types, time_column)
+        self.pyramid = pyramid
+
+        self.times = pd.DatetimeIndex(df[time_column])
+
+    @classmethod
+    def from_hdf5(cls, file_path, time_column='Date'):
+        """export된 HDF5 파일에서 생성 (피라미드는 로드 시 한 번 계산)"""
+        df = load_hdf5_with_metadata(file_path)
+        if df is None:
+            raise ValueError(f"파일을 로드할 수 없습니다: {file_path}")
+        return cls(df, time_column=time_column)
+
+    @classmethod
+    def from_store(cls, store_dir):
+        """증분 저장소에서 생성 (저장된 카탈로그와 피라미드를 그대로 사용)"""
+        index = load_store_index(store_dir)
+        if index is None:
+            raise ValueError(f"저장소가 없습니다: {store_dir}")
+        df = load_store(store_dir).reset_index(drop=True)
+        signal_types = {tag: entry['type'] for tag, entry in index['signal_catalog'].items()}
+        return cls(df, pyramid=load_store_pyramids(store_dir), signal_types=signal_types,
+                   time_column=index['time_column'])
+
+    def list_steps(self):
+        return [{'step': i + 1, 'n_tags': len(tags)} for i, tags in enumerate(step_tags) if tags]
+
+    def step_info(self, step):
+        tags = step_tags[step - 1] if 1 <= step <= len(step_tags) else []
+        return [self.tag_info(tag) for tag in tags]
+
+    def tag_info(self, tag):
+        return {
+            'tag': tag,
+            'description': self.tag_descriptions.get(tag, ''),
+            'type': self.signal_types.get(tag),
+            'available': tag in self.tag_index,
+        }
+
+    def search_tags(self, query, limit=50):
+        """태그명/설명 검색 (TagSearchIndex, 관련도 순, 검색어가 없으면 태그 순서대로)"""
+        if not query_tokens(query):
+            return [self.tag_info(tag) for tag in list(self.tag_index)[:limit]]
+        return [{**self.tag_info(hit['tag']), 'score': hit['score']}
+                for hit in self.search_index.search(query, limit)]
+
+    def series(self, tag, start=None, end=None, points=1500):
+        """
+        태그의 시간 구간 데이터 (points 이상을 주는 가장 거친 요약 레벨, 없으면 원본)
+
+        Returns:
+            dict: {'tag', 'freq', 'fields': {name: np.ndarray}} (태그가 없으면 None)
+        """
+        if tag not in self.tag_index:
+            return None
+
+        start = _parse_time(start) if start else self.times[0]
+        end = _parse_time(end) if end else self.times[-1]
+
+        freq, window = pyramid_window(self.pyramid, tag, start, end, points)
+        if window is not None:
+            fields = {'t': _epoch_ms(window.index)}
+            fields.update({stat: window[stat].to_numpy(dtype=float) for stat in ['min', 'max', 'mean', 'last']})
+            return {'tag': tag, 'freq': freq, 'fields': fields}
+
+        # 짧은 구간은 원본 (구간 내 행 수가 points 미만이므로 응답이 작음)
+        i0 = self.times.searchsorted(start, side='left')
+        i1 = self.times.searchsorted(end, side='right')
+        raw = self.df.iloc[i0:i1]
+        values = to_numeric_tag_frame(raw, {tag: self.tag_index[tag]}, self.signal_types)[tag].to_numpy()
+        return {'tag': tag, 'freq': 'raw', 'fields': {'t': _epoch_ms(self.times[i0:i1]), 'value': values}}
+
+
+def _parse_time(value):
+    # 브라우저는 epoch ms를 UTC ISO 문자열로 돌려주므로, tz가 붙은 값은 naive UTC로 맞춤
+    ts = pd.Timestamp(value)
+    return ts.tz_convert(None) if ts.tzinfo is not None else ts
+
+
+def _epoch_ms(times):
+    return (pd.DatetimeIndex(times).as_unit('ms').asi8).astype(float)
+
+
+def _encode_series_binary(series_list):
+    header = {'series': [
+        {'tag': s['tag'], 'freq': s['freq'], 'n': len(s['fields']['t']), 'fields': list(s['fields'])}
+        for s in series_list
+    ]}
+    header_bytes = json.dumps(header).encode('utf-8')
+    arrays = [np.ascontiguousarray(arr, dtype='<f8').tobytes()
+              for s in series_list for arr in s['fields'].values()]
+    return struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(arrays)
+
+
+def _encode_series_json(series_list):
+    payload = []
+    for s in series_list:
+        fields = {name: [None if np.isnan(v) else v for v in arr.tolist()] for name, arr in s['fields'].items()}
+        payload.append({'tag': s['tag'], 'freq': s['freq'], **fields})
+    return json.dumps({'series': payload}).encode('utf-8')
+
+
+def make_handler(data):
+    """
+    DashboardData를 조회하는 요청 핸들러 클래스 생성
+    """
+
+    class DashboardHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            parts = [p for p in url.path.split('/') if p]
+
+            try:
+                if not parts:
+                    self._send(200, DASHBOARD_HTML.read_bytes(), 'text/html; charset=utf-8')
+                elif parts == ['api', 'steps']:
+                    self._send_json(data.list_steps())
+                elif len(parts) == 3 and parts[:2] == ['api', 'steps']:
+                    self._send_json(data.step_info(int(parts[2])))
+                elif parts == ['api', 'tags']:
+                    self._send_json(data.search_tags(params.get('q', ''), int(params.get('limit', 50))))
+                elif parts == ['api', 'series']:
+                    self._send_series(params)
+                else:
+                    self._send_json({'error': f'unknown path: {url.path}'}, status=404)
+            except (ValueError, KeyError) as e:
+                self._send_json({'error': str(e)}, status=400)
+
+        def _send_series(self, params):
+            tags = [t for t in params.get('tags', '').split(',') if t]
+            points = int(params.get('points', 1500))
+            series_list = [s for s in (data.series(tag, params.get('start'), params.get('end'), points)
+                                       for tag in tags) if s is not None]
+            if params.get('format') == 'bin':
+                self._send(200, _encode_series_binary(series_list), 'application/octet-stream')
+            else:
+                self._send(200, _encode_series_json(series_list), 'application/json')
+
+        def _send_json(self, obj, status=200):
+            self._send(status, json.dumps(obj, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 요청마다 로그를 찍지 않음
+            pass
+
+    return DashboardHandler
+
+
+def serve_dashboard(data, host='127.0.0.1', port=8050):
+    """
+    대시보드 HTTP 서비스 실행 (Ctrl+C로 종료)
+
+    Args:
+        data: DashboardData
+        host: 바인딩 주소 (기본: 로컬 전용)
+        port: 포트
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(data))
+    print(f"{'='*60}")
+    print(f"대시보드 실행: http://{host}:{port}/")
+    print(f"{'='*60}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n대시보드를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    # 사용법: python -m utils.dashboard_server <HDF5 파일 또는 저장소 디렉터리> [--port 8050]
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Step 신호 대시보드 서버')
+    parser.add_argument('source', help='HDF5 파일 또는 local_store 저장소 디렉터리')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    args = parser.parse_args()
+
+    if Path(args.source).is_dir():
+        dashboard_data = DashboardData.from_store(args.source)
+    else:
+        dashboard_data = DashboardData.from_hdf5(args.source)
+    serve_dashboard(dashboard_data, args.host, args.port)
@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+
+from .events import dio_to_numeric, mask_intervals
+
+
+# ============================================================================
+# 비트 패킹 DIO 행렬
+# ============================================================================
+#
+# 샘플마다 DIO 태그 8개를 1바이트에 담는다 (np.packbits, 태그 축 기준).
+#   bits[:, b]  : 태그 8*b ~ 8*b+7 의 ON 여부 (MSB가 첫 태그)
+#   valid[:, b] : 같은 위치 태그 값이 ON/OFF로 인식되었는지 여부 (NaN/이상값이면 0)
+# 여러 태그 조건은 바이트 단위 마스크 비교로 평가하므로, 조건에 걸린 바이트 수만큼의
+# 벡터 연산으로 끝나고 원본 문자열('ON'/'OFF') 컬럼 대비 메모리는 수십 분의 1이다.
+# 생성할 때도 태그 하나씩 변환해 바로 해당 비트에 넣으므로 (샘플 × 태그) float 행렬을 만들지 않는다.
+# 에지는 detect_dio_events와 같이 값이 없는 구간(NaN)을 직전 상태 유지로 보고 찾는다.
+
+
+class BitPackedDIO:
+    """
+    DIO 태그들을 비트 단위로 압축 저장하고 논리 조건을 벡터 연산으로 평가
+
+    Parameters:
+    - tags: 태그 리스트 (비트 순서)
+    - bits: (n_samples, n_bytes) uint8 ON 비트
+    - valid: (n_samples, n_bytes) uint8 유효 비트
+    - times: 샘플 시각 배열 (선택)
+    """
+
+    __slots__ = ('tags', 'bits', 'valid', 'times', '_position')
+
+    def __init__(self, tags, bits, valid, times=None):
+        self.tags = list(tags)
+        self.bits = bits
+        self.valid = valid
+        self.times = times
+        self._position = {tag: i for i, tag in enumerate(self.tags)}
+
+    @classmethod
+    def from_frame(cls, df, tags, time_column='Date', tag_columns=None):
+        """
+        DataFrame의 DIO 컬럼들로부터 생성
+
+        Parameters:
+        - df: DataFrame (원본 또는 extract_target_tags 결과)
+        - tags: DIO 태그 리스트
+        - time_column: 시간 컬럼명
+        - tag_columns: {tag: 컬럼명} (None이면 태그명 = 컬럼명)
+        """
+        tag_columns = tag_columns or {tag: tag for tag in tags}
+        tags = [tag for tag in dict.fromkeys(tags) if tag_columns.get(tag) in df.columns]
+
+        # 바이트(태그 8개) 단위로 열을 채우므로 열 우선 배열 (조회도 열 단위)
+        n_bytes = (len(tags) + 7) // 8
+        bits = np.zeros((len(df), n_bytes), dtype=np.uint8, order='F')
+        valid = np.zeros((len(df), n_bytes), dtype=np.uint8, order='F')
+        for j, tag in enumerate(tags):
+            signal_data = df[tag_columns[tag]]
+            if isinstance(signal_data, pd.DataFrame):
+                signal_data = signal_data.iloc[:, 0]
+            values = dio_to_numeric(signal_data)
+            shift = 7 - j % 8   # MSB가 첫 태그 (np.packbits와 같은 순서)
+            bits[:, j // 8] |= (values > 0.5).view(np.uint8) << shift
+            valid[:, j // 8] |= (~np.isnan(values)).view(np.uint8) << shift
+
+        times = df[time_column].to_numpy() if time_column in df.columns else None
+
+        return cls(tags, bits, valid, times)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes + self.valid.nbytes
+
+    def __len__(self):
+        return len(self.bits)
+
+    # ------------------------------------------------------------------
+    # 단일 태그
+    # ------------------------------------------------------------------
+
+    def _locate(self, tag):
+        if tag not in self._position:
+            raise KeyError(f"DIO 태그가 없습니다: {tag}")
+        i = self._position[tag]
+        return i // 8, np.uint8(0x80 >> (i % 8))
+
+    def column(self, tag):
+        """
+        태그의 ON 여부 (bool 배열, 값이 없으면 False)
+        """
+        byte, mask = self._locate(tag)
+        return (self.bits[:, byte] & mask) != 0
+
+    def known(self, tag):
+        """
+        태그 값이 ON/OFF로 인식된 샘플 여부
+        """
+        byte, mask = self._locate(tag)
+        return (self.valid[:, byte] & mask) != 0
+
+    def unpack(self, tags=None):
+        """
+        지정 태그들을 0/1/NaN float DataFrame으로 복원
+        """
+        tags = tags or self.tags
+        data = {}
+        for tag in tags:
+            values = self.column(tag).astype(float)
+            values[~self.known(tag)] = np.nan
+            data[tag] = values
+        return pd.DataFrame(data)
+
+    # ------------------------------------------------------------------
+    # 다중 태그 조건
+    # ------------------------------------------------------------------
+
+    def _byte_masks(self, tags):
+        masks = {}
+        for tag in tags:
+            byte, mask = self._locate(tag)
+            masks[byte] = masks.get(byte, np.uint8(0)) | mask
+        return masks
+
+    def query(self, on=(), off=()):
+        """
+        on 태그가 모두 ON이고 off 태그가 모두 OFF인 샘플 (bool 배열)
+
+        예: dio.query(on=['ACWP-01-01A-RF', 'ACWP-01-01A-AMOD', 'MOV-01-3702A-RDY'])
+        """
+        result = np.ones(len(self), dtype=bool)
+        for byte, mask in self._byte_masks(on).items():
+            result &= (self.bits[:, byte] & mask) == mask
+            result &= (self.valid[:, byte] & mask) == mask
+        for byte, mask in self._byte_masks(off).items():
+            result &= (self.bits[:, byte] & mask) == 0
+            result &= (self.valid[:, byte] & mask) == mask
+        return result
+
+    def all_on(self, tags):
+        return self.query(on=tags)
+
+    def all_off(self, tags):
+        return self.query(off=tags)
+
+    def any_on(self, tags):
+        """
+        tags 중 하나라도 ON인 샘플 (bool 배열)
+        """
+        result = np.zeros(len(self), dtype=bool)
+        for byte, mask in self._byte_masks(tags).items():
+            result |= (self.bits[:, byte] & mask) != 0
+        return result
+
+    # ------------------------------------------------------------------
+    # 에지 / 시점
+    # ------------------------------------------------------------------
+
+    def edges(self, tag, rising=True):
+        """
+        태그가 ON(rising=True) 또는 OFF로 바뀐 샘플 위치 배열
+
+        값이 없는 샘플은 직전 상태를 유지한 것으로 보므로 (detect_dio_events와 같음)
+        NaN 구간을 사이에 둔 변화는 다시 값이 들어온 샘플에서 에지가 된다.
+        """
+        positions = np.flatnonzero(self.known(tag))
+        state = self.column(tag)[positions]
+        changed = state[1:] != state[:-1]
+        return positions[1:][changed & (state[1:] if rising else ~state[1:])]
+
+    def first_time(self, tag, rising=True, where=None):
+        """
+        where 조건이 참인 시점에 태그가 처음 ON(또는 OFF)으로 바뀐 위치와 시각
+
+        예: X가 ON으로 바뀌었을 때 Y가 OFF였던 첫 시점
+            dio.first_time('X', where=dio.query(off=['Y']))
+
+        Returns:
+        - (위치, 시각) 또는 (None, None)
+        """
+        positions = self.edges(tag, rising)
+        if where is not None:
+            positions = positions[where[positions]]
+        if len(positions) == 0:
+            return None, None
+        position = int(positions[0])
+        return position, (self.times[position] if self.times is not None else None)
+
+    def intervals(self, mask):
+        """
+        bool 마스크가 연속으로 참인 구간 목록
+
+        Returns:
+        - DataFrame [start, end, start_time, end_time, samples] (end는 마지막 참 샘플 위치)
+        """
+        return mask_intervals(mask, self.times)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+# DIO 상태값 → 0/1 매핑 (plot_dio_signals_ordered와 동일한 규칙)
+DIO_VALUE_MAP = {'ON': 1, 'OFF': 0, '1': 1, '0': 0, 1: 1, 0: 0, True: 1, False: 0}
+
+
+def dio_to_numeric(signal_data):
+    """
+    DIO 신호를 0/1 float 배열로 변환 (인식할 수 없는 값은 NaN)
+
+    Args:
+        signal_data: DIO 값 Series
+
+    Returns:
+        np.ndarray: float64 배열 (1.0=ON, 0.0=OFF, NaN=알 수 없음)
+    """
+    return pd.to_numeric(signal_data.map(DIO_VALUE_MAP), errors='coerce').to_numpy(dtype=float)
+
+
+def detect_dio_events(df, dio_signals, time_column='Date', initial_states=None, position_offset=0):
+    """
+    DIO 신호들의 상태 변화(상승/하강 에지)를 이벤트 테이블로 추출
+
+    모든 신호를 하나의 2D 배열로 쌓아 한 번의 diff로 에지를 찾는다.
+    NaN 구간은 직전 상태를 유지한 것으로 간주하여 가짜 에지를 만들지 않는다.
+
+    Args:
+        df: DataFrame (dio_signals 컬럼 포함)
+        dio_signals: DIO 신호 리스트
+        time_column: 시간 컬럼명
+        initial_states: {tag: 0/1} 직전 데이터의 마지막 상태 (증분 처리용)
+        position_offset: 행 위치 오프셋 (증분 처리 시 기존 행 수)
+
+    Returns:
+        events: DataFrame [time, position, tag, edge]
+        last_states: {tag: 0/1} 마지막 상태 (다음 증분 처리에 전달)
+    """
+    columns = ['time', 'position', 'tag', 'edge']
+    signals = [s for s in dio_signals if s in df.columns]
+    if not signals or len(df) == 0:
+        return pd.DataFrame(columns=columns), dict(initial_states or {})
+
+    initial_states = initial_states or {}
+    values = np.column_stack([dio_to_numeric(df[s]) for s in signals])
+
+    # 직전 상태를 맨 앞 행으로 붙여서 경계 에지도 검출
+    first_row = np.array([initial_states.get(s, np.nan) for s in signals], dtype=float)
+    values = np.vstack([first_row, values])
+    values = pd.DataFrame(values).ffill().to_numpy()
+
+    diff = np.diff(values, axis=0)
+    rows, cols = np.nonzero(np.nan_to_num(diff) != 0)
+
+    times = df[time_column].to_numpy() if time_column in df.columns else np.full(len(df), np.datetime64('NaT'))
+    events = pd.DataFrame({
+        'time': times[rows],
+        'position': rows.astype(np.int64) + position_offset,
+        'tag': np.asarray(signals, dtype=object)[cols],
+        'edge': np.where(diff[rows, cols] > 0, 'rising', 'falling'),
+    })
+    events = events.sort_values(['position', 'tag'], kind='stable').reset_index(drop=True)
+
+    last_states = dict(initial_states)
+    for j, s in enumerate(signals):
+        if not np.isnan(values[-1, j]):
+            last_states[s] = int(values[-1, j])
+
+    return events, last_states
+
+
+def mask_intervals(mask, times=None):
+    """
+    bool 마스크가 연속으로 참인 구간 목록
+
+    Args:
+        mask: bool 배열
+        times: 샘플 시각 배열 (선택)
+
+    Returns:
+        DataFrame [start, end, samples, start_time, end_time] (end는 마지막 참 샘플 위치)
+    """
+    padded = np.concatenate([[False], np.asarray(mask, dtype=bool), [False]])
+    change = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = change[0::2], change[1::2] - 1
+
+    result = pd.DataFrame({'start': starts, 'end': ends, 'samples': ends - starts + 1})
+    if times is not None:
+        times = np.asarray(times)
+        result['start_time'] = times[starts]
+        result['end_time'] = times[ends]
+    return result
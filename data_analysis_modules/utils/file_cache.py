@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+# ============================================================================
+# 파일 지문(fingerprint) 및 파일별 캐시 디렉터리
+# ============================================================================
+
+DEFAULT_CACHE_DIR = Path('.cache')
+
+
+def file_fingerprint(file_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    파일 내용의 SHA-1 지문 계산
+
+    큰 HDF5 파일을 매번 해시하지 않도록 (경로, 크기, 수정 시각)이 같으면
+    cache_dir/fingerprints.json에 기록된 값을 재사용한다.
+
+    Args:
+        file_path: 파일 경로
+        cache_dir: 캐시 루트 디렉터리
+
+    Returns:
+        str: 16진수 지문
+    """
+    file_path = Path(file_path).resolve()
+    stat = file_path.stat()
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    memo_path = Path(cache_dir) / 'fingerprints.json'
+    memo = {}
+    if memo_path.exists():
+        try:
+            with open(memo_path, 'r', encoding='utf-8') as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            memo = {}
+
+    entry = memo.get(str(file_path))
+    if entry and entry['stamp'] == stamp:
+        return entry['sha1']
+
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    digest = sha1.hexdigest()
+
+    memo[str(file_path)] = {'stamp': stamp, 'sha1': digest}
+    memo_path.parent.mkdir(parents=True, exist_ok=True)
+    # 여러 프로세스가 동시에 갱신할 수 있으므로 임시 파일은 프로세스별로 분리
+    tmp_path = memo_path.with_suffix(f'.json.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(memo, f)
+    os.replace(tmp_path, memo_path)
+
+    return digest
+
+
+def file_cache_dir(file_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    파일 내용별 파생 데이터 캐시 디렉터리 (파일이 바뀌면 다른 디렉터리가 됨)
+
+    Args:
+        file_path: 원본 파일 경로
+        cache_dir: 캐시 루트 디렉터리
+
+    Returns:
+        Path: cache_dir/files/<지문 앞 16자리> (생성됨)
+    """
+    path = Path(cache_dir) / 'files' / file_fingerprint(file_path, cache_dir)[:16]
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_cache_tables(cache_path, tables_by_key):
+    """
+    DataFrame 여러 개를 HDF5 캐시 파일 하나로 저장
+
+    내용이 같은 파일은 캐시 디렉터리를 공유하므로 여러 프로세스가 같은 캐시를
+    동시에 쓸 수 있다. 프로세스별 임시 파일에 다 쓴 뒤 한 번에 교체한다.
+
+    Args:
+        cache_path: 캐시 파일 경로 (.h5)
+        tables_by_key: {HDF5 키: DataFrame} (순서대로 저장)
+    """
+    import warnings
+    import pandas as pd
+    import tables
+
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_suffix(f'{cache_path.suffix}.{os.getpid()}.tmp')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', tables.NaturalNameWarning)
+        warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+        for i, (key, table) in enumerate(tables_by_key.items()):
+            table.to_hdf(tmp_path, key=key, mode='w' if i == 0 else 'a')
+    os.replace(tmp_path, cache_path)
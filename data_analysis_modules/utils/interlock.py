@@ -0,0 +1,327 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .events import mask_intervals
+
+
+# ============================================================================
+# 인터록 / 기동 허가 조건 평가
+# ============================================================================
+#
+# 조건식 문법 (키워드는 대소문자 무시, 태그명은 '-', '.' 포함 가능):
+#   MOV-H1-4623-OF AND MOV-H1-4623-AMOD
+#   NOT MOV-H1-4623-F AND (ACWP-01-01A-RF OR ACWP-01-01B-RF)
+#   LIT-H1-4611-SEL > 350 AND MOV-H1-4623-CF == OFF
+#   (ACWP-01-01A-RF FOR 30s) AND MOV-01-3702A-RDY WITHIN 5min
+#
+#   태그 단독           : 값이 0이 아니면 참 (DIO는 ON)
+#   태그 <비교> 값      : >, >=, <, <=, ==, != (값은 숫자 또는 ON/OFF/TRUE/FALSE)
+#   <조건> FOR N[단위]    : 조건이 N 이상 연속으로 유지된 시점부터 참
+#   <조건> WITHIN N[단위] : 최근 N 안에 조건이 한 번이라도 참이었으면 참
+#   단위: s(기본), m/min, h
+#
+# 조건식은 한 번 컴파일해 두고 파일마다 evaluate()로 평가한다. 각 연산자는
+# 전체 샘플에 대한 NumPy 벡터 연산 한 번이며, 태그 값은 파일당 한 번만 변환한다.
+# 값이 없는 샘플(NaN)과 파일에 없는 태그는 '알 수 없음'으로 평가한다 (3값 논리).
+# NOT 알 수 없음 = 알 수 없음, 거짓 AND 알 수 없음 = 거짓, 참 OR 알 수 없음 = 참이고
+# 최종 결과에서 알 수 없음은 거짓이다 (NOT <없는 태그>도 성립하지 않음).
+
+KEYWORDS = {'AND', 'OR', 'NOT', 'FOR', 'WITHIN'}
+CONSTANTS = {'ON': 1.0, 'OFF': 0.0, 'TRUE': 1.0, 'FALSE': 0.0}
+DURATION_UNITS = {'S': 1, 'SEC': 1, 'M': 60, 'MIN': 60, 'H': 3600}
+COMPARISONS = {
+    '>': np.greater, '>=': np.greater_equal,
+    '<': np.less, '<=': np.less_equal,
+    '==': np.equal, '!=': np.not_equal,
+}
+
+_TOKEN = re.compile(r'\s*(?:(>=|<=|==|!=|>|<|\(|\))|([A-Za-z0-9_.+\-]+))')
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)([A-Za-z]*)$')
+
+
+def _tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"조건식 해석 실패 (위치 {position}): {expression[position:position + 20]!r}")
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    재귀 하강 파서 (우선순위: OR < AND < NOT < FOR/WITHIN < 비교/괄호)
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _keyword(self):
+        token = self._peek()
+        return token.upper() if token is not None else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError(f"조건식이 중간에 끝났습니다: {self.expression!r}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"해석할 수 없는 토큰 '{self._peek()}': {self.expression!r}")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._keyword() == 'OR':
+            self._next()
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._keyword() == 'AND':
+            self._next()
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def _not(self):
+        if self._keyword() == 'NOT':
+            self._next()
+            return ('not', self._not())
+        return self._temporal()
+
+    def _temporal(self):
+        node = self._primary()
+        while self._keyword() in ('FOR', 'WITHIN'):
+            operator = self._next().lower()
+            node = (operator, node, self._duration())
+        return node
+
+    def _duration(self):
+        token = self._next()
+        match = _DURATION.match(token)
+        if match is None:
+            raise ValueError(f"시간 값이 아닙니다: '{token}'")
+        unit = match.group(2).upper()
+        if not unit and self._keyword() in DURATION_UNITS:
+            unit = self._next().upper()
+        if unit and unit not in DURATION_UNITS:
+            raise ValueError(f"알 수 없는 시간 단위: '{unit}'")
+        return float(match.group(1)) * DURATION_UNITS.get(unit, 1)
+
+    def _primary(self):
+        token = self._next()
+        if token == '(':
+            node = self._or()
+            if self._next() != ')':
+                raise ValueError(f"괄호가 닫히지 않았습니다: {self.expression!r}")
+            return node
+        if token == ')' or token in COMPARISONS or token.upper() in KEYWORDS:
+            raise ValueError(f"태그가 와야 할 위치에 '{token}': {self.expression!r}")
+
+        if self._peek() in COMPARISONS:
+            operator = self._next()
+            return ('cmp', token, operator, self._value())
+        return ('tag', token)
+
+    def _value(self):
+        token = self._next()
+        if token.upper() in CONSTANTS:
+            return CONSTANTS[token.upper()]
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError(f"비교 값이 숫자나 ON/OFF가 아닙니다: '{token}'") from None
+
+
+def _collect_tags(node, tags):
+    kind = node[0]
+    if kind in ('tag', 'cmp'):
+        tags.setdefault(node[1])
+    elif kind in ('and', 'or'):
+        for child in node[1]:
+            _collect_tags(child, tags)
+    else:
+        _collect_tags(node[1], tags)
+    return tags
+
+
+class _EvalContext:
+    """
+    한 DataFrame에 대한 평가 상태 (태그 숫자 배열, 경과 시간)
+    """
+
+    def __init__(self, df, tags, tag_columns=None, time_column='Date', signal_types=None, sample_period=1.0):
+        tag_columns = tag_columns or {tag: tag for tag in tags}
+        tag_columns = {tag: tag_columns[tag] for tag in tags
+                       if tag in tag_columns and tag_columns[tag] in df.columns and tag_columns[tag] != time_column}
+
+        if signal_types is None or any(tag not in signal_types for tag in tag_columns):
+            catalog = update_signal_catalog({}, df, tag_columns)
+            signal_types = {**{tag: entry['type'] for tag, entry in catalog.items()}, **(signal_types or {})}
+
+        self.n = len(df)
+        self.values = {tag: values.to_numpy()
+                       for tag, values in to_numeric_tag_frame(df, tag_columns, signal_types).items()}
+        self.missing = [tag for tag in tags if tag not in self.values]
+
+        if time_column in df.columns:
+            times = pd.DatetimeIndex(df[time_column])
+            self.times = times.to_numpy()
+            self.seconds = (times - times[0]).total_seconds().to_numpy() if self.n else np.empty(0)
+        else:
+            self.times = None
+            self.seconds = np.arange(self.n) * float(sample_period)
+
+    def tag(self, tag):
+        return self.values.get(tag, np.full(self.n, np.nan))
+
+
+def _evaluate(node, context):
+    # (value, known): value는 참인 샘플 (known인 샘플에서만 참), known은 참/거짓이 정해진 샘플
+    kind = node[0]
+
+    if kind in ('tag', 'cmp'):
+        values = context.tag(node[1])
+        known = ~np.isnan(values)
+        if kind == 'tag':
+            return known & (values != 0), known
+        _, _, operator, value = node
+        return known & COMPARISONS[operator](values, value), known
+
+    if kind == 'not':
+        value, known = _evaluate(node[1], context)
+        return ~value & known, known
+
+    if kind in ('and', 'or'):
+        results = [_evaluate(child, context) for child in node[1]]
+        all_known = np.logical_and.reduce([known for _, known in results])
+        if kind == 'and':
+            # 하나라도 확실히 거짓이면 거짓
+            value = np.logical_and.reduce([value for value, _ in results])
+            decided = np.logical_or.reduce([known & ~value for value, known in results])
+        else:
+            # 하나라도 참이면 참
+            value = np.logical_or.reduce([value for value, _ in results])
+            decided = value
+        return value, all_known | decided
+
+    mask, known = _evaluate(node[1], context)
+    seconds = context.seconds
+    index = np.arange(context.n)
+
+    if kind == 'for':
+        # 각 참 구간의 시작 위치를 앞으로 채워서, 구간 시작부터의 경과 시간과 비교
+        starts = mask & ~np.concatenate([[False], mask[:-1]])
+        run_start = np.maximum.accumulate(np.where(starts, index, 0))
+        return mask & (seconds - seconds[run_start] >= node[2]), known
+
+    # within: 마지막으로 참이었던 위치를 앞으로 채워서, 그 이후 경과 시간과 비교
+    last_true = np.maximum.accumulate(np.where(mask, index, -1))
+    seen = last_true >= 0
+    result = seen & (seconds - seconds[np.maximum(last_true, 0)] <= node[2])
+    return result, known | result
+
+
+class Condition:
+    """
+    컴파일된 조건식
+
+    Parameters:
+    - expression: 조건식 문자열
+    """
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tree = _Parser(expression).parse()
+        self.tags = list(_collect_tags(self.tree, {}))
+
+    def __repr__(self):
+        return f"Condition({self.expression!r})"
+
+    def evaluate(self, df, tag_columns=None, time_column='Date', signal_types=None, context=None):
+        """
+        샘플별 조건 성립 여부 (bool 배열, 값을 알 수 없는 샘플은 False)
+
+        Parameters:
+        - df: DataFrame (extract_target_tags 결과처럼 컬럼=태그명, 또는 원본 + tag_columns)
+        - tag_columns: {tag: 컬럼명} (None이면 태그명 = 컬럼명)
+        - time_column: 시간 컬럼명 (없으면 샘플 간격 1초로 가정)
+        - signal_types: {tag: 'dio'/'analog'} (None이면 데이터로 판별)
+        """
+        if context is None:
+            context = _EvalContext(df, self.tags, tag_columns, time_column, signal_types)
+        return _evaluate(self.tree, context)[0]
+
+    def intervals(self, df, tag_columns=None, time_column='Date', signal_types=None, min_duration=0):
+        """
+        조건이 성립한 구간 목록
+
+        Returns:
+        - DataFrame [start, end, samples, start_time, end_time, duration_s]
+        """
+        context = _EvalContext(df, self.tags, tag_columns, time_column, signal_types)
+        return _condition_intervals(self.evaluate(df, context=context), context, min_duration)
+
+
+def compile_condition(expression):
+    """
+    조건식 문자열을 Condition으로 컴파일 (문법 오류는 ValueError)
+    """
+    return expression if isinstance(expression, Condition) else Condition(expression)
+
+
+def _condition_intervals(mask, context, min_duration=0):
+    intervals = mask_intervals(mask, context.times)
+    intervals['duration_s'] = context.seconds[intervals['end']] - context.seconds[intervals['start']]
+    if min_duration:
+        intervals = intervals[intervals['duration_s'] >= min_duration].reset_index(drop=True)
+    return intervals
+
+
+def check_conditions(df, conditions, tag_columns=None, time_column='Date', signal_types=None, min_duration=0):
+    """
+    여러 조건식을 한 파일에 대해 평가하여 성립 구간을 하나의 테이블로 반환
+
+    태그 값 변환은 모든 조건에 대해 한 번만 수행한다.
+
+    Parameters:
+    - df: DataFrame
+    - conditions: {이름: 조건식 문자열 또는 Condition}
+    - tag_columns: {tag: 컬럼명} (None이면 태그명 = 컬럼명)
+    - time_column: 시간 컬럼명
+    - signal_types: {tag: 'dio'/'analog'} (None이면 데이터로 판별)
+    - min_duration: 이보다 짧은 구간(초)은 제외
+
+    Returns:
+    - DataFrame [condition, start, end, samples, start_time, end_time, duration_s]
+    """
+    compiled = {name: compile_condition(expression) for name, expression in conditions.items()}
+    tags = list(dict.fromkeys(tag for condition in compiled.values() for tag in condition.tags))
+    context = _EvalContext(df, tags, tag_columns, time_column, signal_types)
+
+    if context.missing:
+        print(f"⚠️  데이터에 없는 태그 ({len(context.missing)}개, 알 수 없음 → 조건 불성립으로 처리): {context.missing}")
+
+    tables = []
+    for name, condition in compiled.items():
+        intervals = _condition_intervals(condition.evaluate(df, context=context), context, min_duration)
+        intervals.insert(0, 'condition', name)
+        tables.append(intervals)
+
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
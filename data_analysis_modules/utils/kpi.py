@@ -0,0 +1,336 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .local_store import build_tag_index, load_store, load_store_index
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .dio_bitpack import BitPackedDIO
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir, write_cache_tables
+from .quality import file_quality, apply_quality_mask
+from .tag_templates import split_unit
+
+
+# ============================================================================
+# 설비 KPI (밸브 스트로크 시간, 펌프 기동 후 유량 확립 시간, 고장 횟수)
+# ============================================================================
+#
+# 태그명 '<설비>-<접미사>'에서 설비별 신호를 찾는다 (예: MOV-H1-4623-OF → MOV-H1-4623, OF).
+#   open_stroke      : -CF 해제(닫힘 리밋 이탈) → -OF 도달
+#   close_stroke     : -OF 해제 → -CF 도달
+#   flow_established : 펌프 -RF 상승 → 유량 태그가 기준값 이상
+#   fault            : -F 상승 (duration_s는 고장 해제까지)
+# 시작 에지마다 그 이후 목표 상태가 처음 참인 샘플을 searchsorted로 한 번에 찾고,
+# 다음 시작 에지 전이나 최대 시간 안에 도달하지 못한 것은 미완료로 센다.
+#
+# 같은 설비를 HRSG-1/2/3끼리 비교할 수 있도록 unit(H1, H2, ...)과
+# group(MOV-H{u}-4623)을 함께 기록한다.
+# 품질 점검 구간(utils/quality.py)을 넘기면 나쁜 구간 값을 NaN으로 바꾼 뒤 계산한다
+# (DIO는 직전 상태 유지로 보므로 결측/잘못된 값이 가짜 동작을 만들지 않음).
+
+KPI_VERSION = 1
+
+KPI_COLUMNS = ['equipment', 'unit', 'group', 'kpi', 'start_time', 'end_time', 'duration_s']
+SUMMARY_COLUMNS = ['equipment', 'unit', 'group', 'kpi', 'count', 'incomplete',
+                   'mean_s', 'min_s', 'max_s', 'last_s']
+
+
+def split_equipment(tag):
+    """
+    태그를 (설비, 접미사)로 분리 ('MOV-H1-4623-OF' → ('MOV-H1-4623', 'OF'))
+    """
+    equipment, _, suffix = str(tag).rpartition('-')
+    return equipment, suffix
+
+
+def equipment_unit(equipment):
+    """
+    설비의 호기와 호기 공통 그룹명 ('MOV-H2-4623' → ('H2', 'MOV-H{u}-4623'), 호기 없으면 ('', 설비))
+    """
+    return split_unit(equipment)
+
+
+def discover_equipment(tags):
+    """
+    태그 목록에서 KPI 대상 설비와 신호 태그 찾기
+
+    Returns:
+    - {'valves': {설비: {'OF', 'CF'}}, 'pumps': {설비: {'RF'}}, 'faults': {설비: {'F'}}}
+      (값은 {접미사: 태그})
+    """
+    signals = {}
+    for tag in tags:
+        equipment, suffix = split_equipment(tag)
+        if equipment:
+            signals.setdefault(equipment, {})[suffix] = tag
+
+    valves, pumps, faults = {}, {}, {}
+    for equipment, by_suffix in signals.items():
+        if 'OF' in by_suffix and 'CF' in by_suffix:
+            valves[equipment] = {'OF': by_suffix['OF'], 'CF': by_suffix['CF']}
+        if 'RF' in by_suffix and equipment.split('-')[0].endswith('P'):
+            pumps[equipment] = {'RF': by_suffix['RF']}
+        if 'F' in by_suffix:
+            faults[equipment] = {'F': by_suffix['F']}
+
+    return {'valves': valves, 'pumps': pumps, 'faults': faults}
+
+
+def expand_flow_tags(flow_tags, pumps):
+    """
+    펌프별 유량 기준 설정 전개
+
+    Parameters:
+    - flow_tags: {펌프 설비: (유량 태그, 기준값)}, 키와 태그에 '{u}'를 쓰면 호기별로 전개
+      예: {'BFP-H{u}-01A': ('FIT-H{u}-4101-SEL', 50.0)}
+    - pumps: discover_equipment(...)['pumps']
+
+    Returns:
+    - {펌프 설비: (유량 태그, 기준값)}
+    """
+    expanded = {}
+    for key, (flow_tag, threshold) in (flow_tags or {}).items():
+        if '{u}' not in key:
+            expanded[key] = (flow_tag, float(threshold))
+            continue
+        for equipment in pumps:
+            unit, group = equipment_unit(equipment)
+            if unit and group == key:
+                expanded[equipment] = (flow_tag.replace('{u}', unit[1:]), float(threshold))
+    return expanded
+
+
+def kpi_tags(tags, flow_tags=None):
+    """
+    KPI 계산에 쓰는 태그 (설비 DIO 신호 + 펌프 유량 태그, 파일에서 이 컬럼만 읽으면 됨)
+    """
+    equipment = discover_equipment(tags)
+    flow_tags = expand_flow_tags(flow_tags, equipment['pumps'])
+    used = [tag for group in equipment.values() for signals in group.values() for tag in signals.values()]
+    used += [flow_tag for flow_tag, _ in flow_tags.values()]
+    return list(dict.fromkeys(used))
+
+
+def pair_to_first(starts, target, seconds, max_duration=None):
+    """
+    시작 위치마다 그 이후 target이 처음 참인 위치와 소요 시간 (벡터 연산)
+
+    Parameters:
+    - starts: 시작 샘플 위치 배열 (오름차순)
+    - target: 목표 상태 bool 배열
+    - seconds: 샘플별 경과 시간(초)
+    - max_duration: 이 시간 안에 도달해야 완료로 봄 (초)
+
+    Returns:
+    - ends: 도달 위치 (미완료는 -1)
+    - durations: 소요 시간 (미완료는 NaN)
+    """
+    targets = np.flatnonzero(target)
+    ends = np.full(len(starts), -1, dtype=np.int64)
+    durations = np.full(len(starts), np.nan)
+    if len(starts) == 0 or len(targets) == 0:
+        return ends, durations
+
+    idx = np.searchsorted(targets, starts, side='left')
+    found = idx < len(targets)
+    candidates = targets[np.minimum(idx, len(targets) - 1)]
+
+    # 다음 시작 에지보다 먼저 도달해야 같은 동작으로 봄
+    next_starts = np.append(starts[1:], np.iinfo(np.int64).max)
+    valid = found & (candidates < next_starts)
+
+    elapsed = seconds[candidates] - seconds[starts]
+    if max_duration is not None:
+        valid &= elapsed <= max_duration
+
+    ends[valid] = candidates[valid]
+    durations[valid] = elapsed[valid]
+    return ends, durations
+
+
+def compute_kpis(df, tag_columns=None, time_column='Date', flow_tags=None, max_stroke_s=300, max_flow_s=600,
+                 quality_intervals=None):
+    """
+    DataFrame 하나에서 설비별 KPI 계산
+
+    Parameters:
+    - df: DataFrame (load_hdf5_with_metadata 결과 또는 컬럼=태그명)
+    - tag_columns: {tag: 컬럼명} (None이면 header_metadata로 만든 태그 인덱스, 없으면 컬럼명)
+    - time_column: 시간 컬럼명
+    - flow_tags: {펌프 설비: (유량 태그, 기준값)} (expand_flow_tags 참고)
+    - max_stroke_s: 스트로크 최대 시간 (초과 시 미완료)
+    - max_flow_s: 유량 확립 최대 시간
+    - quality_intervals: scan_quality / file_quality 구간 테이블 (주면 나쁜 구간을 제외하고 계산)
+
+    Returns:
+    - details: 동작별 DataFrame [equipment, unit, group, kpi, start_time, end_time, duration_s]
+    - summary: 설비/KPI별 DataFrame [..., count, incomplete, mean_s, min_s, max_s, last_s]
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col != time_column and col in df.columns}
+
+    equipment = discover_equipment(tag_columns)
+    flow_tags = expand_flow_tags(flow_tags, equipment['pumps'])
+
+    dio_tags = [tag for group in equipment.values() for signals in group.values() for tag in signals.values()]
+    if quality_intervals is not None:
+        # 사용하는 태그 컬럼만 골라 나쁜 구간을 NaN으로 (전체 DataFrame은 복사하지 않음)
+        used = {tag: tag_columns[tag] for tag in kpi_tags(tag_columns, flow_tags) if tag in tag_columns}
+        columns = list(dict.fromkeys(list(used.values()) + ([time_column] if time_column in df.columns else [])))
+        df = apply_quality_mask(df[columns], quality_intervals, used)
+    dio = BitPackedDIO.from_frame(df, dio_tags, time_column, tag_columns)
+    times = dio.times if dio.times is not None else np.arange(len(df)).astype('datetime64[s]')
+    seconds = (times - times[0]).astype('timedelta64[ns]').astype(np.int64) / 1e9 if len(df) else np.empty(0)
+
+    frames = []
+
+    def add(name, kpi, starts, ends, durations):
+        if len(starts) == 0:
+            return
+        unit, group = equipment_unit(name)
+        end_times = times[np.maximum(ends, 0)].astype('datetime64[ns]')
+        end_times[ends < 0] = np.datetime64('NaT')
+        frames.append(pd.DataFrame({
+            'equipment': name, 'unit': unit, 'group': group, 'kpi': kpi,
+            'start_time': times[starts], 'end_time': end_times, 'duration_s': durations,
+        }, columns=KPI_COLUMNS))
+
+    for name, signals in equipment['valves'].items():
+        opened, closed = dio.column(signals['OF']), dio.column(signals['CF'])
+        starts = dio.edges(signals['CF'], rising=False)
+        add(name, 'open_stroke', starts, *pair_to_first(starts, opened, seconds, max_stroke_s))
+        starts = dio.edges(signals['OF'], rising=False)
+        add(name, 'close_stroke', starts, *pair_to_first(starts, closed, seconds, max_stroke_s))
+
+    flow_columns = {flow_tag: tag_columns[flow_tag] for flow_tag, _ in flow_tags.values() if flow_tag in tag_columns}
+    if flow_columns:
+        flow_types = {tag: entry['type'] for tag, entry in update_signal_catalog({}, df, flow_columns).items()}
+        flow_values = to_numeric_tag_frame(df, flow_columns, flow_types)
+    for name, signals in equipment['pumps'].items():
+        if name not in flow_tags:
+            continue
+        flow_tag, threshold = flow_tags[name]
+        if flow_tag not in flow_columns:
+            print(f"⚠️  유량 태그 없음: {name} → {flow_tag}")
+            continue
+        established = flow_values[flow_tag].to_numpy() >= threshold
+        starts = dio.edges(signals['RF'], rising=True)
+        add(name, 'flow_established', starts, *pair_to_first(starts, established, seconds, max_flow_s))
+
+    for name, signals in equipment['faults'].items():
+        cleared = ~dio.column(signals['F']) & dio.known(signals['F'])
+        starts = dio.edges(signals['F'], rising=True)
+        add(name, 'fault', starts, *pair_to_first(starts, cleared, seconds))
+
+    details = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=KPI_COLUMNS)
+    return details, summarize_kpis(details)
+
+
+def summarize_kpis(details):
+    """
+    동작별 KPI를 설비/KPI별 요약 테이블로 집계
+
+    fault의 count는 미해제 고장을 포함한 발생 횟수, 나머지는 완료된 동작 수.
+    """
+    if details.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    keys = ['equipment', 'unit', 'group', 'kpi']
+    grouped = details.groupby(keys, sort=False)['duration_s']
+    summary = pd.DataFrame({
+        'count': grouped.count(),
+        'incomplete': grouped.size() - grouped.count(),
+        'mean_s': grouped.mean(),
+        'min_s': grouped.min(),
+        'max_s': grouped.max(),
+        'last_s': grouped.last(),
+    }).reset_index()
+
+    faults = summary['kpi'] == 'fault'
+    summary.loc[faults, 'count'] += summary.loc[faults, 'incomplete']
+    summary.loc[faults, 'incomplete'] = 0
+    return summary[SUMMARY_COLUMNS]
+
+
+def kpi_by_unit(summary, stat='mean_s'):
+    """
+    호기별 비교표 (행: group/kpi, 열: unit)
+    """
+    units = summary[summary['unit'] != '']
+    return units.pivot_table(index=['group', 'kpi'], columns='unit', values=stat, aggfunc='first')
+
+
+def _kpi_cache_key(options):
+    text = json.dumps({'version': KPI_VERSION, **options}, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def file_kpis(file_path, flow_tags=None, max_stroke_s=300, max_flow_s=600, time_column='Date',
+              cache_dir=DEFAULT_CACHE_DIR, refresh=False, quality_mask=False):
+    """
+    export 파일의 KPI (파일 내용과 설정이 같으면 캐시된 결과 사용)
+
+    quality_mask=True면 파일 품질 점검 결과(file_quality, 캐시 사용)의 나쁜 구간을 제외하고 계산한다.
+
+    Returns:
+    - details, summary (compute_kpis와 같음), 로드 실패 시 (None, None)
+    """
+    options = {'flow_tags': flow_tags, 'max_stroke_s': max_stroke_s, 'max_flow_s': max_flow_s,
+               'time_column': time_column, 'quality_mask': bool(quality_mask)}
+    cache_path = file_cache_dir(file_path, cache_dir) / f'kpi_{_kpi_cache_key(options)}.h5'
+
+    if cache_path.exists() and not refresh:
+        print(f"♻️  KPI 캐시 사용: {cache_path}")
+        return pd.read_hdf(cache_path, 'details'), pd.read_hdf(cache_path, 'summary')
+
+    # KPI 태그 컬럼만 로드 (파일 전체를 읽지 않음)
+    try:
+        schema = load_hdf5_schema(file_path)
+        tag_columns = build_tag_index(schema) or {col: col for col in schema.columns}
+        used = set(kpi_tags(tag_columns, flow_tags))
+        tag_columns = {tag: col for tag, col in tag_columns.items() if tag in used}
+        df = load_hdf5_columns(file_path, [time_column] + list(dict.fromkeys(tag_columns.values())))
+        df.attrs = {}
+    except Exception as e:
+        print(f"❌ 로드 실패: {file_path} ({e})")
+        return None, None
+
+    intervals = None
+    if quality_mask:
+        intervals, _ = file_quality(file_path, time_column=time_column, cache_dir=cache_dir,
+                                    tags=list(tag_columns))
+
+    details, summary = compute_kpis(df, tag_columns, time_column=time_column, flow_tags=flow_tags,
+                                    max_stroke_s=max_stroke_s, max_flow_s=max_flow_s,
+                                    quality_intervals=intervals)
+
+    write_cache_tables(cache_path, {'details': details, 'summary': summary})
+
+    print(f"✅ KPI 계산 완료: 설비 {summary['equipment'].nunique()}개, 동작 {len(details)}건")
+    return details, summary
+
+
+def store_kpis(store_dir, start=None, end=None, flow_tags=None, max_stroke_s=300, max_flow_s=600):
+    """
+    증분 저장소(local_store)의 시간 구간 KPI (구간과 겹치는 청크만 읽음)
+
+    새 export를 append_to_store로 추가한 뒤 start를 오늘로 주면 오늘 들어온 행만 처리한다.
+    구간 첫 행 이전 상태는 모르므로 첫 행에서 시작하는 동작은 잡히지 않는다.
+
+    Returns:
+    - details, summary (compute_kpis와 같음), 저장소가 없으면 (None, None)
+    """
+    index = load_store_index(store_dir)
+    if index is None:
+        print(f"❌ 저장소가 없습니다: {store_dir}")
+        return None, None
+
+    df = load_store(store_dir, start, end).reset_index(drop=True)
+    df.attrs = {}
+    details, summary = compute_kpis(df, index['tag_index'], time_column=index['time_column'], flow_tags=flow_tags,
+                                    max_stroke_s=max_stroke_s, max_flow_s=max_flow_s)
+    print(f"✅ KPI 계산 완료 ({start or '처음'} ~ {end or '끝'}, {len(df)}행): 동작 {len(details)}건")
+    return details, summary
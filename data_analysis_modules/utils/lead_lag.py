@@ -0,0 +1,160 @@
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+
+
+# ============================================================================
+# step 태그 전체의 선행/지연(lead-lag) 행렬 (FFT 상호상관)
+# ============================================================================
+#
+# 모든 태그를 (샘플 수, 태그 수) 행렬로 만든 뒤 rfft를 한 번에 수행하고,
+# 태그 i 블록과 나머지 태그들의 교차 스펙트럼을 한꺼번에 역변환해서
+# ±max_lag 범위의 상관이 가장 큰(절댓값) 지연을 찾는다.
+# 역변환 결과가 (FFT 길이 × 블록 × 태그 수) 크기이므로 max_block_bytes 안에서
+# 블록을 나누고, workers > 1이면 블록을 여러 프로세스에 나눠 계산한다.
+#
+# 결과 lag[i, j] > 0 이면 태그 j가 태그 i보다 lag만큼 늦게 따라감 (i가 선행).
+
+DEFAULT_BLOCK_BYTES = 256 * 1024 * 1024
+
+# 작업 프로세스 공유 상태 (스펙트럼을 작업마다 다시 보내지 않도록 초기화 시 1회 전달)
+_worker_state = {}
+
+
+def _init_worker(spectrum, norms, size, max_lag):
+    _worker_state.update(spectrum=spectrum, norms=norms, size=size, max_lag=max_lag)
+
+
+def _lag_block(start, stop):
+    return (start,) + _lag_block_arrays(_worker_state['spectrum'], _worker_state['norms'],
+                                        _worker_state['size'], _worker_state['max_lag'], start, stop)
+
+
+def _lag_block_arrays(spectrum, norms, size, max_lag, start, stop):
+    # 행 [start, stop) × 열 [start, k) 블록 (대칭이므로 아래쪽 삼각형은 계산하지 않음)
+    cross = np.conj(spectrum[:, start:stop, None]) * spectrum[:, None, start:]
+    corr = np.fft.irfft(cross, size, axis=0)
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    window = corr[lags % size]
+    best = np.argmax(np.abs(window), axis=0)
+    peaks = np.take_along_axis(window, best[None], axis=0)[0]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        peaks = peaks / (norms[start:stop, None] * norms[None, start:])
+    return lags[best], peaks
+
+
+def cross_correlation_lags(values, max_lag, workers=1, max_block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    모든 열 쌍의 최적 지연과 상관계수 (FFT 일괄 계산)
+
+    Parameters:
+    - values: (n, k) float 배열 (NaN은 열 평균으로 간주)
+    - max_lag: 탐색할 최대 지연 (샘플 수)
+    - workers: 프로세스 수 (1이면 현재 프로세스에서 계산)
+    - max_block_bytes: 블록당 역변환 메모리 상한
+
+    Returns:
+    - lags: (k, k) int 배열, lags[i, j] > 0 이면 j가 i보다 늦음
+    - corr: (k, k) 해당 지연에서의 정규화 상관계수 (변화가 없는 열은 NaN)
+    """
+    n, k = values.shape
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        x = np.nan_to_num(values - np.nanmean(values, axis=0))
+
+    # ±max_lag 범위만 필요하므로 n + max_lag 길이로 0을 채우면 순환 상관이 섞이지 않음
+    max_lag = int(max(0, min(max_lag, n - 1)))
+    size = 1 << int(np.ceil(np.log2(max(n + max_lag, 1))))
+    spectrum = np.fft.rfft(x, size, axis=0)
+    norms = np.sqrt((x * x).sum(axis=0))
+
+    # 행 하나당 교차 스펙트럼 + 역변환 결과 메모리 기준으로 블록 크기 결정
+    row_bytes = size * k * 8 * 3
+    block = int(max(1, min(k, max_block_bytes // max(row_bytes, 1))))
+    bounds = [(start, min(start + block, k)) for start in range(0, k, block)]
+
+    lags = np.zeros((k, k), dtype=np.int64)
+    corr = np.full((k, k), np.nan)
+
+    def fill(start, stop, block_lags, block_corr):
+        lags[start:stop, start:] = block_lags
+        corr[start:stop, start:] = block_corr
+        lags[start:, start:stop] = -block_lags.T
+        corr[start:, start:stop] = block_corr.T
+
+    if workers > 1 and len(bounds) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(spectrum, norms, size, max_lag)) as executor:
+            for start, block_lags, block_corr in executor.map(_lag_block, *zip(*bounds)):
+                fill(start, start + len(block_lags), block_lags, block_corr)
+    else:
+        for start, stop in bounds:
+            fill(start, stop, *_lag_block_arrays(spectrum, norms, size, max_lag, start, stop))
+
+    return lags, corr
+
+
+def lead_lag_matrix(df, tags=None, time_column='Date', signal_types=None, max_lag_s=300,
+                    differences=False, workers=1, max_block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    추출된 step 데이터(컬럼=태그명)의 태그 간 선행/지연 행렬
+
+    Parameters:
+    - df: extract_target_tags 결과처럼 시간 정렬된 DataFrame (시간 컬럼 포함)
+    - tags: 대상 태그 리스트 (None이면 시간 컬럼을 제외한 전체)
+    - time_column: 시간 컬럼명
+    - signal_types: {tag: 'dio'/'analog'} (None이면 데이터로 판별, DIO는 0/1로 사용)
+    - max_lag_s: 탐색할 최대 지연 (초)
+    - differences: True면 1차 차분으로 상관 계산 (추세가 같은 신호끼리의 가짜 상관 완화)
+    - workers: 프로세스 수 (긴 구간에서 블록을 나눠 계산)
+
+    Returns:
+    - lag_s: DataFrame (k × k) 지연 시간(초), lag_s.loc[a, b] > 0 이면 b가 a보다 늦음
+    - corr: DataFrame (k × k) 해당 지연에서의 상관계수
+    """
+    if tags is None:
+        tags = [col for col in df.columns if col != time_column]
+    tag_columns = {tag: tag for tag in dict.fromkeys(tags) if tag in df.columns and tag != time_column}
+
+    if signal_types is None or any(tag not in signal_types for tag in tag_columns):
+        catalog = update_signal_catalog({}, df, tag_columns)
+        signal_types = {**{tag: entry['type'] for tag, entry in catalog.items()}, **(signal_types or {})}
+    numeric = to_numeric_tag_frame(df, tag_columns, signal_types)
+    values = numeric.to_numpy(dtype=float)
+
+    sample_period = 1.0
+    if time_column in df.columns and len(df) > 1:
+        sample_period = np.median(np.diff(df[time_column].to_numpy())) / np.timedelta64(1, 's')
+        sample_period = sample_period if sample_period > 0 else 1.0
+
+    if differences:
+        values = np.diff(values, axis=0)
+
+    lags, corr = cross_correlation_lags(values, int(max_lag_s / sample_period), workers, max_block_bytes)
+
+    names = list(numeric.columns)
+    return (pd.DataFrame(lags * sample_period, index=names, columns=names),
+            pd.DataFrame(corr, index=names, columns=names))
+
+
+def lead_lag_pairs(lag_s, corr, min_corr=0.5):
+    """
+    상관이 큰 태그 쌍을 선행 → 지연 순서로 정리
+
+    Returns:
+    - DataFrame [leader, follower, lag_s, corr] (|corr| 내림차순, 지연 0인 쌍은 한 번만)
+    """
+    names = np.asarray(lag_s.index)
+    lags, values = lag_s.to_numpy(), corr.to_numpy()
+    i, j = np.nonzero((np.abs(values) >= min_corr) & (lags >= 0))
+    keep = (i != j) & ((lags[i, j] > 0) | (i < j))
+    i, j = i[keep], j[keep]
+
+    pairs = pd.DataFrame({'leader': names[i], 'follower': names[j], 'lag_s': lags[i, j], 'corr': values[i, j]})
+    return pairs.sort_values('corr', key=np.abs, ascending=False, ignore_index=True)
@@ -0,0 +1,315 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .ring_buffer import RingBufferTagStore
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 실시간(tail) 모니터링
+# ============================================================================
+#
+# 데이터 소스는 poll()로 마지막 호출 이후의 새 행만 돌려준다 (컬럼=태그명 + 시간 컬럼).
+# 모니터는 활성 step의 태그별 링 버퍼에 새 값만 추가하고, 고정된 프레임 주기로
+# 선 데이터와 현재 상태 라벨만 갱신한다 (이력을 다시 읽지 않음).
+
+
+class ReplaySource:
+    """
+    로드된 DataFrame을 일정 속도로 흘려보내는 테스트/재현용 소스
+
+    Parameters:
+    - df: 원본 DataFrame (load_hdf5_with_metadata 결과)
+    - tag_columns: {tag: DataFrame 컬럼명}
+    - time_column: 시간 컬럼명
+    - rows_per_second: 초당 재생 행 수 (None이면 poll마다 chunk_size 행)
+    - chunk_size: rows_per_second가 None일 때 poll당 행 수
+    """
+
+    def __init__(self, df, tag_columns, time_column='Date', rows_per_second=None, chunk_size=10):
+        self.tag_columns = {tag: col for tag, col in tag_columns.items()
+                            if col in df.columns and col != time_column}
+        self.time_column = time_column
+
+        # 필요한 컬럼만 남기고 attrs를 비움 (행/컬럼 선택마다 메타데이터가 복사되지 않도록)
+        self.df = df[[time_column] + list(dict.fromkeys(self.tag_columns.values()))]
+        self.df.attrs = {}
+        self.rows_per_second = rows_per_second
+        self.chunk_size = chunk_size
+        self.position = 0
+        self._started = None
+
+    def poll(self):
+        if self.position >= len(self.df):
+            return None
+
+        if self.rows_per_second is None:
+            end = self.position + self.chunk_size
+        else:
+            now = time.monotonic()
+            if self._started is None:
+                self._started = now
+            end = int((now - self._started) * self.rows_per_second) + 1
+
+        end = min(end, len(self.df))
+        if end <= self.position:
+            return None
+
+        rows = self.df.iloc[self.position:end]
+        self.position = end
+        return _rename_to_tags(rows, self.tag_columns, self.time_column)
+
+    @property
+    def exhausted(self):
+        return self.position >= len(self.df)
+
+
+class HDF5TailSource:
+    """
+    계속 추가되는 HDF5 테이블(format='table')의 새 행만 읽는 소스
+
+    Parameters:
+    - file_path: HDF5 파일 경로
+    - tag_columns: {tag: 컬럼명}
+    - key: 테이블 키
+    - time_column: 시간 컬럼명
+    - start_at_end: True면 현재 끝부터 읽기 시작 (기존 이력은 건너뜀)
+    """
+
+    def __init__(self, file_path, tag_columns, key='data', time_column='Date', start_at_end=True):
+        self.file_path = file_path
+        self.tag_columns = {tag: col for tag, col in tag_columns.items() if col != time_column}
+        self.key = key
+        self.time_column = time_column
+        self.position = self._nrows() if start_at_end else 0
+
+    def _nrows(self):
+        with pd.HDFStore(self.file_path, mode='r') as store:
+            return store.get_storer(self.key).nrows
+
+    def poll(self):
+        nrows = self._nrows()
+        if nrows <= self.position:
+            return None
+        columns = [self.time_column] + list(dict.fromkeys(self.tag_columns.values()))
+        rows = pd.read_hdf(self.file_path, key=self.key, start=self.position, stop=nrows, columns=columns)
+        self.position = nrows
+        return _rename_to_tags(rows, self.tag_columns, self.time_column)
+
+    @property
+    def exhausted(self):
+        return False
+
+
+def _rename_to_tags(rows, tag_columns, time_column):
+    data = {tag: rows[col].to_numpy() for tag, col in tag_columns.items() if col in rows.columns}
+    data[time_column] = rows[time_column].to_numpy()
+    return pd.DataFrame(data)
+
+
+class LiveStepMonitor:
+    """
+    활성 step 태그들의 실시간 DIO/아날로그 모니터
+
+    Parameters:
+    - source: poll()을 제공하는 데이터 소스 (ReplaySource, HDF5TailSource 등)
+    - tags: 모니터링할 태그 리스트 (순서 유지)
+    - signal_types: {tag: 'dio'/'analog'} (None이면 첫 데이터로 판별)
+    - capacity: 태그별 보관 샘플 수
+    - fps: 화면 갱신 주기 (초당 프레임)
+    - time_column: 시간 컬럼명
+    """
+
+    def __init__(self, source, tags, signal_types=None, capacity=3600, fps=2.0, time_column='Date'):
+        self.source = source
+        self.tags = list(dict.fromkeys(tags))
+        self.signal_types = dict(signal_types) if signal_types else None
+        self.capacity = capacity
+        self.fps = fps
+        self.time_column = time_column
+
+        self.buffers = RingBufferTagStore(self.tags, capacity)
+        self.last_time = None
+
+        self.dio_fig = self.analog_fig = None
+        self._artists = {}
+
+    @classmethod
+    def for_step(cls, source, step, **kwargs):
+        """
+        step 번호(1부터)의 태그들로 모니터 생성 (소스에 없는 태그는 제외)
+        """
+        tags = [tag for tag in step_tags[step - 1] if tag in source.tag_columns]
+        return cls(source, tags, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 데이터 수집
+    # ------------------------------------------------------------------
+
+    def ingest(self, rows):
+        """
+        새 행들을 태그별 링 버퍼에 추가
+
+        Returns:
+        - 추가된 행 수
+        """
+        if rows is None or len(rows) == 0:
+            return 0
+
+        if self.signal_types is None:
+            catalog = update_signal_catalog({}, rows, {tag: tag for tag in self.tags})
+            self.signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+
+        numeric = to_numeric_tag_frame(rows, {tag: tag for tag in self.tags}, self.signal_types)
+        numeric = numeric.reindex(columns=self.tags)
+        timestamps = rows[self.time_column].to_numpy() if self.time_column in rows.columns else None
+        self.buffers.extend(numeric.to_numpy(dtype=self.buffers.dtype), timestamps)
+
+        if timestamps is not None:
+            self.last_time = rows[self.time_column].iloc[-1]
+        return len(rows)
+
+    @property
+    def sample_count(self):
+        return self.buffers.total
+
+    def window(self, tag):
+        """
+        태그의 현재 버퍼 내용 (X: 누적 샘플 번호, Y: 값 view)
+        """
+        return self.buffers.positions(), self.buffers.series(tag)
+
+    def snapshot(self):
+        """
+        현재 버퍼 내용을 DataFrame view로 반환 (plot_*_signals_ordered에 바로 사용 가능)
+        """
+        return self.buffers.frame(time_column=self.time_column)
+
+    # ------------------------------------------------------------------
+    # 화면
+    # ------------------------------------------------------------------
+
+    def _setup_figures(self):
+        dio_tags = [tag for tag in self.tags if self.signal_types.get(tag) == 'dio']
+        analog_tags = [tag for tag in self.tags if self.signal_types.get(tag) != 'dio']
+
+        if dio_tags:
+            self.dio_fig = self._setup_figure(dio_tags, 'DIO 실시간 모니터링', 'red')
+        if analog_tags:
+            self.analog_fig = self._setup_figure(analog_tags, '아날로그 실시간 모니터링', 'darkgreen')
+
+    def _setup_figure(self, tags, title, color):
+        # 축, 눈금, 태그 라벨은 고정하고 선/상태 텍스트만 animated 아티스트로 두어
+        # 프레임마다 배경을 복원한 뒤 그 아티스트들만 다시 그린다 (blit)
+        import matplotlib.pyplot as plt
+
+        n_signals = len(tags)
+        fig_height = max(4, n_signals * 0.28 + 1.2)
+        fig = plt.figure(figsize=(15, fig_height))
+        ax = fig.add_axes([0.2, 0.6 / fig_height, 0.68, 1 - 1.2 / fig_height])
+        fig.suptitle(title, fontsize=16, fontweight='bold', y=1 - 0.25 / fig_height)
+
+        rows = np.arange(n_signals)
+        ax.set_ylim(0, n_signals)
+        ax.set_yticks(rows + 0.5)
+        ax.set_yticklabels(list(reversed(tags)), fontsize=7)
+        ax.hlines(rows[1:], 0, 1, transform=ax.get_yaxis_transform(), colors='lightgray', linewidths=0.5)
+        ax.set_xlim(-self.capacity, 0)
+        ax.set_xlabel('최근 샘플 (0 = 현재)', fontsize=12)
+        ax.grid(True, axis='x', alpha=0.3)
+
+        lines, texts = {}, {}
+        for i, tag in enumerate(tags):
+            row = n_signals - 1 - i
+            line, = ax.plot([], [], linewidth=1.0, color=color, animated=True,
+                            drawstyle='steps-post' if self.signal_types.get(tag) == 'dio' else 'default')
+            lines[tag] = (line, row)
+            texts[tag] = ax.text(1.01, row + 0.5, '', transform=ax.get_yaxis_transform(),
+                                 ha='left', va='center', fontsize=7, animated=True)
+
+        artists = {'ax': ax, 'lines': lines, 'texts': texts, 'tags': tags, 'background': None}
+        self._artists[id(fig)] = artists
+
+        def on_draw(event):
+            # 창 크기 변경 등으로 전체를 다시 그린 경우 배경을 새로 저장
+            artists['background'] = fig.canvas.copy_from_bbox(fig.bbox)
+            self._draw_animated(fig)
+
+        fig.canvas.mpl_connect('draw_event', on_draw)
+        fig.canvas.draw()
+        return fig
+
+    def _draw_animated(self, fig):
+        artists = self._artists[id(fig)]
+        for line, _ in artists['lines'].values():
+            artists['ax'].draw_artist(line)
+        for text in artists['texts'].values():
+            artists['ax'].draw_artist(text)
+
+    def update_frame(self):
+        """
+        버퍼 내용으로 선과 현재 상태 라벨 갱신 (한 프레임)
+        """
+        if self.signal_types is None:
+            return
+        if self.dio_fig is None and self.analog_fig is None:
+            self._setup_figures()
+
+        for fig in (self.dio_fig, self.analog_fig):
+            if fig is None:
+                continue
+            artists = self._artists[id(fig)]
+            for tag in artists['tags']:
+                line, row = artists['lines'][tag]
+                x_data, values = self.window(tag)
+                if self.signal_types.get(tag) == 'dio':
+                    vmin, vmax = 0.0, 1.0
+                    current = values[-1] if len(values) else np.nan
+                    label = '-' if np.isnan(current) else ('ON' if current > 0.5 else 'OFF')
+                else:
+                    finite = values[np.isfinite(values)]
+                    vmin, vmax = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+                    label = f'{values[-1]:.4g}' if len(values) else '-'
+                scale = 0.8 / (vmax - vmin) if vmax > vmin else 0.0
+                base = row + 0.1 + (0.4 if scale == 0.0 else 0.0)
+                line.set_data(x_data - self.sample_count, base + (values - vmin) * scale)
+                artists['texts'][tag].set_text(label)
+
+            if artists['background'] is not None and fig.canvas.supports_blit:
+                fig.canvas.restore_region(artists['background'])
+                self._draw_animated(fig)
+                fig.canvas.blit(fig.bbox)
+            else:
+                fig.canvas.draw_idle()
+
+    def run(self, duration=None):
+        """
+        고정 프레임 주기로 새 데이터를 받아 화면 갱신 (Ctrl+C 또는 duration 초 후 종료)
+
+        Parameters:
+        - duration: 실행 시간(초), None이면 소스가 끝날 때까지
+        """
+        import matplotlib.pyplot as plt
+
+        frame_interval = 1.0 / self.fps
+        started = time.monotonic()
+        plt.ion()
+
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                frame_start = time.monotonic()
+                self.ingest(self.source.poll())
+                self.update_frame()
+
+                if self.source.exhausted and duration is None:
+                    break
+
+                # 남은 프레임 시간 동안 GUI 이벤트 처리
+                plt.pause(max(0.001, frame_interval - (time.monotonic() - frame_start)))
+        except KeyboardInterrupt:
+            print("\n실시간 모니터링을 종료합니다.")
+        finally:
+            plt.ioff()
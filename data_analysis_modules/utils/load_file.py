@@ -1,5 +1,4 @@
 import json
-import tables
 import pandas as pd
 
 # ============================================================================
@@ -29,6 +28,7 @@ def load_hdf5_with_metadata(file_path):
         
         # 메타데이터 로드
         try:
+            import tables
             with tables.open_file(file_path, 'r') as h5file:
                 group = h5file.get_node('/data')
                 
@@ -56,6 +56,119 @@ def load_hdf5_with_metadata(file_path):
         print(traceback.format_exc())
         return None
 
+def load_hdf5_attrs(file_path, key='data'):
+    """
+    HDF5 파일의 메타데이터(pandas_attrs)만 로드 (데이터는 읽지 않음)
+
+    Args:
+        file_path: HDF5 파일 경로
+        key: 데이터 키
+
+    Returns:
+        dict: attrs (없으면 빈 dict)
+    """
+    import tables
+
+    with tables.open_file(file_path, 'r') as h5file:
+        group = h5file.get_node(f'/{key}')
+        if hasattr(group._v_attrs, 'pandas_attrs'):
+            return json.loads(group._v_attrs.pandas_attrs)
+    return {}
+
+
+def load_hdf5_schema(file_path, key='data'):
+    """
+    데이터 없이 컬럼 목록과 메타데이터만 가진 빈 DataFrame 로드
+
+    build_tag_index 등 컬럼/메타데이터만 필요한 함수에 그대로 넘길 수 있다.
+
+    Args:
+        file_path: HDF5 파일 경로
+        key: 데이터 키
+
+    Returns:
+        df: 행이 없는 DataFrame (attrs에 메타데이터 포함)
+    """
+    with pd.HDFStore(file_path, mode='r') as store:
+        storer = store.get_storer(key)
+        if storer.is_table:
+            columns = list(storer.non_index_axes[0][1])
+        else:
+            storer.infer_axes()
+            columns = list(storer.read_index('axis0'))
+
+    schema = pd.DataFrame(columns=columns)
+    schema.attrs = load_hdf5_attrs(file_path, key)
+    return schema
+
+
+def load_hdf5_columns(file_path, columns, key='data'):
+    """
+    HDF5 파일에서 지정한 컬럼만 로드 (컬럼 선택 로드)
+
+    table 형식은 필요한 컬럼만 읽고, fixed 형식은 필요한 컬럼이 들어 있는
+    블록만 읽는다 (숫자 블록은 블록 안에서도 필요한 컬럼만). 블록 단위 읽기에
+    실패하면 전체를 읽은 뒤 컬럼을 고른다.
+
+    Args:
+        file_path: HDF5 파일 경로
+        columns: 컬럼명 리스트 (파일에 없는 컬럼은 무시)
+        key: 데이터 키
+
+    Returns:
+        df: DataFrame (attrs에 메타데이터 포함, 컬럼 순서는 columns 순서)
+    """
+    wanted = list(dict.fromkeys(columns))
+
+    with pd.HDFStore(file_path, mode='r') as store:
+        storer = store.get_storer(key)
+        if storer.is_table:
+            available = set(storer.non_index_axes[0][1])
+            df = store.select(key, columns=[c for c in wanted if c in available])
+        else:
+            try:
+                df = _read_fixed_columns(storer, wanted)
+            except Exception as e:
+                print(f"⚠️ 블록 단위 읽기 실패, 전체 로드: {e}")
+                df = store.select(key)
+                df = df[[c for c in wanted if c in df.columns]]
+
+    df.attrs = load_hdf5_attrs(file_path, key)
+    return df
+
+
+def _read_fixed_columns(storer, columns):
+    # pandas fixed 형식: block{i}_items(컬럼명)와 block{i}_values(값)가 블록별로 저장됨
+    import tables
+
+    storer.infer_axes()
+    wanted = set(columns)
+    index = storer.read_index('axis1')
+
+    data = {}
+    for i in range(storer.attrs.nblocks):
+        items = storer.read_index(f'block{i}_items')
+        if not wanted.intersection(items):
+            continue
+        positions = [j for j, item in enumerate(items) if item in wanted]
+        node = getattr(storer.group, f'block{i}_values')
+        if (len(positions) < len(items) and isinstance(node, tables.Array) and len(node.shape) == 2
+                and getattr(node._v_attrs, 'value_type', None) is None):
+            # 숫자 블록은 (행 × 컬럼)으로 저장되므로 필요한 컬럼만 잘라 읽음 (블록 전체를 올리지 않음)
+            for j in positions:
+                data.setdefault(items[j], node[:, j] if getattr(node._v_attrs, 'transposed', False) else node[j])
+            continue
+
+        values = storer.read_array(f'block{i}_values')
+        if getattr(values, 'ndim', 1) == 1:
+            data.setdefault(items[0], values)
+        else:
+            for j in positions:
+                data.setdefault(items[j], values[j])
+
+    return pd.DataFrame({c: data[c] for c in columns if c in data}, index=index)
+
+
 def build_column_mapping(df):
     """
     header_metadata에서 컬럼별 매핑 딕셔너리 생성
@@ -0,0 +1,390 @@
+import json
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from .load_file import load_hdf5_with_metadata
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .events import detect_dio_events
+from .tag_metadata import tag_resolution
+from .pyramid import (PYRAMID_LEVELS, aggregate_level, coarsen_level, concat_levels,
+                      level_to_frame, level_from_frame)
+
+
+# ============================================================================
+# 증분(append) 방식 로컬 저장소
+# ============================================================================
+#
+# 저장소 디렉터리 구조
+#   data.h5     /chunks/cNNNNN            원본 행 청크 (load_file과 같은 HDF5 형식)
+#               /events                   DIO 상태 변화 이벤트 테이블 (table 형식, append)
+#               /pyramid/lv_<freq>/cNNNNN 해상도별 요약 청크
+#   index.json  컬럼 목록, 태그 인덱스, 신호 종류 카탈로그, 청크 목록, 마지막 DIO 상태
+#
+# 새 export를 추가할 때는 저장소의 마지막 시각 이후 행만 청크로 저장하고,
+# 파생 데이터(태그 인덱스, 카탈로그, 이벤트, 피라미드)도 그 행들로만 갱신한다.
+
+STORE_DATA_FILE = 'data.h5'
+STORE_INDEX_FILE = 'index.json'
+
+
+def build_tag_index(df):
+    """
+    header_metadata에서 tag → DataFrame 컬럼 매핑 생성
+
+    header 앞의 인덱스 자리와 pandas 중복 컬럼 접미사('.1')를 반영한 해석 테이블
+    (tag_metadata.build_tag_resolution)을 사용한다. 중복 태그는 첫 번째 컬럼을 사용한다.
+
+    Args:
+        df: DataFrame (attrs에 header_metadata 포함)
+
+    Returns:
+        dict: {tag_name: column_name, ...}
+    """
+    return {tag: columns[0] for tag, columns in tag_resolution(df).items()}
+
+
+def load_store_index(store_dir):
+    """
+    저장소 인덱스(index.json) 로드
+
+    Args:
+        store_dir: 저장소 디렉터리
+
+    Returns:
+        dict 또는 None (저장소가 없는 경우)
+    """
+    index_path = Path(store_dir) / STORE_INDEX_FILE
+    if not index_path.exists():
+        return None
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_store_index(store_dir, index):
+    index_path = Path(store_dir) / STORE_INDEX_FILE
+    tmp_path = index_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    tmp_path.replace(index_path)
+
+
+def _new_store_index(df, time_column):
+    attrs = {k: v for k, v in df.attrs.items() if k not in ('_column_mapping', 'header_metadata')}
+    return {
+        'time_column': time_column,
+        'columns': [],
+        'attrs': attrs,
+        'n_rows': 0,
+        'last_time': None,
+        'chunks': [],
+        'tag_index': {},
+        'signal_catalog': {},
+        'dio_states': {},
+        'pyramid_levels': list(PYRAMID_LEVELS),
+    }
+
+
+def _unique_column(name, taken):
+    # 저장소 컬럼명과 겹치면 pandas처럼 '.1', '.2' 접미사를 붙임
+    column, count = name, 1
+    while column in taken:
+        column = f'{name}.{count}'
+        count += 1
+    return column
+
+
+def _align_to_store(df, index):
+    """
+    export의 컬럼을 저장소 컬럼으로 맞춤 (index의 columns/tag_index/header는 제자리 갱신)
+
+    export 컬럼명은 description과 중복 접미사로 만들어져 export마다 바뀌므로, 태그 컬럼은
+    그 export 자신의 header(build_tag_index)로 태그를 찾은 뒤 저장소의 태그 컬럼에 넣는다.
+    태그가 없는 컬럼(시간 등)은 이름으로 맞추고, 저장소에 없는 태그/컬럼은 새 컬럼으로 추가한다.
+    저장소 header는 컬럼 순서대로 (tag_name, 컬럼명)을 기록해 load_store 결과를 그대로 해석할 수 있게 한다.
+    """
+    columns, tag_index = index['columns'], index['tag_index']
+    tag_of = {col: tag for tag, col in build_tag_index(df).items()}
+    owned = set(tag_index.values())
+    taken = set(columns)
+
+    renames, added = {}, []
+    for col in df.columns:
+        tag = tag_of.get(col)
+        if tag is not None and tag in tag_index:
+            renames[col] = tag_index[tag]
+            continue
+        if tag is None and col in taken and col not in owned:
+            renames[col] = col
+            continue
+        target = _unique_column(str(col), taken)
+        taken.add(target)
+        columns.append(target)
+        if tag is not None:
+            tag_index[tag] = target
+            owned.add(target)
+        renames[col] = target
+        added.append(target)
+
+    owner = {col: tag for tag, col in tag_index.items()}
+    index['attrs']['header_metadata'] = {
+        'tag_name': [''] + [owner.get(col, '') for col in columns],
+        'description': [''] + list(columns),
+    }
+    return df[list(renames)].set_axis(list(renames.values()), axis=1).reindex(columns=columns), added
+
+
+def append_to_store(df, store_dir, time_column='Date', source=None):
+    """
+    DataFrame의 새 행들을 저장소에 추가하고 파생 데이터를 증분 갱신
+
+    저장소의 마지막 시각 이후 행만 추가되므로, 겹치는 구간을 포함한
+    재export 파일을 그대로 넣어도 된다.
+
+    Args:
+        df: 추가할 DataFrame (load_hdf5_with_metadata 결과)
+        store_dir: 저장소 디렉터리 (없으면 생성)
+        time_column: 시간 컬럼명
+        source: 원본 파일 경로 (기록용)
+
+    Returns:
+        dict: 갱신된 저장소 인덱스
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    data_path = store_dir / STORE_DATA_FILE
+
+    index = load_store_index(store_dir) or _new_store_index(df, time_column)
+
+    # 새 행만 선택
+    new_df = df
+    if index['last_time'] is not None:
+        new_df = df[df[time_column] > pd.Timestamp(index['last_time'])]
+
+    print(f"{'='*60}")
+    print(f"저장소 추가: {source or '(DataFrame)'} → {store_dir}")
+    print(f"{'='*60}")
+
+    if new_df.empty:
+        print(f"\n⚠️ 추가할 새 행이 없습니다. (마지막 시각: {index['last_time']})")
+        return index
+
+    # 태그 기준으로 컬럼을 저장소에 맞춤 (새 태그는 저장소 컬럼으로 추가)
+    first = not index['columns']
+    new_df, added = _align_to_store(new_df, index)
+    new_df = new_df.reset_index(drop=True)
+    if added and not first:
+        print(f"➕ 저장소에 새 컬럼 {len(added)}개 추가: {added[:5]}")
+
+    position_offset = index['n_rows']
+    chunk_id = len(index['chunks'])
+    chunk_name = f'c{chunk_id:05d}'
+    start_time = new_df[time_column].iloc[0]
+    end_time = new_df[time_column].iloc[-1]
+
+    import tables
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', tables.NaturalNameWarning)
+        warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+
+        # 1) 원본 행 청크
+        new_df.to_hdf(data_path, key=f'/chunks/{chunk_name}', mode='a')
+
+        # 2) 신호 종류 카탈로그
+        tag_columns = {tag: col for tag, col in index['tag_index'].items() if col != time_column}
+        catalog = update_signal_catalog(index['signal_catalog'], new_df, tag_columns)
+        signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+        numeric = to_numeric_tag_frame(new_df, tag_columns, signal_types)
+
+        # 3) DIO 이벤트 테이블
+        dio_tags = [tag for tag in numeric.columns if signal_types.get(tag) == 'dio']
+        numeric[time_column] = new_df[time_column].to_numpy()
+        events, index['dio_states'] = detect_dio_events(
+            numeric, dio_tags, time_column,
+            initial_states=index['dio_states'], position_offset=position_offset
+        )
+        numeric = numeric.drop(columns=[time_column])
+        if not events.empty:
+            with pd.HDFStore(data_path, mode='a') as store:
+                store.append('events', events, format='table', data_columns=['time', 'tag'],
+                             min_itemsize={'tag': 64, 'edge': 8}, index=False)
+
+        # 4) 해상도별 요약 피라미드
+        level = None
+        for freq in index['pyramid_levels']:
+            if level is None:
+                level = aggregate_level(numeric, new_df[time_column], freq, position_offset)
+            else:
+                level = coarsen_level(level, freq)
+            level_to_frame(level).to_hdf(data_path, key=f'/pyramid/lv_{freq}/{chunk_name}', mode='a')
+
+    index['chunks'].append({
+        'name': chunk_name,
+        'rows': len(new_df),
+        'position': position_offset,
+        'start': pd.Timestamp(start_time).isoformat(),
+        'end': pd.Timestamp(end_time).isoformat(),
+        'source': str(source) if source is not None else None,
+    })
+    index['n_rows'] = position_offset + len(new_df)
+    index['last_time'] = pd.Timestamp(end_time).isoformat()
+    _save_store_index(store_dir, index)
+
+    print(f"\n✅ 새 행 {len(new_df)}개 추가 (총 {index['n_rows']}개 행, 청크 {len(index['chunks'])}개)")
+    print(f"   구간: {start_time} ~ {end_time}")
+    print(f"   DIO 이벤트: {len(events)}개, 카탈로그 태그: {len(catalog)}개")
+
+    return index
+
+
+def ingest_hdf5_file(file_path, store_dir, time_column='Date'):
+    """
+    export된 HDF5 파일을 로드하여 저장소에 증분 추가
+
+    Args:
+        file_path: HDF5 파일 경로
+        store_dir: 저장소 디렉터리
+        time_column: 시간 컬럼명
+
+    Returns:
+        dict: 갱신된 저장소 인덱스 (로드 실패 시 None)
+    """
+    df = load_hdf5_with_metadata(file_path)
+    if df is None:
+        return None
+    return append_to_store(df, store_dir, time_column=time_column, source=file_path)
+
+
+def _select_chunks(index, start=None, end=None):
+    chunks = index['chunks']
+    if start is not None:
+        chunks = [c for c in chunks if pd.Timestamp(c['end']) >= pd.Timestamp(start)]
+    if end is not None:
+        chunks = [c for c in chunks if pd.Timestamp(c['start']) <= pd.Timestamp(end)]
+    return chunks
+
+
+def load_store(store_dir, start=None, end=None):
+    """
+    저장소에서 시간 구간에 해당하는 청크만 읽어 DataFrame 생성
+
+    Args:
+        store_dir: 저장소 디렉터리
+        start, end: 시간 구간 (None이면 제한 없음)
+
+    Returns:
+        df: DataFrame (attrs에 메타데이터 포함, 인덱스=저장소 전체 기준 행 위치)
+    """
+    index = load_store_index(store_dir)
+    if index is None:
+        print(f"❌ 저장소가 없습니다: {store_dir}")
+        return None
+
+    data_path = Path(store_dir) / STORE_DATA_FILE
+    time_column = index['time_column']
+    frames = []
+    for chunk in _select_chunks(index, start, end):
+        frame = pd.read_hdf(data_path, key=f"/chunks/{chunk['name']}")
+        frame.index = range(chunk['position'], chunk['position'] + len(frame))
+        frames.append(frame)
+
+    if frames:
+        # 나중에 추가된 태그 컬럼은 이전 청크에 없으므로 저장소 컬럼 순서로 맞춤 (없는 구간은 NaN)
+        df = pd.concat(frames).reindex(columns=index['columns'])
+    else:
+        df = pd.DataFrame(columns=index['columns'])
+
+    if start is not None:
+        df = df[df[time_column] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df[time_column] <= pd.Timestamp(end)]
+
+    df.attrs = dict(index['attrs'])
+    df.attrs['_column_mapping'] = dict(index['tag_index'])
+    return df
+
+
+def load_store_events(store_dir, start=None, end=None, tags=None):
+    """
+    저장소의 DIO 이벤트 테이블 조회
+
+    Args:
+        store_dir: 저장소 디렉터리
+        start, end: 시간 구간
+        tags: 태그 리스트 (None이면 전체)
+
+    Returns:
+        DataFrame [time, position, tag, edge]
+    """
+    data_path = Path(store_dir) / STORE_DATA_FILE
+    conditions = []
+    if start is not None:
+        conditions.append(f"time >= {pd.Timestamp(start)!r}")
+    if end is not None:
+        conditions.append(f"time <= {pd.Timestamp(end)!r}")
+
+    with pd.HDFStore(data_path, mode='r') as store:
+        if '/events' not in store.keys():
+            return pd.DataFrame(columns=['time', 'position', 'tag', 'edge'])
+        events = store.select('events', where=conditions or None)
+
+    if tags is not None:
+        events = events[events['tag'].isin(list(tags))]
+    return events.reset_index(drop=True)
+
+
+def load_store_pyramid(store_dir, freq, start=None, end=None):
+    """
+    저장소에서 지정 해상도의 요약 레벨 로드 (청크 경계 버킷은 병합됨)
+
+    Args:
+        store_dir: 저장소 디렉터리
+        freq: 해상도 (index['pyramid_levels'] 중 하나)
+        start, end: 시간 구간
+
+    Returns:
+        dict: aggregate_level과 같은 구조 (데이터가 없으면 None)
+    """
+    index = load_store_index(store_dir)
+    if index is None or freq not in index['pyramid_levels']:
+        return None
+
+    data_path = Path(store_dir) / STORE_DATA_FILE
+    levels = [
+        level_from_frame(pd.read_hdf(data_path, key=f"/pyramid/lv_{freq}/{chunk['name']}"))
+        for chunk in _select_chunks(index, start, end)
+    ]
+    level = concat_levels(levels)
+    if level is None:
+        return None
+
+    mask = pd.Series(True, index=level['count'].index)
+    if start is not None:
+        mask &= mask.index >= pd.Timestamp(start).floor(freq)
+    if end is not None:
+        mask &= mask.index <= pd.Timestamp(end)
+    return {key: value[mask.to_numpy()] for key, value in level.items()}
+
+
+def load_store_pyramids(store_dir, start=None, end=None):
+    """
+    저장소의 모든 해상도 요약 로드 (plot_*_signals_ordered의 pyramids 인자로 사용)
+
+    Args:
+        store_dir: 저장소 디렉터리
+        start, end: 시간 구간
+
+    Returns:
+        dict: {freq: level}
+    """
+    index = load_store_index(store_dir)
+    if index is None:
+        return {}
+
+    pyramid = {}
+    for freq in index['pyramid_levels']:
+        level = load_store_pyramid(store_dir, freq, start, end)
+        if level is not None:
+            pyramid[freq] = level
+    return pyramid
@@ -0,0 +1,242 @@
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .local_store import build_tag_index
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+from .kpi import split_equipment
+
+
+# ============================================================================
+# 제어 루프 추종 분석 (DMD ↔ ZT, SP ↔ PV)
+# ============================================================================
+#
+# 태그명 규칙으로 루프를 자동으로 짝짓는다.
+#   position : <밸브>-DMD (지령)  ↔ <밸브>-ZT (개도)          예: LCV-H1-4610-DMD / -ZT
+#   setpoint : <밸브>-SP/SP1 (설정) ↔ <측정>IT-<호기>-<번호>-SEL
+#              측정 종류는 밸브 첫 글자(L→LIT, P→PIT, F→FIT, T→TIT), 번호는 같은 번호가
+#              있으면 그것, 없으면 같은 100번대에서 가장 가까운 번호 (LCV-H1-4105 → LIT-H1-4107)
+#   mode     : <밸브>-AUTO 또는 -AMOD (ON=AUTO), -MAN (ON=MAN)
+# 규칙으로 찾지 못하거나 잘못 짝지어지는 루프는 overrides로 지정한다.
+#
+# 모든 루프의 입력/출력을 (샘플 수, 루프 수) 행렬로 쌓아 추종 오차, 모드 시간,
+# 스틱션 지표는 축 0 방향 연산으로, 지연 시간은 FFT 상호상관 한 번으로 계산한다.
+
+SETPOINT_SUFFIXES = ('SP', 'SP1')
+AUTO_SUFFIXES = ('AUTO', 'AMOD')
+MANUAL_SUFFIXES = ('MAN',)
+
+_MEASUREMENT = re.compile(r'^([A-Z])IT-([A-Z0-9]+)-(\d+)([A-Z]*)(?:-(.+))?$')
+
+
+def _measurement_index(tags):
+    # {(측정 종류 글자, 호기/구역): [(번호, 태그), ...]}
+    index = {}
+    for tag in tags:
+        match = _MEASUREMENT.match(tag)
+        if match:
+            letter, area, number, _, suffix = match.groups()
+            # 같은 위치에 여러 태그가 있으면 -SEL(선택값)을 우선
+            rank = 0 if suffix == 'SEL' else 1
+            index.setdefault((letter, area), []).append((int(number), rank, tag))
+    return index
+
+
+def _match_measurement(valve, measurement_index):
+    parts = valve.split('-')
+    if len(parts) < 3 or not parts[2].isdigit():
+        return None
+    number = int(parts[2])
+    candidates = [(abs(n - number), rank, tag) for n, rank, tag in measurement_index.get((parts[0][0], parts[1]), [])
+                  if n // 100 == number // 100]
+    return min(candidates)[2] if candidates else None
+
+
+def discover_loops(tags, overrides=None):
+    """
+    태그 목록에서 제어 루프 찾기
+
+    Parameters:
+    - tags: 태그 목록 (태그 인덱스 또는 step_tags)
+    - overrides: {입력 태그: 출력 태그} 규칙 대신 쓸 짝 (예: {'LCV-H1-4105-SP1': 'LIT-H1-4107-SEL'})
+
+    Returns:
+    - 루프 리스트 [{'loop', 'kind', 'input', 'output', 'mode', 'mode_on'}]
+      mode_on: mode 태그가 ON일 때 'auto' 또는 'manual'
+    """
+    tags = list(dict.fromkeys(tags))
+    tag_set = set(tags)
+    overrides = dict(overrides or {})
+
+    signals = {}
+    for tag in tags:
+        equipment, suffix = split_equipment(tag)
+        if equipment:
+            signals.setdefault(equipment, {})[suffix] = tag
+    measurements = _measurement_index(tags)
+
+    loops = []
+    for equipment, by_suffix in signals.items():
+        mode, mode_on = None, None
+        for suffix in AUTO_SUFFIXES + MANUAL_SUFFIXES:
+            if suffix in by_suffix:
+                mode, mode_on = by_suffix[suffix], 'manual' if suffix in MANUAL_SUFFIXES else 'auto'
+                break
+
+        if 'DMD' in by_suffix:
+            output = overrides.get(by_suffix['DMD'], by_suffix.get('ZT'))
+            if output in tag_set:
+                loops.append({'loop': equipment, 'kind': 'position', 'input': by_suffix['DMD'],
+                              'output': output, 'mode': mode, 'mode_on': mode_on})
+
+        for suffix in SETPOINT_SUFFIXES:
+            if suffix in by_suffix:
+                setpoint = by_suffix[suffix]
+                output = overrides.get(setpoint) or _match_measurement(equipment, measurements)
+                if output in tag_set:
+                    loops.append({'loop': equipment, 'kind': 'setpoint', 'input': setpoint,
+                                  'output': output, 'mode': mode, 'mode_on': mode_on})
+                break
+
+    return loops
+
+
+def fft_lag(inputs, outputs, max_lag):
+    """
+    여러 (입력, 출력) 쌍의 지연을 FFT 상호상관으로 한 번에 계산
+
+    Parameters:
+    - inputs, outputs: (n, k) 배열 (NaN은 0으로 간주, 열별로 평균 제거)
+    - max_lag: 탐색할 최대 지연 (샘플 수)
+
+    Returns:
+    - lags: (k,) 출력이 입력을 따라가는 지연 샘플 수 (양수 = 출력이 늦음)
+    - peaks: (k,) 해당 지연에서의 정규화 상관계수
+    """
+    n, k = inputs.shape
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        x = np.nan_to_num(inputs - np.nanmean(inputs, axis=0))
+        y = np.nan_to_num(outputs - np.nanmean(outputs, axis=0))
+
+    size = 1 << int(np.ceil(np.log2(max(2 * n - 1, 1))))
+    spectrum = np.conj(np.fft.rfft(x, size, axis=0)) * np.fft.rfft(y, size, axis=0)
+    corr = np.fft.irfft(spectrum, size, axis=0)
+
+    # corr[m] = sum x[t] * y[t + m] → 양의 m은 출력 지연, 음의 m은 배열 끝쪽에 있음
+    max_lag = int(min(max_lag, n - 1))
+    lags = np.arange(-max_lag, max_lag + 1)
+    window = corr[lags % size]
+
+    norm = np.sqrt((x * x).sum(axis=0) * (y * y).sum(axis=0))
+    best = np.argmax(window, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        peaks = window[best, np.arange(k)] / norm
+    return lags[best], peaks
+
+
+def analyze_loops(df, loops=None, tag_columns=None, time_column='Date', overrides=None,
+                  max_lag_s=300, move_threshold=0.001):
+    """
+    모든 제어 루프의 추종 오차, 지연, 스틱션 지표, AUTO/MAN 시간을 한 번에 계산
+
+    Parameters:
+    - df: DataFrame (원본 또는 컬럼=태그명)
+    - loops: discover_loops 결과 (None이면 데이터의 태그로 자동 탐색)
+    - tag_columns: {tag: 컬럼명} (None이면 header_metadata 태그 인덱스, 없으면 컬럼명)
+    - time_column: 시간 컬럼명
+    - overrides: discover_loops에 넘길 짝 지정
+    - max_lag_s: 지연 탐색 범위 (초)
+    - move_threshold: '움직임'으로 볼 최소 변화량 (각 신호 범위 대비 비율)
+
+    Returns:
+    - DataFrame (루프당 1행): loop, kind, input, output, mode, samples, bias, mae, rmse, max_abs_error,
+      lag_s, lag_corr, stick_ratio, jump_p95, auto_s, manual_s, auto_ratio
+      (mode 태그가 있으면 오차 통계는 AUTO 구간만 사용)
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col in df.columns and col != time_column}
+    if loops is None:
+        loops = discover_loops(tag_columns, overrides)
+    loops = [loop for loop in loops if loop['input'] in tag_columns and loop['output'] in tag_columns]
+
+    if not loops or len(df) == 0:
+        return pd.DataFrame()
+
+    # 필요한 태그를 한 번에 숫자로 변환
+    needed = list(dict.fromkeys(tag for loop in loops for tag in (loop['input'], loop['output'], loop['mode'])
+                                if tag in tag_columns))
+    needed_columns = {tag: tag_columns[tag] for tag in needed}
+    catalog = update_signal_catalog({}, df, needed_columns)
+    signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+    numeric = to_numeric_tag_frame(df, needed_columns, signal_types)
+
+    n, k = len(df), len(loops)
+    inputs = numeric[[loop['input'] for loop in loops]].to_numpy(dtype=float)
+    outputs = numeric[[loop['output'] for loop in loops]].to_numpy(dtype=float)
+
+    if time_column in df.columns:
+        seconds = (pd.DatetimeIndex(df[time_column]) - df[time_column].iloc[0]).total_seconds().to_numpy()
+    else:
+        seconds = np.arange(n, dtype=float)
+    dt = np.diff(seconds, append=seconds[-1])
+    sample_period = float(np.median(np.diff(seconds))) if n > 1 else 1.0
+    sample_period = sample_period if sample_period > 0 else 1.0
+
+    # AUTO 여부 행렬 (mode 태그가 없으면 NaN)
+    auto = np.full((n, k), np.nan)
+    for j, loop in enumerate(loops):
+        if loop['mode'] in numeric.columns:
+            state = numeric[loop['mode']].to_numpy(dtype=float)
+            auto[:, j] = state if loop['mode_on'] == 'auto' else np.where(np.isnan(state), np.nan, 1 - state)
+    has_mode = ~np.isnan(auto).all(axis=0)
+    in_auto = auto > 0.5
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        # 추종 오차 (mode가 있으면 AUTO 구간만)
+        error = outputs - inputs
+        error = np.where(has_mode & ~in_auto, np.nan, error)
+        result = {
+            'samples': (~np.isnan(error)).sum(axis=0),
+            'bias': np.nanmean(error, axis=0),
+            'mae': np.nanmean(np.abs(error), axis=0),
+            'rmse': np.sqrt(np.nanmean(error * error, axis=0)),
+            'max_abs_error': np.nanmax(np.abs(error), axis=0),
+        }
+
+        # 지연 (FFT 상호상관)
+        lags, peaks = fft_lag(inputs, outputs, int(max_lag_s / sample_period))
+        result['lag_s'] = lags * sample_period
+        result['lag_corr'] = peaks
+
+        # 스틱션 지표: 지령이 움직이는데 개도가 멈춘 비율, 개도가 움직일 때 한 번에 뛰는 크기
+        input_step = np.abs(np.diff(inputs, axis=0))
+        output_step = np.abs(np.diff(outputs, axis=0))
+        input_eps = move_threshold * (np.nanmax(inputs, axis=0) - np.nanmin(inputs, axis=0))
+        output_eps = move_threshold * (np.nanmax(outputs, axis=0) - np.nanmin(outputs, axis=0))
+        commanded = input_step > input_eps
+        moved = output_step > output_eps
+        result['stick_ratio'] = (commanded & ~moved).sum(axis=0) / np.maximum(commanded.sum(axis=0), 1)
+        output_range = np.nanmax(outputs, axis=0) - np.nanmin(outputs, axis=0)
+        jumps = np.where(moved, output_step, np.nan)
+        result['jump_p95'] = np.nanpercentile(jumps, 95, axis=0) / np.where(output_range > 0, output_range, np.nan)
+
+        # AUTO / MAN 시간 (샘플 간격 가중)
+        auto_s = np.where(in_auto, dt[:, None], 0.0).sum(axis=0)
+        manual_s = np.where(auto < 0.5, dt[:, None], 0.0).sum(axis=0)
+        result['auto_s'] = np.where(has_mode, auto_s, np.nan)
+        result['manual_s'] = np.where(has_mode, manual_s, np.nan)
+        result['auto_ratio'] = result['auto_s'] / (result['auto_s'] + result['manual_s'])
+
+    stats = pd.DataFrame(result)
+    # 위치 루프가 아닌 경우 스틱션 지표는 의미가 없음
+    position = np.array([loop['kind'] == 'position' for loop in loops])
+    stats.loc[~position, ['stick_ratio', 'jump_p95']] = np.nan
+
+    info = pd.DataFrame(loops)[['loop', 'kind', 'input', 'output', 'mode']]
+    return pd.concat([info, stats], axis=1)
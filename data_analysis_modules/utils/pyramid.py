@@ -0,0 +1,193 @@
+import pandas as pd
+
+from .data_extraction import update_signal_catalog, to_numeric_tag_frame
+
+
+# ============================================================================
+# 다중 해상도 요약(피라미드) 계산 함수
+# ============================================================================
+
+# 기본 해상도 레벨 (세밀 → 거침 순서)
+PYRAMID_LEVELS = ['1s', '10s', '1min', '10min', '1h']
+
+# 버킷별 통계
+PYRAMID_STATS = ['min', 'max', 'mean', 'last', 'count']
+
+
+def aggregate_level(values, times, freq, position_offset=0):
+    """
+    숫자형 태그 데이터를 시간 버킷 단위로 요약
+
+    Args:
+        values: 숫자형 DataFrame (컬럼=태그명, DIO는 0/1)
+        times: values와 같은 길이의 시간 Series/배열
+        freq: 버킷 크기 (예: '1s', '1min')
+        position_offset: 행 위치 오프셋 (증분 처리 시 기존 행 수)
+
+    Returns:
+        dict: {'min', 'max', 'mean', 'last', 'count': DataFrame, 'pos': Series}
+              인덱스는 버킷 시작 시각, pos는 버킷 첫 행의 위치
+    """
+    bucket = pd.DatetimeIndex(times).floor(freq)
+    grouped = values.set_axis(bucket, axis=0).groupby(level=0, sort=True)
+
+    level = {
+        'min': grouped.min(),
+        'max': grouped.max(),
+        'mean': grouped.mean(),
+        'last': grouped.last(),
+        'count': grouped.count(),
+    }
+    positions = pd.Series(range(position_offset, position_offset + len(values)), index=bucket)
+    level['pos'] = positions.groupby(level=0, sort=True).first()
+
+    return level
+
+
+def reduce_level(level, keys):
+    """
+    이미 요약된 레벨을 keys 기준으로 다시 합침
+
+    거친 레벨을 세밀한 레벨로부터 만들거나(coarsen), 청크 경계에서
+    두 번 나타난 같은 버킷을 병합할 때 사용한다.
+
+    Args:
+        level: aggregate_level 결과
+        keys: 각 행의 새 버킷 키 (level 인덱스와 같은 길이)
+
+    Returns:
+        dict: aggregate_level과 같은 구조
+    """
+    count = level['count']
+    total = count.groupby(keys, sort=True).sum()
+    weighted = (level['mean'] * count).groupby(keys, sort=True).sum()
+
+    return {
+        'min': level['min'].groupby(keys, sort=True).min(),
+        'max': level['max'].groupby(keys, sort=True).max(),
+        'mean': weighted / total.where(total > 0),
+        'last': level['last'].groupby(keys, sort=True).last(),
+        'count': total,
+        'pos': level['pos'].groupby(keys, sort=True).first(),
+    }
+
+
+def coarsen_level(level, freq):
+    """
+    세밀한 레벨을 더 큰 버킷(freq)으로 요약
+
+    Args:
+        level: aggregate_level 결과
+        freq: 새 버킷 크기
+
+    Returns:
+        dict: aggregate_level과 같은 구조
+    """
+    return reduce_level(level, level['count'].index.floor(freq))
+
+
+def concat_levels(levels):
+    """
+    같은 해상도의 레벨 조각들을 이어 붙이고 경계의 중복 버킷을 병합
+
+    Args:
+        levels: aggregate_level 결과 리스트 (시간 순서)
+
+    Returns:
+        dict: aggregate_level과 같은 구조
+    """
+    levels = [lv for lv in levels if lv is not None and len(lv['count']) > 0]
+    if not levels:
+        return None
+    if len(levels) == 1:
+        return levels[0]
+
+    merged = {key: pd.concat([lv[key] for lv in levels]) for key in PYRAMID_STATS + ['pos']}
+    if not merged['count'].index.has_duplicates:
+        return merged
+    return reduce_level(merged, merged['count'].index)
+
+
+def level_to_frame(level):
+    """
+    레벨 dict를 저장용 단일 DataFrame으로 변환 (컬럼: (통계, 태그) MultiIndex)
+    """
+    frame = pd.concat({stat: level[stat] for stat in PYRAMID_STATS}, axis=1)
+    frame[('pos', '')] = level['pos']
+    return frame
+
+
+def level_from_frame(frame):
+    """
+    level_to_frame으로 저장한 DataFrame을 레벨 dict로 복원
+    """
+    level = {stat: frame[stat] for stat in PYRAMID_STATS}
+    level['pos'] = frame[('pos', '')].astype('int64').rename('pos')
+    return level
+
+
+def build_pyramid(df, tag_columns, signal_types=None, time_column='Date', levels=None):
+    """
+    로드된 DataFrame으로부터 태그별 다중 해상도 요약(피라미드) 생성
+
+    가장 세밀한 레벨만 원본에서 계산하고, 나머지는 바로 아래 레벨을
+    다시 요약하여 만들기 때문에 원본은 한 번만 읽는다.
+
+    Args:
+        df: 원본 DataFrame (time_column 포함)
+        tag_columns: {tag: DataFrame 컬럼명} (추출된 DataFrame이면 {tag: tag})
+        signal_types: {tag: 'dio'/'analog'} (None이면 데이터로 판별)
+        time_column: 시간 컬럼명
+        levels: 해상도 리스트 (None이면 PYRAMID_LEVELS)
+
+    Returns:
+        dict: {freq: level} (세밀 → 거침 순서)
+    """
+    levels = levels or PYRAMID_LEVELS
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col != time_column}
+
+    if signal_types is None:
+        catalog = update_signal_catalog({}, df, tag_columns)
+        signal_types = {tag: entry['type'] for tag, entry in catalog.items()}
+
+    numeric = to_numeric_tag_frame(df, tag_columns, signal_types)
+
+    pyramid = {}
+    level = None
+    for freq in levels:
+        if level is None:
+            level = aggregate_level(numeric, df[time_column], freq)
+        else:
+            level = coarsen_level(level, freq)
+        pyramid[freq] = level
+
+    return pyramid
+
+
+def pyramid_window(pyramid, tag, start, end, min_points):
+    """
+    표시 구간에 충분한 점 수를 주는 가장 거친 레벨을 골라 태그 요약 반환
+
+    Args:
+        pyramid: build_pyramid 결과 (또는 {freq: level})
+        tag: 태그명
+        start, end: 표시 시간 구간
+        min_points: 필요한 최소 버킷 수 (보통 그림 가로 픽셀 수)
+
+    Returns:
+        freq: 선택된 해상도 (적당한 레벨이 없으면 None → 원본 사용)
+        window: DataFrame [min, max, mean, last] (인덱스=버킷 시작 시각)
+    """
+    for freq in sorted(pyramid, key=lambda f: pd.Timedelta(f), reverse=True):
+        level = pyramid[freq]
+        if tag not in level['count'].columns:
+            return None, None
+
+        buckets = level['count'].index
+        i0 = buckets.searchsorted(pd.Timestamp(start).floor(freq), side='left')
+        i1 = buckets.searchsorted(pd.Timestamp(end), side='right')
+        if i1 - i0 >= min_points:
+            window = pd.DataFrame({stat: level[stat][tag].iloc[i0:i1] for stat in ['min', 'max', 'mean', 'last']})
+            return freq, window
+
+    return None, None
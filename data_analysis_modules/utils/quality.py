@@ -0,0 +1,329 @@
+import hashlib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .local_store import build_tag_index
+from .data_extraction import update_signal_catalog
+from .events import dio_to_numeric
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir, write_cache_tables
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 데이터 품질 점검 (결측, 고착/평탄, 잘못된 DIO 값, 시간 간격 이상)
+# ============================================================================
+#
+# 모든 태그를 (샘플 수, 태그 수) 행렬 하나로 만들어 한 번에 점검한다.
+# 문자열(object) 컬럼은 pd.factorize 한 번으로 결측, 고유값(신호 종류 판별), 숫자 변환(고유값
+# 변환표[코드])을 함께 얻으므로 컬럼마다 데이터를 한 번만 훑는다.
+#   missing : 값이 비어 있는 연속 구간
+#   invalid : 값은 있지만 해석할 수 없는 구간 (DIO는 ON/OFF/0/1 이외, 아날로그는 숫자가 아닌 값)
+#   stuck   : 측정 태그(LIT/PIT/TIT/FIT-... 전송기) 값이 stuck_s 이상 똑같이 유지된 구간
+#             (전송기 고착, 마지막 값 채움). 설정값(-SP), 출력(-DMD), 위치(-ZT)는 일정한 값이 정상이라 제외
+#   time_gap / time_duplicate / time_backward : 시간 컬럼 간격이 중앙값의 gap_factor배 초과 / 0 / 음수
+# 신호 종류는 이름으로 DIO임을 아는 태그(-OF, -CF, -RF, -F, ...)와 넘겨받은 signal_types를 먼저 쓰고
+# 나머지만 데이터로 판별한다 (0/1 DIO에 2가 섞이면 데이터로는 아날로그로 보여 잘못된 값을 놓침).
+# 결과는 구간 테이블(행 위치 start~end 포함)이므로 quality_mask로 (행 × 태그) 마스크를
+# 누적합 한 번에 복원할 수 있고, apply_quality_mask로 나쁜 구간을 NaN으로 바꿔
+# 그림(선이 끊김)과 KPI 계산에서 제외한다. file_quality는 결과를 파일 캐시에 저장한다.
+
+QUALITY_VERSION = 2
+
+QUALITY_COLUMNS = ['tag', 'issue', 'start', 'end', 'start_time', 'end_time', 'samples', 'duration_s']
+SUMMARY_COLUMNS = ['tag', 'type', 'samples', 'missing', 'invalid', 'stuck', 'missing_runs', 'invalid_runs',
+                   'stuck_runs', 'max_stuck_s', 'bad_ratio']
+
+# apply_quality_mask 기본 대상 (시간 이상은 행 단위라 태그 마스크에 포함하지 않음)
+MASK_ISSUES = ('missing', 'invalid', 'stuck')
+
+# 이름으로 DIO임을 알 수 있는 태그 접미사 (상태/명령 신호, 'MOV-H1-4623-OF' → 'OF')
+DIO_SUFFIXES = ('OF', 'CF', 'F', 'RF', 'RP', 'RI', 'RDY', 'AMOD', 'AUTO', 'MAN')
+
+# 고착 점검 대상: 측정 전송기 태그 (첫 세그먼트가 LIT, PIT, TIT, FIT, PDIT, PT 등)
+_MEASUREMENT_TAG = re.compile(r'^[A-Z]{1,2}I?T-')
+
+
+def known_signal_types(tags):
+    """
+    이름만으로 신호 종류를 아는 태그 ({tag: 'dio'}, DIO_SUFFIXES 접미사)
+    """
+    return {tag: 'dio' for tag in tags if '-' in str(tag) and str(tag).rsplit('-', 1)[1] in DIO_SUFFIXES}
+
+
+def is_measurement_tag(tag):
+    """
+    고착 점검 대상인 측정 태그인지 (LIT-H1-4611-SEL 등 전송기 태그)
+    """
+    return bool(_MEASUREMENT_TAG.match(str(tag)))
+
+
+def _runs(mask):
+    """
+    (행 × 열) bool 마스크의 연속 True 구간
+
+    Returns:
+    - columns, starts, ends: 열 위치와 구간 시작/끝 행 (끝 포함), 열 → 행 순서
+    """
+    n, k = mask.shape
+    padded = np.zeros((k, n + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T
+    delta = np.diff(padded, axis=1)
+    # 열마다 시작(+1)과 끝 다음(-1)이 번갈아 나오므로 nonzero 한 번으로 짝지음
+    columns, positions = np.nonzero(delta)
+    return columns[0::2], positions[0::2], positions[1::2] - 1
+
+
+def _numeric_column(series, signal_type=None):
+    """
+    컬럼 하나를 한 번 훑어 (숫자 값, 결측 마스크, 신호 종류) 계산
+
+    DIO는 ON/OFF/0/1 이외 값, 아날로그는 숫자가 아닌 값이 NaN이 되므로
+    '결측이 아닌데 NaN'인 샘플이 잘못된 값이다.
+    """
+    if series.dtype.kind in 'fiub':
+        numeric = series.to_numpy(dtype=float)
+        missing = np.isnan(numeric)
+        codes, uniques = None, pd.unique(numeric[~missing])
+    else:
+        codes, uniques = pd.factorize(series)
+        missing = codes < 0
+
+    if signal_type is None:
+        catalog = update_signal_catalog({}, pd.DataFrame({'v': uniques}), {'v': 'v'})
+        signal_type = catalog['v']['type'] if 'v' in catalog else 'analog'
+
+    if codes is None and signal_type != 'dio':
+        return numeric, missing, signal_type
+
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    table = dio_to_numeric(uniques) if signal_type == 'dio' else \
+        pd.to_numeric(uniques, errors='coerce').to_numpy(dtype=float)
+    if codes is None:
+        codes = pd.Index(uniques.to_numpy(dtype=float)).get_indexer(numeric)
+    table = np.append(table, np.nan)   # 코드 -1(결측) → NaN
+    return table[codes], missing, signal_type
+
+
+def _interval_frame(tags, issue, columns, starts, ends, times):
+    seconds = (times[ends] - times[starts]) / np.timedelta64(1, 's') if len(times) else np.zeros(len(starts))
+    return pd.DataFrame({
+        'tag': np.asarray(tags, dtype=object)[columns] if len(columns) else np.array([], dtype=object),
+        'issue': issue, 'start': starts, 'end': ends,
+        'start_time': times[starts] if len(times) else pd.NaT,
+        'end_time': times[ends] if len(times) else pd.NaT,
+        'samples': ends - starts + 1, 'duration_s': seconds,
+    }, columns=QUALITY_COLUMNS)
+
+
+def scan_time_column(times, gap_factor=3.0):
+    """
+    시간 컬럼 간격 점검 (누락 구간, 중복 시각, 역행)
+
+    Parameters:
+    - times: datetime64 배열
+    - gap_factor: 중앙값 간격의 몇 배를 넘으면 누락으로 볼지
+
+    Returns:
+    - intervals (QUALITY_COLUMNS, tag는 빈 문자열, start/end는 간격 양쪽 행)
+    - period_s: 중앙값 샘플 간격 (초)
+    """
+    times = np.asarray(times, dtype='datetime64[ns]')
+    if len(times) < 2:
+        return pd.DataFrame(columns=QUALITY_COLUMNS), np.nan
+
+    steps = np.diff(times) / np.timedelta64(1, 's')
+    positive = steps[steps > 0]
+    period_s = float(np.median(positive)) if len(positive) else np.nan
+
+    frames = []
+    for issue, selected in (('time_gap', steps > gap_factor * period_s),
+                            ('time_duplicate', steps == 0),
+                            ('time_backward', steps < 0)):
+        rows = np.nonzero(selected)[0]
+        frame = _interval_frame([''], issue, np.zeros(len(rows), dtype=np.int64), rows, rows + 1, times)
+        frames.append(frame)
+    intervals = pd.concat(frames, ignore_index=True)
+    # 간격 이상은 시간 차이 자체가 의미 있는 값 (누락 구간 길이)
+    intervals['samples'] = np.where(intervals['issue'] == 'time_gap',
+                                    np.round(intervals['duration_s'] / period_s).astype(np.int64) - 1, 1)
+    return intervals, period_s
+
+
+def scan_quality(df, tag_columns=None, signal_types=None, time_column='Date', stuck_s=600, gap_factor=3.0,
+                 stuck_tags=None):
+    """
+    태그별 데이터 품질 점검 (한 번의 행렬 연산)
+
+    Parameters:
+    - df: 원본 DataFrame (또는 컬럼=태그명 DataFrame)
+    - tag_columns: {tag: 컬럼명} (None이면 build_tag_index(df), 그것도 없으면 시간 컬럼 외 전체)
+    - signal_types: {tag: 'dio'/'analog'} 알고 있는 신호 종류 (known_signal_types보다 우선,
+      둘 다 없는 태그는 데이터로 판별)
+    - time_column: 시간 컬럼명
+    - stuck_s: 측정 태그 값이 이 시간(초) 이상 같으면 고착으로 봄
+    - gap_factor: 시간 간격이 중앙값의 몇 배를 넘으면 누락으로 봄
+    - stuck_tags: 고착 점검 대상 태그 (None이면 is_measurement_tag인 아날로그 태그)
+
+    Returns:
+    - intervals: DataFrame (QUALITY_COLUMNS), 시간 이상은 tag=시간 컬럼명
+    - summary: DataFrame (SUMMARY_COLUMNS) 태그별 샘플 수, 나쁜 구간 비율
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col != time_column and col in df.columns}
+    tags = list(tag_columns)
+    signal_types = {**known_signal_types(tags), **(signal_types or {})}
+    times = df[time_column].to_numpy(dtype='datetime64[ns]') if time_column in df.columns else np.array([])
+    n = len(df)
+
+    # 컬럼 단위로 채우고 컬럼 방향으로 훑으므로 열 우선(Fortran) 배열 사용
+    numeric = np.empty((n, len(tags)), order='F')
+    raw_missing = np.empty((n, len(tags)), dtype=bool, order='F')
+    for j, (tag, col) in enumerate(tag_columns.items()):
+        series = df[col]
+        if isinstance(series, pd.DataFrame):
+            series = series.iloc[:, 0]
+        numeric[:, j], raw_missing[:, j], signal_types[tag] = _numeric_column(series, signal_types.get(tag))
+    invalid = np.isnan(numeric) & ~raw_missing
+
+    # 고착: 직전 샘플과 같은 값이 이어지는 구간 (측정 태그만, DIO는 상태 유지가 정상이므로 제외)
+    stuck_tags = set(tag for tag in tags if is_measurement_tag(tag)) if stuck_tags is None else set(stuck_tags)
+    checked = np.array([tag in stuck_tags and signal_types.get(tag) != 'dio' for tag in tags], dtype=bool)
+    same = np.zeros((n, len(tags)), dtype=bool, order='F')
+    if n > 1 and checked.any():
+        same[1:, checked] = numeric[1:, checked] == numeric[:-1, checked]
+
+    frames = []
+    for issue, mask in (('missing', raw_missing), ('invalid', invalid)):
+        frames.append(_interval_frame(tags, issue, *_runs(mask), times))
+
+    columns, starts, ends = _runs(same)
+    starts = starts - 1   # 같은 값이 시작된 샘플부터
+    stuck = _interval_frame(tags, 'stuck', columns, starts, ends, times)
+    # 시간 컬럼이 없으면 stuck_s를 샘플 수로 사용
+    frames.append(stuck[stuck['duration_s'] >= stuck_s] if len(times) else stuck[stuck['samples'] >= stuck_s])
+
+    time_intervals, _ = scan_time_column(times, gap_factor) if len(times) else (pd.DataFrame(), np.nan)
+    if len(time_intervals):
+        time_intervals['tag'] = time_column
+        frames.append(time_intervals)
+
+    intervals = pd.concat([frame for frame in frames if len(frame)], ignore_index=True) \
+        if any(len(frame) for frame in frames) else pd.DataFrame(columns=QUALITY_COLUMNS)
+
+    # 태그별 요약
+    per_tag = intervals[intervals['tag'].isin(tags)]
+    grouped = per_tag.groupby(['tag', 'issue'])['samples']
+    sums, runs = grouped.sum(), grouped.count()
+    summary = pd.DataFrame({'tag': tags, 'type': [signal_types.get(tag) for tag in tags], 'samples': n})
+    for issue in MASK_ISSUES:
+        keys = pd.MultiIndex.from_arrays([summary['tag'], [issue] * len(summary)])
+        summary[issue] = sums.reindex(keys, fill_value=0).to_numpy(dtype=np.int64)
+        summary[f'{issue}_runs'] = runs.reindex(keys, fill_value=0).to_numpy(dtype=np.int64)
+    stuck_max = per_tag[per_tag['issue'] == 'stuck'].groupby('tag')['duration_s'].max()
+    summary['max_stuck_s'] = summary['tag'].map(stuck_max).fillna(0.0)
+
+    mask = quality_mask(per_tag, n, tags)
+    summary['bad_ratio'] = mask.sum(axis=0) / n if n else 0.0
+    return intervals, summary[SUMMARY_COLUMNS]
+
+
+def quality_mask(intervals, n_rows, tags, issues=MASK_ISSUES):
+    """
+    품질 구간 테이블에서 (행 × 태그) 나쁜 샘플 마스크 복원 (구간 양끝 ±1 후 누적합 한 번)
+
+    Parameters:
+    - intervals: scan_quality / file_quality 구간 테이블
+    - n_rows: 행 수 (점검한 DataFrame과 같은 행 순서)
+    - tags: 마스크 열 순서
+    - issues: 포함할 문제 종류
+
+    Returns:
+    - np.ndarray bool (n_rows, len(tags))
+    """
+    positions = {tag: i for i, tag in enumerate(tags)}
+    selected = intervals[intervals['issue'].isin(issues) & intervals['tag'].isin(positions)]
+
+    delta = np.zeros((n_rows + 1, len(tags)), dtype=np.int32, order='F')
+    columns = selected['tag'].map(positions).to_numpy(dtype=np.int64)
+    np.add.at(delta, (selected['start'].to_numpy(dtype=np.int64), columns), 1)
+    np.add.at(delta, (selected['end'].to_numpy(dtype=np.int64) + 1, columns), -1)
+    return np.cumsum(delta, axis=0)[:n_rows] > 0
+
+
+def apply_quality_mask(frame, intervals, tag_columns=None, issues=MASK_ISSUES):
+    """
+    나쁜 품질 구간 값을 NaN으로 바꾼 DataFrame (그림에서는 선이 끊기고 KPI 계산에서 빠짐)
+
+    Parameters:
+    - frame: 점검한 파일과 같은 행 순서의 DataFrame (원본 또는 컬럼=태그명)
+    - intervals: scan_quality / file_quality 구간 테이블
+    - tag_columns: {tag: frame 컬럼명} (None이면 frame 컬럼명이 태그명)
+    - issues: 제외할 문제 종류
+
+    Returns:
+    - DataFrame (복사본)
+    """
+    if tag_columns is None:
+        tag_columns = {col: col for col in frame.columns}
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col in frame.columns}
+    tags = list(tag_columns)
+    mask = quality_mask(intervals, len(frame), tags, issues)
+
+    frame = frame.copy()
+    for i in np.nonzero(mask.any(axis=0))[0]:
+        col = tag_columns[tags[i]]
+        frame[col] = frame[col].mask(mask[:, i])
+    return frame
+
+
+def _quality_cache_key(options):
+    text = json.dumps({'version': QUALITY_VERSION, **options}, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def file_quality(file_path, stuck_s=600, gap_factor=3.0, time_column='Date', cache_dir=DEFAULT_CACHE_DIR,
+                 refresh=False, signal_types=None, tags=None, all_tags=False):
+    """
+    export 파일의 품질 점검 (점검할 태그 컬럼만 로드, 파일 내용과 설정이 같으면 캐시된 결과 사용)
+
+    signal_types: 알고 있는 신호 종류 {tag: 'dio'/'analog'} (예: 저장소 signal_catalog),
+    없는 태그는 이름(known_signal_types)과 데이터로 판별
+    tags: 점검할 태그 (None이면 step_tags 전체 합집합), all_tags=True면 파일의 모든 컬럼
+
+    Returns:
+    - intervals, summary (scan_quality와 같음), 로드 실패 시 (None, None)
+    """
+    options = {'stuck_s': stuck_s, 'gap_factor': gap_factor, 'time_column': time_column,
+               'signal_types': sorted((signal_types or {}).items()),
+               'tags': 'all' if all_tags else sorted(set(tags)) if tags is not None else 'steps'}
+    cache_path = file_cache_dir(file_path, cache_dir) / f'quality_{_quality_cache_key(options)}.h5'
+
+    if cache_path.exists() and not refresh:
+        print(f"♻️  품질 점검 캐시 사용: {cache_path}")
+        return pd.read_hdf(cache_path, 'intervals'), pd.read_hdf(cache_path, 'summary')
+
+    try:
+        schema = load_hdf5_schema(file_path)
+        tag_columns = build_tag_index(schema) or {col: col for col in schema.columns}
+        if not all_tags:
+            wanted = set(tags) if tags is not None else {tag for step in step_tags for tag in step}
+            tag_columns = {tag: col for tag, col in tag_columns.items() if tag in wanted}
+        df = load_hdf5_columns(file_path, [time_column] + list(dict.fromkeys(tag_columns.values())))
+        df.attrs = {}
+    except Exception as e:
+        print(f"❌ 로드 실패: {file_path} ({e})")
+        return None, None
+
+    intervals, summary = scan_quality(df, tag_columns, signal_types, time_column=time_column,
+                                      stuck_s=stuck_s, gap_factor=gap_factor)
+
+    write_cache_tables(cache_path, {'intervals': intervals, 'summary': summary})
+
+    bad = summary[summary['bad_ratio'] > 0]
+    print(f"✅ 품질 점검 완료: 태그 {len(summary)}개 중 {len(bad)}개에 문제 구간, 구간 {len(intervals)}개")
+    return intervals, summary
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from .file_cache import DEFAULT_CACHE_DIR
+
+
+# ============================================================================
+# 렌더링 결과 캐시 (내용 주소 방식)
+# ============================================================================
+#
+# 키 = (원본 파일 지문, 그림 종류, step 태그 리스트, 시간 구간, dpi, 스타일, 플롯 코드 버전)
+# 같은 키의 그림이 캐시에 있으면 다시 그리지 않고 하드 링크(불가능하면 복사)로 출력한다.
+# 신호가 없어 그림이 생성되지 않은 경우도 '.none' 표시로 기억한다.
+
+# 그림 결과에 영향을 주는 모듈 (내용이 바뀌면 캐시 키가 바뀜)
+#   batch.py: 신호 선택(render_figures), tag_metadata.py: 설명, report_writer.py: save_figure 옵션,
+#   quality.py: quality_mask 구간, load_file.py: 컬럼 읽기
+PLOT_CODE_MODULES = ['visualization.py', 'data_extraction.py', 'pyramid.py', 'events.py',
+                     'batch.py', 'tag_metadata.py', 'report_writer.py', 'quality.py', 'load_file.py']
+
+
+def plot_code_version():
+    """
+    플롯 관련 모듈 소스의 해시 (코드 수정 시 이전 렌더링 결과를 무효화)
+    """
+    sha1 = hashlib.sha1()
+    utils_dir = Path(__file__).parent
+    for name in PLOT_CODE_MODULES:
+        path = utils_dir / name
+        if path.exists():
+            sha1.update(path.read_bytes())
+    return sha1.hexdigest()[:12]
+
+
+class RenderCache:
+    """
+    savefig 결과 파일 캐시
+
+    Parameters:
+    - cache_dir: 캐시 루트 디렉터리 (렌더링 결과는 cache_dir/renders 아래에 저장)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.render_dir = Path(cache_dir) / 'renders'
+        self.render_dir.mkdir(parents=True, exist_ok=True)
+        self.code_version = plot_code_version()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, fingerprint, kind, tags, time_range=None, dpi=150, style=None, suffix='.png'):
+        """
+        렌더링 캐시 키 생성
+
+        Parameters:
+        - fingerprint: 원본 파일 지문 (여러 파일이면 리스트)
+        - kind: 그림 종류 ('dio', 'analog' 등)
+        - tags: step 태그 리스트 (순서 포함)
+        - time_range: 표시 시간 구간
+        - dpi: 저장 해상도
+        - style: 그 밖의 표시 옵션 (라벨, 피라미드 사용 여부 등, JSON 직렬화 가능해야 함)
+        - suffix: 출력 파일 확장자
+        """
+        payload = {
+            'fingerprint': fingerprint,
+            'kind': kind,
+            'tags': list(tags),
+            'time_range': [str(t) for t in time_range] if time_range is not None else None,
+            'dpi': dpi,
+            'style': style,
+            'code': self.code_version,
+        }
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+        return digest + suffix
+
+    def fetch(self, key, dest_path):
+        """
+        캐시된 결과를 dest_path로 출력
+
+        Returns:
+        - True: 캐시된 그림을 출력함
+        - False: 캐시에 없음 (렌더링 필요)
+        - None: 캐시에 '그림 없음'으로 기록됨
+
+        캐시에 없으면 기존 dest_path를 지운다. 이전 실행에서 캐시와 하드 링크된
+        파일을 savefig가 그대로 덮어써 캐시 내용이 바뀌는 것을 막기 위함이다.
+        """
+        cached = self.render_dir / key
+        if cached.exists():
+            _link_or_copy(cached, Path(dest_path))
+            self.hits += 1
+            return True
+        if cached.with_name(key + '.none').exists():
+            self.hits += 1
+            return None
+        self.misses += 1
+        Path(dest_path).unlink(missing_ok=True)
+        return False
+
+    def store(self, key, src_path):
+        """
+        렌더링 결과를 캐시에 저장 (src_path가 None이면 '그림 없음'으로 기록)
+        """
+        if src_path is None:
+            (self.render_dir / (key + '.none')).touch()
+            return
+        cached = self.render_dir / key
+        if not cached.exists():
+            tmp_path = cached.with_name(key + '.tmp')
+            shutil.copy2(src_path, tmp_path)
+            os.replace(tmp_path, cached)
+        # 출력 파일도 캐시와 같은 파일을 가리키도록 맞춤
+        _link_or_copy(cached, Path(src_path))
+
+
+def _link_or_copy(src, dest):
+    if dest.exists():
+        if os.path.samefile(src, dest):
+            return
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
@@ -0,0 +1,106 @@
+import html
+from pathlib import Path
+
+
+# ============================================================================
+# 리포트 출력 (여러 페이지 PDF / HTML 묶음, 압축 래스터 형식)
+# ============================================================================
+#
+# step 그림을 만들 때마다 바로 리포트에 쓰고 닫으므로, 그림 수와 무관하게
+# 메모리에는 그림 하나만 남고 출력 파일도 PDF 1개 또는 HTML 1개 + 이미지 폴더가 된다.
+# 그림은 plot_* 함수가 이미 레이아웃을 잡아 두므로 bbox_inches='tight'(저장 시 레이아웃을
+# 다시 계산하는 추가 렌더링)를 쓰지 않고 그림 크기 그대로 저장한다.
+
+# 품질(quality) 옵션을 받는 손실 압축 래스터 형식
+QUALITY_FORMATS = {'webp', 'jpg', 'jpeg', 'avif'}
+
+
+def save_figure(fig, path, dpi=150, quality=None, bbox=None):
+    """
+    그림 저장 (webp/jpg/avif는 quality로 압축률 지정)
+
+    Parameters:
+    - fig: matplotlib Figure
+    - path: 저장 경로 (확장자로 형식 결정)
+    - dpi: 해상도
+    - quality: 손실 압축 품질 (1~100, None이면 형식 기본값)
+    - bbox: bbox_inches (None이면 그림 크기 그대로, 'tight'는 저장 시 레이아웃 재계산)
+    """
+    fmt = Path(path).suffix.lstrip('.').lower()
+    options = {'dpi': dpi, 'bbox_inches': bbox}
+    if quality is not None and fmt in QUALITY_FORMATS:
+        options['pil_kwargs'] = {'quality': int(quality)}
+    fig.savefig(path, **options)
+
+
+class ReportWriter:
+    """
+    그림을 받는 즉시 리포트에 쓰고 닫는 스트리밍 리포트 작성기
+
+    Parameters:
+    - path: 리포트 경로 ('.pdf'면 여러 페이지 PDF, '.html'이면 HTML + '<이름>_files' 이미지 폴더)
+    - image_format: HTML 이미지 형식 ('webp', 'png', 'svg', ...)
+    - dpi: 해상도
+    - quality: 손실 압축 품질 (webp/jpg/avif)
+    - title: 리포트 제목
+    """
+
+    def __init__(self, path, image_format='webp', dpi=150, quality=80, title='데이터 분석 리포트'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.image_format = image_format
+        self.dpi = dpi
+        self.quality = quality
+        self.pages = 0
+
+        if self.path.suffix.lower() == '.pdf':
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            self.kind = 'pdf'
+            self._pdf = PdfPages(self.path, metadata={'Title': title})
+        elif self.path.suffix.lower() in ('.html', '.htm'):
+            self.kind = 'html'
+            self.image_dir = self.path.with_name(self.path.stem + '_files')
+            self.image_dir.mkdir(exist_ok=True)
+            self._html = open(self.path, 'w', encoding='utf-8')
+            self._html.write('<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+                             f'<title>{html.escape(title)}</title>\n'
+                             '<style>body{font-family:sans-serif;margin:24px} img{max-width:100%} '
+                             'section{margin-bottom:32px}</style>\n'
+                             f'</head>\n<body>\n<h1>{html.escape(title)}</h1>\n')
+        else:
+            raise ValueError(f"리포트 형식은 .pdf 또는 .html 이어야 합니다: {self.path}")
+
+    def add(self, fig, title=None):
+        """
+        그림 한 장을 리포트에 쓰고 닫기
+        """
+        import matplotlib.pyplot as plt
+
+        try:
+            if self.kind == 'pdf':
+                self._pdf.savefig(fig)
+            else:
+                name = f'page{self.pages + 1:04d}.{self.image_format}'
+                save_figure(fig, self.image_dir / name, self.dpi, self.quality)
+                caption = f'<h2>{html.escape(title)}</h2>' if title else ''
+                self._html.write(f'<section>{caption}<img src="{self.image_dir.name}/{name}" '
+                                 f'alt="{html.escape(title or name)}" loading="lazy"></section>\n')
+                self._html.flush()
+            self.pages += 1
+        finally:
+            plt.close(fig)
+
+    def close(self):
+        if self.kind == 'pdf':
+            self._pdf.close()
+        elif not self._html.closed:
+            self._html.write('</body>\n</html>\n')
+            self._html.close()
+        print(f"✅ 리포트 저장: {self.path} ({self.pages}페이지)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# 고정 크기 링 버퍼 태그 저장소 (실시간 모니터링용)
+# ============================================================================
+#
+# 모든 태그의 최근 capacity개 샘플을 (2*capacity, n_tags) 배열 하나에 미리 할당해 둔다.
+# 샘플을 slot과 slot+capacity 두 위치에 함께 기록(이중 기록)하므로, 최근 n개 샘플은
+# 항상 배열의 연속된 구간이 되어 복사 없이 view로 꺼낼 수 있다.
+# 메모리 사용량은 생성 시점에 정해지며 append해도 늘어나지 않는다.
+
+
+class RingBufferTagStore:
+    """
+    태그별 최근 N개 샘플을 보관하는 고정 크기 저장소
+
+    Parameters:
+    - tags: 태그 리스트 (컬럼 순서)
+    - capacity: 태그별 보관 샘플 수
+    - dtype: 값 dtype (기본 float32, DIO는 0/1, 결측은 NaN)
+    """
+
+    __slots__ = ('tags', 'capacity', 'dtype', '_column', '_values', '_times', '_head', '_count', 'total')
+
+    def __init__(self, tags, capacity, dtype=np.float32):
+        self.tags = list(dict.fromkeys(tags))
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._column = {tag: i for i, tag in enumerate(self.tags)}
+
+        self._values = np.full((2 * self.capacity, len(self.tags)), np.nan, dtype=self.dtype)
+        self._times = np.full(2 * self.capacity, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self._head = 0      # 다음에 기록할 slot
+        self._count = 0     # 현재 보관 중인 샘플 수 (≤ capacity)
+        self.total = 0      # 지금까지 추가된 전체 샘플 수
+
+    @staticmethod
+    def estimate_nbytes(n_tags, capacity, dtype=np.float32):
+        """
+        생성 전에 메모리 사용량(bytes) 계산
+        """
+        return 2 * capacity * (n_tags * np.dtype(dtype).itemsize + np.dtype('datetime64[ns]').itemsize)
+
+    @property
+    def nbytes(self):
+        return self._values.nbytes + self._times.nbytes
+
+    def __len__(self):
+        return self._count
+
+    def append(self, values, timestamp=None):
+        """
+        샘플 한 개 추가 - O(1)
+
+        Parameters:
+        - values: 태그 순서대로의 값 배열 (길이 n_tags)
+        - timestamp: 샘플 시각
+        """
+        slot = self._head
+        self._values[slot] = values
+        self._values[slot + self.capacity] = values
+        timestamp = np.datetime64('NaT') if timestamp is None else np.datetime64(timestamp, 'ns')
+        self._times[slot] = self._times[slot + self.capacity] = timestamp
+
+        self._head = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, block, timestamps=None):
+        """
+        여러 샘플을 한 번에 추가 (행 수에 비례, 전체 버퍼 크기와 무관)
+
+        Parameters:
+        - block: (n_samples, n_tags) 배열
+        - timestamps: 길이 n_samples 시각 배열
+        """
+        block = np.asarray(block, dtype=self.dtype)
+        n_new = len(block)
+        if n_new == 0:
+            return
+        if timestamps is not None:
+            timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+
+        # capacity보다 많으면 마지막 capacity개만 의미가 있음
+        skipped = max(0, n_new - self.capacity)
+        if skipped:
+            block = block[skipped:]
+            timestamps = timestamps[skipped:] if timestamps is not None else None
+
+        slots = (self._head + skipped + np.arange(len(block))) % self.capacity
+        self._values[slots] = block
+        self._values[slots + self.capacity] = block
+        if timestamps is None:
+            timestamps = np.datetime64('NaT')
+        self._times[slots] = timestamps
+        self._times[slots + self.capacity] = timestamps
+
+        self._head = (self._head + n_new) % self.capacity
+        self._count = min(self._count + n_new, self.capacity)
+        self.total += n_new
+
+    def _window_slice(self, n=None):
+        n = self._count if n is None else min(int(n), self._count)
+        end = self._head + self.capacity
+        return slice(end - n, end)
+
+    def window(self, n=None):
+        """
+        최근 n개 샘플의 (시각, 값) view - 복사 없음
+
+        Returns:
+        - times: (n,) datetime64 view
+        - values: (n, n_tags) view (오래된 샘플 → 최신 순서)
+        """
+        window = self._window_slice(n)
+        return self._times[window], self._values[window]
+
+    def series(self, tag, n=None):
+        """
+        태그 하나의 최근 n개 샘플 view - 복사 없음
+        """
+        return self._values[self._window_slice(n), self._column[tag]]
+
+    def positions(self, n=None):
+        """
+        최근 n개 샘플의 누적 샘플 번호 (plot_*_signals_ordered의 인덱스 X축과 같은 의미)
+        """
+        n = self._count if n is None else min(int(n), self._count)
+        return np.arange(self.total - n, self.total)
+
+    def frame(self, n=None, time_column='Date'):
+        """
+        최근 n개 샘플을 DataFrame으로 제공 (값 블록은 버퍼의 view를 그대로 사용)
+
+        plot_dio_signals_ordered / plot_analog_signals_ordered에 바로 넘길 수 있다.
+        DIO 값은 0/1 float이므로 기존 DIO 매핑과 분류 로직을 그대로 통과한다.
+        이후 샘플이 추가되면 내용이 바뀌므로, 보관하려면 copy()해서 사용한다.
+        """
+        times, values = self.window(n)
+        df = pd.DataFrame(values, columns=self.tags, copy=False)
+        df[time_column] = times
+        return df
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .local_store import build_tag_index
+from .data_extraction import update_signal_catalog
+from .events import detect_dio_events
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir, write_cache_tables
+from .step_tags import step_tags
+
+
+# ============================================================================
+# 기동(startup)별 step 소요 시간 / 순서 준수 리포트 (디렉터리 일괄, 프로세스 병렬)
+# ============================================================================
+#
+# 파일마다 step 태그 컬럼만 읽어(load_hdf5_columns) DIO 에지를 한 번에 추출한 뒤
+#   기동 구간 : 전체 step 이벤트를 시간순으로 놓고 startup_gap 이상 비는 곳에서 나눔
+#   step 구간 : 기동 구간 안에서 그 step 태그의 첫 에지 ~ 마지막 에지
+#               (여러 step에 걸친 공용 태그는 구간을 번지게 하므로, 그 step에만 있는
+#                태그가 있으면 그것만 사용)
+#   순서 준수 : 관측된 시작 순서에서 step 번호의 최장 증가 부분열(LIS)에 드는 step은 'ok',
+#               나머지는 'out_of_sequence', 태그는 있는데 에지가 없으면 'missing'
+# 파일별 결과는 파일 캐시에 저장하고, 디렉터리 전체를 하나의 테이블로 합친다.
+
+REPORT_VERSION = 1
+REPORT_COLUMNS = ['file', 'startup', 'startup_start', 'startup_end', 'step', 'status',
+                  'observed_order', 'start', 'end', 'duration_s', 'events', 'tags']
+
+
+def step_window_tags(steps=None, exclusive=True):
+    """
+    step별 구간 검출에 쓸 태그
+
+    Parameters:
+    - steps: step 번호 리스트 (1부터, None이면 태그가 있는 전체 step)
+    - exclusive: True면 그 step에만 있는 태그를 우선 사용 (없으면 step 태그 전체)
+
+    Returns:
+    - {step: [태그, ...]}
+    """
+    if steps is None:
+        steps = [i + 1 for i, tags in enumerate(step_tags) if tags]
+
+    owners = {}
+    for i, tags in enumerate(step_tags):
+        for tag in dict.fromkeys(tags):
+            owners[tag] = owners.get(tag, 0) + 1
+
+    result = {}
+    for step in steps:
+        tags = list(dict.fromkeys(step_tags[step - 1]))
+        unique = [tag for tag in tags if owners[tag] == 1]
+        result[step] = unique if exclusive and unique else tags
+    return result
+
+
+def _sequence_mask(steps):
+    # 관측 순서의 step 번호 중 최장 증가 부분열(LIS)에 드는 위치 (O(n log n))
+    tails, tail_index, previous = [], [], [-1] * len(steps)
+    for i, step in enumerate(steps):
+        j = int(np.searchsorted(tails, step, side='right'))
+        if j == len(tails):
+            tails.append(step)
+            tail_index.append(i)
+        else:
+            tails[j] = step
+            tail_index[j] = i
+        previous[i] = tail_index[j - 1] if j > 0 else -1
+
+    keep = np.zeros(len(steps), dtype=bool)
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        keep[i] = True
+        i = previous[i]
+    return keep
+
+
+def startup_steps(df, window_tags=None, tag_columns=None, time_column='Date', startup_gap='6h', min_steps=3):
+    """
+    DataFrame 하나의 기동별 step 구간과 순서 준수 여부
+
+    Parameters:
+    - df: DataFrame (원본 또는 step 태그 컬럼만 로드한 것)
+    - window_tags: step_window_tags 결과 (None이면 기본값)
+    - tag_columns: {tag: 컬럼명} (None이면 header_metadata 태그 인덱스, 없으면 컬럼명)
+    - time_column: 시간 컬럼명
+    - startup_gap: 기동을 나누는 이벤트 공백 (예: '6h')
+    - min_steps: 기동으로 볼 최소 step 수 (이보다 적게 움직인 구간은 제외)
+
+    Returns:
+    - DataFrame (REPORT_COLUMNS에서 file 제외, 기동 × step 1행)
+    """
+    columns = REPORT_COLUMNS[1:]
+    if window_tags is None:
+        window_tags = step_window_tags()
+    if tag_columns is None:
+        tag_columns = build_tag_index(df) or {col: col for col in df.columns}
+    tag_columns = {tag: col for tag, col in tag_columns.items() if col in df.columns and col != time_column}
+
+    needed = {tag: tag_columns[tag] for tags in window_tags.values() for tag in tags if tag in tag_columns}
+    if not needed or len(df) == 0 or time_column not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    # DIO 태그만 에지 검출 (컬럼명 → 태그명으로 바꾼 프레임 하나로 한 번에)
+    catalog = update_signal_catalog({}, df, needed)
+    dio_tags = [tag for tag, entry in catalog.items() if entry['type'] == 'dio']
+    frame = pd.DataFrame({tag: df[needed[tag]] for tag in dio_tags})
+    frame[time_column] = df[time_column]
+    events, _ = detect_dio_events(frame, dio_tags, time_column)
+    if events.empty:
+        return pd.DataFrame(columns=columns)
+
+    # 첫 행 에지(초기 상태 NaN → 값)는 상태 변화가 아니므로 제외
+    events = events[events['position'] > 0]
+    events = events.sort_values('time', kind='stable')
+    times = events['time'].to_numpy()
+    gap = pd.Timedelta(startup_gap).to_timedelta64()
+    startup_ids = np.concatenate([[0], np.cumsum(np.diff(times) > gap)]) if len(times) else np.empty(0, dtype=int)
+    events = events.assign(startup=startup_ids)
+
+    # (기동, 태그)별 첫/마지막 에지와 개수를 한 번에 집계한 뒤 step으로 펼침
+    per_tag = events.groupby(['startup', 'tag'])['time'].agg(['min', 'max', 'count'])
+    step_of_tag = [(step, tag) for step, tags in window_tags.items() for tag in tags if tag in dio_tags]
+    if not step_of_tag:
+        return pd.DataFrame(columns=columns)
+    membership = pd.DataFrame(step_of_tag, columns=['step', 'tag'])
+    joined = per_tag.reset_index().merge(membership, on='tag')
+    windows = joined.groupby(['startup', 'step']).agg(start=('min', 'min'), end=('max', 'max'),
+                                                      events=('count', 'sum'), tags=('tag', 'nunique'))
+
+    available_steps = sorted(membership['step'].unique())
+    bounds = events.groupby('startup')['time'].agg(['min', 'max'])
+
+    rows = []
+    startup_number = 0
+    for startup, group in windows.groupby(level='startup'):
+        group = group.droplevel('startup')
+        if len(group) < min_steps:
+            continue
+        startup_number += 1
+
+        observed = group.sort_values(['start', 'end']).reset_index()
+        observed['observed_order'] = np.arange(1, len(observed) + 1)
+        observed['status'] = np.where(_sequence_mask(observed['step'].tolist()), 'ok', 'out_of_sequence')
+
+        missing = pd.DataFrame({'step': [s for s in available_steps if s not in group.index], 'status': 'missing'})
+        table = pd.concat([observed, missing], ignore_index=True) if len(missing) else observed
+        table['startup'] = startup_number
+        table['startup_start'] = bounds.loc[startup, 'min']
+        table['startup_end'] = bounds.loc[startup, 'max']
+        rows.append(table)
+
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    report = pd.concat(rows, ignore_index=True).sort_values(['startup', 'step'], ignore_index=True)
+    report['duration_s'] = (report['end'] - report['start']).dt.total_seconds()
+    return report[columns]
+
+
+def _report_cache_key(options):
+    options = {'version': REPORT_VERSION, **options}
+    return hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+def file_startup_steps(file_path, steps=None, exclusive=True, time_column='Date', startup_gap='6h', min_steps=3,
+                       cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+    """
+    export 파일 하나의 기동별 step 리포트 (step 태그 컬럼만 로드, 캐시 사용)
+
+    Returns:
+    - DataFrame (REPORT_COLUMNS), 로드 실패 시 None
+    """
+    options = {'steps': steps, 'exclusive': exclusive, 'time_column': time_column,
+               'startup_gap': startup_gap, 'min_steps': min_steps}
+    cache_path = file_cache_dir(file_path, cache_dir) / f'startup_{_report_cache_key(options)}.h5'
+
+    if cache_path.exists() and not refresh:
+        print(f"♻️  기동 리포트 캐시 사용: {cache_path}")
+        report = pd.read_hdf(cache_path, 'report')
+        report.insert(0, 'file', Path(file_path).name)
+        return report
+
+    window_tags = step_window_tags(steps, exclusive)
+    try:
+        schema = load_hdf5_schema(file_path)
+        tag_columns = build_tag_index(schema) or {col: col for col in schema.columns}
+        wanted = [tag_columns[tag] for tags in window_tags.values() for tag in tags if tag in tag_columns]
+        df = load_hdf5_columns(file_path, [time_column] + wanted)
+        # 태그 인덱스는 이미 만들었으므로 attrs를 비워 컬럼 연산마다 메타데이터가 복사되지 않게 함
+        df.attrs = {}
+    except Exception as e:
+        print(f"❌ 로드 실패: {file_path} ({e})")
+        return None
+
+    # 캐시는 파일 내용 기준이므로 파일명(file 컬럼)은 저장하지 않고 반환할 때 붙임
+    report = startup_steps(df, window_tags, tag_columns, time_column, startup_gap, min_steps)
+    report = report.astype({'step': 'int64', 'startup': 'int64', 'events': 'float64', 'tags': 'float64'})
+
+    write_cache_tables(cache_path, {'report': report})
+
+    print(f"✅ 기동 리포트: {Path(file_path).name} 기동 {report['startup'].nunique()}회")
+    report.insert(0, 'file', Path(file_path).name)
+    return report
+
+
+def _file_report(args):
+    file_path, options = args
+    return file_startup_steps(file_path, **options)
+
+
+def startup_report(directory, pattern='*.h5', workers=None, **options):
+    """
+    디렉터리의 모든 export 파일에 대한 기동별 step 리포트 (파일 단위 프로세스 병렬)
+
+    Parameters:
+    - directory: export 파일 디렉터리
+    - pattern: 파일 glob 패턴
+    - workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+    - options: file_startup_steps 옵션 (steps, exclusive, startup_gap, min_steps, cache_dir, refresh)
+
+    Returns:
+    - DataFrame (REPORT_COLUMNS): 파일 × 기동 × step 1행
+      status: 'ok' / 'out_of_sequence' (step_tags 순서에서 벗어난 시작) / 'missing' (동작 없음)
+    """
+    files = sorted(str(path) for path in Path(directory).glob(pattern))
+    if not files:
+        print(f"⚠️ 파일이 없습니다: {Path(directory) / pattern}")
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    # 파일 지문은 부모 프로세스에서 먼저 계산해 작업 프로세스는 기록된 값을 읽기만 하도록 함
+    for file_path in files:
+        file_cache_dir(file_path, options.get('cache_dir', DEFAULT_CACHE_DIR))
+
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    jobs = [(file_path, options) for file_path in files]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(_file_report, jobs))
+    else:
+        reports = [_file_report(job) for job in jobs]
+
+    reports = [report for report in reports if report is not None and not report.empty]
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    result = pd.concat(reports, ignore_index=True)
+    print(f"✅ 기동 리포트 통합: 파일 {len(reports)}개, 기동 {len(result.groupby(['file', 'startup']))}회")
+    return result
+
+
+def step_duration_table(report, stat='duration_s'):
+    """
+    기동별 step 소요 시간을 (기동 × step) 표로 정리
+
+    Returns:
+    - DataFrame (행: (file, startup), 열: step)
+    """
+    return report.pivot_table(index=['file', 'startup'], columns='step', values=stat, aggfunc='first')
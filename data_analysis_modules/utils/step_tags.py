@@ -737,4 +737,3 @@ step_tags[50] = [
 
 
 target_tags = step_tags[11]
-print(f"총 {len(target_tags)}개의 대상 태그가 설정되었습니다.")
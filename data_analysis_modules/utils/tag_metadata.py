@@ -0,0 +1,179 @@
+from collections import defaultdict
+
+
+# ============================================================================
+# 태그 → 실제 DataFrame 컬럼 해석 테이블
+# ============================================================================
+#
+# header_metadata의 tag_name/description 목록은 DataFrame 컬럼보다 하나 많다
+# (첫 항목이 인덱스 자리라 main.py는 [1:]로 잘라서 사용). 또 컬럼명은 description에서
+# 만들어지므로 같은 설명이 반복되면 pandas가 '설명', '설명.1', '설명.2'처럼 접미사를 붙인다.
+# 파일을 로드할 때 이 규칙대로 태그마다 정확한 컬럼을 한 번 계산해 두면
+# 이후 조회는 dict 한 번(O(1))이고 부분 문자열 비교로 엉뚱한 컬럼을 고르는 일이 없다.
+#
+# 파일 메타데이터(build_file_metadata)는 main.py의 metadata dict(tag_names/column_names)에
+# 해석 테이블, 태그 → 설명을 더한 dict로, 파일마다 한 번 만들어
+# extract_target_tags, 시각화, 검색(tag_search.TagSearchIndex.from_metadata)이 같이 사용한다.
+
+
+def _is_blank_tag(tag):
+    return not tag or tag == 'nan'
+
+
+def dedup_column_names(names):
+    """
+    read_csv/read_excel이 중복 컬럼명에 붙이는 '.1', '.2' 접미사를 같은 규칙으로 재현
+
+    Parameters:
+    - names: 원래 이름 리스트 (description)
+
+    Returns:
+    - list: pandas가 만드는 컬럼명 리스트 (예: ['A', 'A', 'A.1'] → ['A', 'A.2', 'A.1'],
+      원래 목록에 있는 이름은 건너뜀)
+    """
+    names = [str(name) for name in names]
+    original = set(names)
+    counts = defaultdict(int)
+    result = []
+    for name in names:
+        base = name
+        count = counts[name]
+        while count > 0:
+            counts[base] = count + 1
+            name = f'{base}.{count}'
+            count = count + 1 if name in original else counts[name]
+        result.append(name)
+        counts[name] = count + 1
+    return result
+
+
+def _header_offset(columns, tag_names, descriptions):
+    # header 목록과 컬럼의 위치 차이 (보통 1, 이미 [1:]로 자른 목록이면 0)
+    if len(tag_names) == len(columns) + 1:
+        return 1
+    if len(tag_names) == len(columns):
+        return 0
+    if descriptions is None:
+        return 1
+
+    # 길이가 어긋나면 설명(→ 컬럼명)이 더 많이 맞는 쪽을 선택
+    column_set = set(columns)
+
+    def matches(offset):
+        return sum(name in column_set for name in dedup_column_names(descriptions[offset:]))
+
+    return max((1, 0), key=matches)
+
+
+def build_tag_resolution(columns, tag_names, descriptions=None):
+    """
+    태그별 실제 컬럼 해석 테이블 생성 (파일 로드 시 1회)
+
+    description이 있으면 pandas 중복 접미사까지 재현한 컬럼명으로 찾고 (컬럼 순서/개수가
+    달라도 정확), 없으면 header 위치로 찾는다. header 앞의 인덱스 자리(+1)는 목록 길이로 판별한다.
+
+    Parameters:
+    - columns: DataFrame 컬럼 리스트
+    - tag_names: header_metadata['tag_name'] (원본 또는 [1:]로 자른 목록)
+    - descriptions: header_metadata['description'] (tag_names와 같은 기준, 없으면 None)
+
+    Returns:
+    - dict: {tag: [컬럼, ...]} header 순서, 중복 태그면 컬럼이 여러 개 (첫 번째가 기본)
+    """
+    columns = list(columns)
+    tag_names = list(tag_names)
+    descriptions = list(descriptions) if descriptions is not None else None
+    offset = _header_offset(columns, tag_names, descriptions)
+
+    column_set = set(columns)
+    expected = dedup_column_names(descriptions[offset:]) if descriptions is not None else None
+    if expected is not None and column_set.isdisjoint(expected):
+        # 컬럼명이 설명에서 만들어지지 않은 파일이면 위치로 찾음
+        expected = None
+
+    resolution = {}
+    for i, tag in enumerate(tag_names[offset:]):
+        tag = str(tag).strip()
+        if _is_blank_tag(tag):
+            continue
+        if expected is not None and i < len(expected) and expected[i] in column_set:
+            column = expected[i]
+        elif expected is None and i < len(columns):
+            column = columns[i]
+        else:
+            continue
+        resolution.setdefault(tag, []).append(column)
+
+    return resolution
+
+
+def tag_resolution(df):
+    """
+    df.attrs['header_metadata']로 태그 해석 테이블 생성 (메타데이터가 없으면 빈 dict)
+    """
+    header_meta = df.attrs.get('header_metadata', {}) if hasattr(df, 'attrs') else {}
+    if not isinstance(header_meta, dict) or 'tag_name' not in header_meta:
+        return {}
+    return build_tag_resolution(df.columns, header_meta['tag_name'], header_meta.get('description'))
+
+
+def _header_lists(header_meta):
+    # header_metadata에서 (tag_name, description) 목록 (없으면 빈 목록)
+    if not isinstance(header_meta, dict):
+        return [], None
+    return list(header_meta.get('tag_name', [])), header_meta.get('description')
+
+
+def build_file_metadata(columns, tag_names, descriptions=None):
+    """
+    파일 하나의 태그 메타데이터 생성 (파일 로드 시 1회)
+
+    Parameters:
+    - columns: DataFrame 컬럼 리스트
+    - tag_names: header_metadata['tag_name'] (원본 또는 [1:]로 자른 목록)
+    - descriptions: header_metadata['description'] (없으면 None)
+
+    Returns:
+    - dict:
+      tag_names, column_names : 컬럼 위치에 맞춘 header 목록 (main.py의 [1:] 목록과 같음)
+      tag_columns             : {tag: [컬럼, ...]} (build_tag_resolution)
+      descriptions            : {tag: 설명} (중복 태그는 첫 번째 설명)
+    """
+    tag_names = list(tag_names)
+    descriptions = list(descriptions) if descriptions is not None else None
+    offset = _header_offset(list(columns), tag_names, descriptions)
+
+    metadata = {
+        'tag_names': tag_names[offset:],
+        'column_names': descriptions[offset:] if descriptions is not None else [],
+        'tag_columns': build_tag_resolution(columns, tag_names, descriptions),
+    }
+    tag_descriptions(metadata)
+    return metadata
+
+
+def file_metadata(df):
+    """
+    df.attrs['header_metadata']로 파일 메타데이터 생성 (build_file_metadata)
+    """
+    header_meta = df.attrs.get('header_metadata', {}) if hasattr(df, 'attrs') else {}
+    tag_names, descriptions = _header_lists(header_meta)
+    return build_file_metadata(df.columns, tag_names, descriptions)
+
+
+def tag_descriptions(metadata):
+    """
+    메타데이터의 태그 → 설명 dict (없으면 tag_names/column_names로 한 번 만들어 metadata에 저장)
+
+    main.py처럼 tag_names/column_names만 있는 metadata dict도 받는다.
+    """
+    if 'descriptions' not in metadata:
+        descriptions = {}
+        for tag, desc in zip(metadata.get('tag_names', []), metadata.get('column_names', [])):
+            tag = str(tag).strip()
+            if _is_blank_tag(tag) or tag in descriptions:
+                continue
+            descriptions[tag] = str(desc)
+        metadata['descriptions'] = descriptions
+    return metadata['descriptions']
+
@@ -0,0 +1,278 @@
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+
+from .load_file import load_hdf5_schema
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir
+from .tag_metadata import file_metadata, tag_descriptions
+
+
+# ============================================================================
+# 태그명/설명 전문 검색 (역색인)
+# ============================================================================
+#
+# 문서 하나 = 태그 하나 (태그명 + header 설명). 토큰은
+#   태그명 : '-'로 나눈 세그먼트 (LIT, H2, 4611, SEL), 숫자+문자 세그먼트의 숫자부 (3704A → 3704),
+#            태그 전체, 호기 별칭 (H2 → hrsg, hrsg2), 계기/설비 코드 별칭 (LIT → level, transmitter)
+#   설명   : 영문/숫자 단어, 한글은 붙여 쓰기/조사와 무관하게 찾도록 2글자(bigram) 단위,
+#            'HRSG-2', 'HRSG #2' 같은 표기는 hrsg2로도
+# 검색어도 같은 규칙으로 토큰화한 뒤, 일치한 검색어 토큰 수 → idf 가중 점수 순으로 정렬한다.
+#   index = TagSearchIndex.from_files(['data_2024-08.h5', 'data_2024-09.h5'])
+#   index.search('LP drum level HRSG-2')
+# 파일별 색인은 파일 캐시 디렉터리(file_cache_dir)에 JSON으로 저장해 다음부터 바로 읽는다.
+
+SEARCH_VERSION = 1
+
+TAG_WEIGHT = 2.0      # 태그명 세그먼트 일치
+ALIAS_WEIGHT = 1.0    # 코드 별칭 일치
+TEXT_WEIGHT = 1.0     # 설명 일치
+
+# 호기 세그먼트 문자 → 설비명 (step_tags.py 주석의 'HRSG-1' = H1)
+UNIT_ALIASES = {'H': 'hrsg'}
+
+# ISA 계기 코드 첫 글자 (측정 변수)
+ISA_VARIABLES = {
+    'A': 'analysis', 'E': 'voltage', 'F': 'flow', 'I': 'current', 'J': 'power', 'L': 'level',
+    'P': 'pressure', 'S': 'speed', 'T': 'temperature', 'V': 'vibration', 'W': 'weight', 'Z': 'position',
+}
+
+# ISA 계기 코드 나머지 글자 (기능)
+ISA_FUNCTIONS = {
+    'T': ('transmitter',), 'IT': ('indicator', 'transmitter'), 'I': ('indicator',),
+    'IC': ('indicator', 'controller'), 'C': ('controller',), 'CV': ('control', 'valve'),
+    'V': ('valve',), 'S': ('switch',), 'DIS': ('differential', 'indicator', 'switch'),
+}
+
+# 설비 코드 (step_tags.py 주석 기준)
+EQUIPMENT_ALIASES = {
+    'MOV': ('motor', 'valve'), 'SOV': ('solenoid', 'valve'),
+    'DWTP': ('demineralized', 'water', 'treatment', 'plant'),
+    'HIFP': ('hrsg', 'initial', 'filling', 'pump'),
+    'MCWP': ('main', 'cooling', 'water', 'pump'),
+    'BDNP': ('blowdown', 'pump'),
+}
+
+_UNIT_SEGMENT = re.compile(r'^([A-Z])(\d)$')
+_CODE_NUMBER = re.compile(r'^(\d+)[A-Z]+\d*$')
+_WORD = re.compile(r'[a-z0-9]+')
+_HANGUL = re.compile(r'[가-힣]+')
+_JOINED_UNIT = re.compile(r'([a-z]+)\s*[-#]?\s*(\d{1,2})(?![0-9])')
+
+
+def text_tokens(text):
+    """
+    설명/검색어 문자열 토큰 (영문/숫자 단어, 한글 2글자 단위, 'HRSG-2' → hrsg2)
+    """
+    text = str(text).lower()
+    tokens = _WORD.findall(text)
+    for run in _HANGUL.findall(text):
+        tokens.extend([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+    tokens.extend(name + number.lstrip('0') for name, number in _JOINED_UNIT.findall(text))
+    return tokens
+
+
+def tag_tokens(tag):
+    """
+    태그명 토큰
+
+    Returns:
+    - list of (토큰, 가중치): 세그먼트는 TAG_WEIGHT, 별칭은 ALIAS_WEIGHT
+    """
+    tag = str(tag).strip().upper()
+    segments = [segment for segment in tag.split('-') if segment]
+    tokens = [(tag.lower(), TAG_WEIGHT)]
+    for position, segment in enumerate(segments):
+        tokens.append((segment.lower(), TAG_WEIGHT))
+
+        match = _CODE_NUMBER.match(segment)
+        if match:
+            tokens.append((match.group(1), TAG_WEIGHT))
+
+        match = _UNIT_SEGMENT.match(segment)
+        if match and position > 0 and match.group(1) in UNIT_ALIASES:
+            name = UNIT_ALIASES[match.group(1)]
+            tokens.extend([(name, ALIAS_WEIGHT), (name + match.group(2), ALIAS_WEIGHT)])
+
+        if position == 0:
+            aliases = EQUIPMENT_ALIASES.get(segment, ())
+            if not aliases and segment[:1] in ISA_VARIABLES and segment[1:] in ISA_FUNCTIONS:
+                aliases = (ISA_VARIABLES[segment[0]],) + ISA_FUNCTIONS[segment[1:]]
+            tokens.extend((alias, ALIAS_WEIGHT) for alias in aliases)
+    return tokens
+
+
+def query_tokens(query):
+    """
+    검색어 토큰 (태그처럼 '-'가 들어간 단어는 태그 규칙도 적용, 중복 제거)
+    """
+    tokens = text_tokens(query)
+    for term in str(query).split():
+        if '-' in term.strip('-'):
+            tokens.extend(token for token, _ in tag_tokens(term))
+    return list(dict.fromkeys(tokens))
+
+
+def document_tokens(tag, description):
+    """
+    태그 하나의 {토큰: 가중치} (같은 토큰은 가장 큰 가중치)
+    """
+    weights = {}
+    for token, weight in tag_tokens(tag) + [(token, TEXT_WEIGHT) for token in text_tokens(description)]:
+        if weight > weights.get(token, 0.0):
+            weights[token] = weight
+    return weights
+
+
+class TagSearchIndex:
+    """
+    태그명/설명 역색인 (여러 파일의 태그를 합쳐 검색)
+
+    Parameters:
+    - entries: {tag: {'description': 설명, 'files': [파일 라벨, ...]}}
+    """
+
+    def __init__(self, entries=None):
+        self.tags = []
+        self.descriptions = []
+        self.files = []
+        self.postings = defaultdict(dict)
+        self._positions = {}
+        for tag, entry in (entries or {}).items():
+            self.add(tag, entry.get('description', ''), entry.get('files', []))
+
+    def add(self, tag, description='', files=(), tokens=None):
+        """
+        태그 하나 추가 (이미 있으면 파일 라벨만 추가, 설명은 처음 것 유지)
+
+        tokens: 미리 계산한 {토큰: 가중치} (None이면 document_tokens로 계산)
+        """
+        position = self._positions.get(tag)
+        if position is None:
+            position = self._positions[tag] = len(self.tags)
+            self.tags.append(tag)
+            self.descriptions.append(str(description))
+            self.files.append([])
+            for token, weight in (tokens if tokens is not None else document_tokens(tag, description)).items():
+                self.postings[token][position] = weight
+        for label in files:
+            if label not in self.files[position]:
+                self.files[position].append(label)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __contains__(self, tag):
+        return tag in self._positions
+
+    @classmethod
+    def from_metadata(cls, metadata, label='', tags=None):
+        """
+        파일 메타데이터(file_metadata 결과 또는 tag_names/column_names dict)로 생성
+
+        Parameters:
+        - label: 결과 'files'에 표시할 파일 라벨
+        - tags: 색인할 태그 (None이면 header의 전체 태그)
+        """
+        descriptions = tag_descriptions(metadata)
+        index = cls()
+        for tag in (descriptions if tags is None else tags):
+            index.add(tag, descriptions.get(tag, ''), [label] if label else [])
+        return index
+
+    @classmethod
+    def from_file(cls, file_path, label=None, cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+        """
+        export된 HDF5 파일의 색인 (데이터는 읽지 않고 header만, 파일 캐시에 저장/재사용)
+        """
+        label = label if label is not None else Path(file_path).stem
+        cache_path = file_cache_dir(file_path, cache_dir) / f'search_v{SEARCH_VERSION}.json'
+        if cache_path.exists() and not refresh:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return cls.from_dict(json.load(f), label)
+            except (OSError, ValueError, KeyError):
+                pass
+
+        index = cls.from_metadata(file_metadata(load_hdf5_schema(file_path)))
+        tmp_path = cache_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+        for files in index.files:
+            files.append(label)
+        return index
+
+    @classmethod
+    def from_files(cls, file_paths, labels=None, cache_dir=DEFAULT_CACHE_DIR, refresh=False):
+        """
+        여러 파일의 색인을 합친 색인 (태그가 같으면 하나로, 'files'에 파일 라벨 목록)
+        """
+        labels = labels or [Path(path).stem for path in file_paths]
+        merged = cls()
+        for path, label in zip(file_paths, labels):
+            merged.merge(cls.from_file(path, label, cache_dir, refresh))
+        return merged
+
+    def merge(self, other):
+        """
+        다른 색인의 태그를 추가 (토큰은 다시 계산하지 않음)
+        """
+        tokens = defaultdict(dict)
+        for token, posting in other.postings.items():
+            for position, weight in posting.items():
+                tokens[position][token] = weight
+        for position, tag in enumerate(other.tags):
+            self.add(tag, other.descriptions[position], other.files[position], tokens[position])
+        return self
+
+    def to_dict(self):
+        return {'version': SEARCH_VERSION, 'tags': self.tags, 'descriptions': self.descriptions,
+                'postings': {token: [[position, weight] for position, weight in posting.items()]
+                             for token, posting in self.postings.items()}}
+
+    @classmethod
+    def from_dict(cls, data, label=''):
+        if data.get('version') != SEARCH_VERSION:
+            raise KeyError('version')
+        index = cls()
+        index.tags = list(data['tags'])
+        index.descriptions = list(data['descriptions'])
+        index.files = [[label] if label else [] for _ in index.tags]
+        index._positions = {tag: position for position, tag in enumerate(index.tags)}
+        for token, posting in data['postings'].items():
+            index.postings[token] = {position: weight for position, weight in posting}
+        return index
+
+    def search(self, query, limit=20):
+        """
+        검색어와 가장 잘 맞는 태그 (일치한 검색어 토큰 수, idf 가중 점수 순)
+
+        Parameters:
+        - query: 검색어 (예: 'LP drum level HRSG-2', '드럼 수위', 'LIT-H2')
+        - limit: 최대 결과 수
+
+        Returns:
+        - list of dict: {'tag', 'description', 'score', 'matched', 'files'}
+          matched는 일치한 검색어 토큰 수 / 전체 검색어 토큰 수
+        """
+        tokens = query_tokens(query)
+        scores, hits = defaultdict(float), defaultdict(int)
+        n_docs = max(len(self.tags), 1)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1.0 + n_docs / len(posting))
+            for position, weight in posting.items():
+                scores[position] += idf * weight
+                hits[position] += 1
+
+        ranked = sorted(scores, key=lambda position: (-hits[position], -scores[position], position))[:limit]
+        return [{'tag': self.tags[position], 'description': self.descriptions[position],
+                 'score': round(scores[position], 3), 'matched': f'{hits[position]}/{len(tokens)}',
+                 'files': list(self.files[position])}
+                for position in ranked]
@@ -0,0 +1,314 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .load_file import load_hdf5_schema, load_hdf5_columns
+from .tag_metadata import file_metadata
+from .file_cache import DEFAULT_CACHE_DIR, file_cache_dir
+
+
+# ============================================================================
+# 메모리 예산 태그 저장소 (LRU, 내보낸 컬럼은 메모리 매핑으로 다시 읽기)
+# ============================================================================
+#
+# 파일 전체를 load_hdf5_with_metadata로 올리는 대신, 요청한 태그 컬럼만 읽고
+# 최근에 쓴 컬럼만 budget_bytes 안에서 메모리에 남긴다 (가장 오래 안 쓴 컬럼부터 내보냄).
+# 내보낸 컬럼은 파일 캐시(.cache/files/<지문>/columns/)에 .npy로 한 번 써 두고
+# 다시 필요하면 np.load(mmap_mode='r')로 매핑하므로 HDF5를 다시 읽지 않는다.
+# 문자열(DIO) 컬럼은 pd.factorize 코드(.npy) + 고유값 목록(.json)으로 저장한다.
+#   store = TagStore('data_2024-08.h5', budget_bytes='1GB')
+#   df = store.frame(step_tags[18])        # 컬럼=태그명 + 시간 컬럼
+#   store.print_stats()                    # 적중/실패/내보냄 횟수, 사용 메모리
+
+DEFAULT_BUDGET_BYTES = 512 * 1024 ** 2
+
+_BYTE_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4}
+
+
+def parse_bytes(value):
+    """
+    메모리 크기 해석 (정수 또는 '512MB', '1.5GB' 같은 문자열)
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?B?)\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"메모리 크기를 해석할 수 없습니다: {value}")
+    return int(float(match.group(1)) * _BYTE_UNITS[match.group(2)])
+
+
+def _column_bytes(series, sample=64):
+    """
+    컬럼 메모리 크기 (문자열 컬럼은 포인터 + 고르게 뽑은 표본의 평균 객체 크기로 추정,
+    memory_usage(deep=True)는 모든 문자열을 훑어 느림)
+    """
+    if series.dtype.kind in 'fiubmM':
+        return int(series.memory_usage(index=False))
+    n = len(series)
+    if n == 0:
+        return 0
+    values = series.to_numpy(dtype=object, na_value=None)[np.linspace(0, n - 1, min(n, sample)).astype(np.int64)]
+    return int(n * (8 + np.mean([sys.getsizeof(value) for value in values])))
+
+
+class TagStore:
+    """
+    메모리 예산 안에서 태그 컬럼을 LRU로 보관하는 파일 단위 저장소
+
+    Parameters:
+    - file_path: export된 HDF5 파일
+    - budget_bytes: 메모리 예산 (정수 또는 '1GB' 같은 문자열, 시간 컬럼 포함)
+    - time_column: 시간 컬럼명 (처음 쓸 때 읽고 내보내지 않음)
+    - cache_dir: 캐시 루트 (내보낸 컬럼 .npy 저장 위치)
+    - spill: True면 내보내는 컬럼을 .npy로 저장해 다음에 메모리 매핑으로 읽음
+    """
+
+    def __init__(self, file_path, budget_bytes=DEFAULT_BUDGET_BYTES, time_column='Date',
+                 cache_dir=DEFAULT_CACHE_DIR, spill=True):
+        self.file_path = file_path
+        self.budget_bytes = parse_bytes(budget_bytes)
+        self.time_column = time_column
+        self.spill = spill
+        self.spill_dir = file_cache_dir(file_path, cache_dir) / 'columns' if spill else None
+
+        schema = load_hdf5_schema(file_path)
+        self.metadata = file_metadata(schema)
+        self.tag_columns = {tag: columns[0] for tag, columns in self.metadata['tag_columns'].items()
+                            if columns[0] != time_column}
+        self.descriptions = self.metadata['descriptions']
+
+        self._columns = OrderedDict()   # tag → Series (마지막이 가장 최근)
+        self._bytes = {}
+        self._time = None
+        self._index = None              # 모든 컬럼이 같이 쓰는 행 인덱스 (컬럼마다 따로 두지 않음)
+        self.resident_bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'hdf5_loads': 0, 'mmap_loads': 0,
+                       'spills': 0, 'peak_bytes': 0}
+
+    def __contains__(self, tag):
+        return tag in self.tag_columns
+
+    def __getitem__(self, tag):
+        return self.get(tag)
+
+    @property
+    def tags(self):
+        return list(self.tag_columns)
+
+    @property
+    def resident_tags(self):
+        return list(self._columns)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def get(self, tag):
+        """
+        태그 컬럼 하나 (Series, name=태그명)
+        """
+        return self._fetch([tag])[tag]
+
+    def times(self):
+        """
+        시간 컬럼 (처음 한 번 읽고 계속 보관)
+        """
+        if self._time is None:
+            df = load_hdf5_columns(self.file_path, [self.time_column])
+            df.attrs = {}
+            self._time = self._shared(df[self.time_column], self.time_column)
+            self._stats['hdf5_loads'] += 1
+            self._add_bytes(_column_bytes(self._time))
+        return self._time
+
+    def frame(self, tags, include_time=True):
+        """
+        여러 태그를 컬럼=태그명 DataFrame으로 (없는 컬럼은 HDF5에서 한 번에 읽음)
+
+        요청한 태그 합계가 예산보다 크면 이번 요청 동안은 예산을 넘겨 보관하고 경고한다.
+        """
+        tags = [tag for tag in dict.fromkeys(tags) if tag in self.tag_columns]
+        columns = self._fetch(tags)
+        frame = pd.DataFrame({tag: columns[tag] for tag in tags})
+        if include_time:
+            frame[self.time_column] = self.times()
+        return frame
+
+    def _fetch(self, tags):
+        unknown = [tag for tag in tags if tag not in self.tag_columns]
+        if unknown:
+            raise KeyError(f"파일에 없는 태그: {unknown}")
+
+        result, missing = {}, []
+        for tag in tags:
+            if tag in self._columns:
+                self._columns.move_to_end(tag)
+                self._stats['hits'] += 1
+                result[tag] = self._columns[tag]
+            else:
+                self._stats['misses'] += 1
+                missing.append(tag)
+
+        from_hdf5 = []
+        for tag in missing:
+            series = self._load_spilled(tag)
+            if series is None:
+                from_hdf5.append(tag)
+            else:
+                self._stats['mmap_loads'] += 1
+                result[tag] = self._keep(tag, series)
+
+        if from_hdf5:
+            df = load_hdf5_columns(self.file_path, [self.tag_columns[tag] for tag in from_hdf5])
+            df.attrs = {}   # 컬럼을 꺼낼 때마다 메타데이터가 복사되지 않도록
+            self._stats['hdf5_loads'] += 1
+            for tag in from_hdf5:
+                result[tag] = self._keep(tag, df[self.tag_columns[tag]])
+
+        self._evict(protect=set(tags))
+        return result
+
+    # ------------------------------------------------------------------
+    # 메모리 관리
+    # ------------------------------------------------------------------
+
+    def _add_bytes(self, nbytes):
+        self.resident_bytes += nbytes
+        self._stats['peak_bytes'] = max(self._stats['peak_bytes'], self.resident_bytes)
+
+    def _shared(self, series, name):
+        # 컬럼마다 읽어 온 인덱스(int64) 대신 저장소 공용 인덱스를 붙임
+        # (기본 0..n-1 인덱스면 RangeIndex, 아니면 처음 읽은 인덱스를 한 번만 보관하고 예산에 포함)
+        if self._index is None:
+            index = series.index
+            if index.equals(pd.RangeIndex(len(index))):
+                self._index = pd.RangeIndex(len(index))
+            else:
+                self._index = index
+                self._add_bytes(int(index.memory_usage()))
+        return pd.Series(series.array, index=self._index, name=name, copy=False)
+
+    def _keep(self, tag, series):
+        series = self._shared(series, tag)
+        self._columns[tag] = series
+        self._bytes[tag] = _column_bytes(series)
+        self._add_bytes(self._bytes[tag])
+        return series
+
+    def _evict(self, protect=()):
+        # 예산을 넘으면 가장 오래 안 쓴 컬럼부터 내보냄 (이번 요청 태그는 유지)
+        for tag in list(self._columns):
+            if self.resident_bytes <= self.budget_bytes:
+                return
+            if tag in protect:
+                continue
+            series = self._columns.pop(tag)
+            self.resident_bytes -= self._bytes.pop(tag)
+            self._stats['evictions'] += 1
+            if self.spill:
+                self._spill(tag, series)
+
+        if self.resident_bytes > self.budget_bytes:
+            print(f"⚠️  요청한 태그만으로 예산 초과: {self.resident_bytes / 1024 ** 2:.1f}MB "
+                  f"> {self.budget_bytes / 1024 ** 2:.1f}MB")
+
+    def clear(self):
+        """
+        보관 중인 컬럼을 모두 내보냄 (통계는 유지)
+        """
+        for tag, series in list(self._columns.items()):
+            if self.spill:
+                self._spill(tag, series)
+        self._columns.clear()
+        self._bytes.clear()
+        self.resident_bytes = _column_bytes(self._time) if self._time is not None else 0
+        if self._index is not None and not isinstance(self._index, pd.RangeIndex):
+            self.resident_bytes += int(self._index.memory_usage())
+
+    # ------------------------------------------------------------------
+    # 내보낸 컬럼 (.npy, 메모리 매핑)
+    # ------------------------------------------------------------------
+
+    def _spill_stem(self, tag):
+        return self.spill_dir / hashlib.sha1(tag.encode('utf-8')).hexdigest()[:16]
+
+    def _spill(self, tag, series):
+        stem = self._spill_stem(tag)
+        if stem.with_suffix('.json').exists():
+            return
+
+        if series.dtype.kind in 'fiub':
+            values, meta = series.to_numpy(), {'encoding': 'plain'}
+        else:
+            codes, uniques = pd.factorize(series)
+            if not all(isinstance(value, str) for value in uniques):
+                return
+            values = codes.astype(np.int32)
+            meta = {'encoding': 'codes', 'uniques': list(uniques)}
+        meta.update(tag=tag, dtype=str(series.dtype))
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        tmp_values = stem.with_name(f'{stem.name}.{pid}.tmp.npy')
+        tmp_meta = stem.with_name(f'{stem.name}.{pid}.tmp.json')
+        np.save(tmp_values, values)
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        # 배열을 먼저 옮기고 메타를 나중에 옮겨야 메타가 있으면 배열도 완전함
+        os.replace(tmp_values, stem.with_suffix('.npy'))
+        os.replace(tmp_meta, stem.with_suffix('.json'))
+        self._stats['spills'] += 1
+
+    def _load_spilled(self, tag):
+        if not self.spill:
+            return None
+        stem = self._spill_stem(tag)
+        try:
+            with open(stem.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            values = np.load(stem.with_suffix('.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if meta.get('tag') != tag:
+            return None
+
+        if meta['encoding'] == 'plain':
+            return pd.Series(values, name=tag, copy=False)
+        table = np.array(meta['uniques'] + [np.nan], dtype=object)   # 코드 -1(결측) → NaN
+        return pd.Series(table[values], name=tag, dtype=meta['dtype'])
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        """
+        적중/실패/내보냄 통계
+
+        Returns:
+        - dict: hits, misses, hit_rate, evictions, hdf5_loads (HDF5 읽기 호출 수),
+          mmap_loads (내보낸 컬럼 매핑 수), spills (.npy 저장 수), resident_bytes, peak_bytes,
+          budget_bytes, resident_tags
+        """
+        requests = self._stats['hits'] + self._stats['misses']
+        return {**self._stats, 'hit_rate': self._stats['hits'] / requests if requests else 0.0,
+                'resident_bytes': self.resident_bytes, 'budget_bytes': self.budget_bytes,
+                'resident_tags': len(self._columns)}
+
+    def print_stats(self):
+        stats = self.stats()
+        mb = 1024 ** 2
+        print(f"\n{'='*60}")
+        print(f"태그 저장소: {self.file_path}")
+        print(f"{'='*60}")
+        print(f"  적중 {stats['hits']} / 실패 {stats['misses']} (적중률 {stats['hit_rate']:.1%})")
+        print(f"  내보냄 {stats['evictions']}회, .npy 저장 {stats['spills']}회")
+        print(f"  다시 읽기: HDF5 {stats['hdf5_loads']}회, 메모리 매핑 {stats['mmap_loads']}회")
+        print(f"  메모리: 현재 {stats['resident_bytes'] / mb:.1f}MB, 최대 {stats['peak_bytes'] / mb:.1f}MB, "
+              f"예산 {stats['budget_bytes'] / mb:.1f}MB (컬럼 {stats['resident_tags']}개)")
@@ -0,0 +1,212 @@
+import re
+
+import pandas as pd
+
+from .local_store import build_tag_index
+from .tag_metadata import file_metadata
+from .data_extraction import classify_signals_with_order
+
+
+# ============================================================================
+# 호기 공통 태그 템플릿 (H1/H2/H3, G1/G2/G3 비교)
+# ============================================================================
+#
+# 두 번째 세그먼트가 '문자+숫자'(H1, G2, ...)인 태그는 숫자를 {u}로 바꾼 템플릿으로 묶는다.
+#   MOV-H1-4623-OF, MOV-H2-4623-OF, MOV-H3-4623-OF → MOV-H{u}-4623-OF
+# 호기별 DataFrame의 컬럼을 템플릿명으로 맞춰 두면, plot_*_signals_ordered의
+# 다중 DataFrame 기능이 그대로 '템플릿당 서브플롯 1개, 호기당 선 1개'가 된다.
+
+_UNIT_SEGMENT = re.compile(r'^([A-Z])(\d)$')
+
+
+def split_unit(tag):
+    """
+    태그를 (호기, 템플릿)으로 분리
+
+    'MOV-H2-4623-OF' → ('H2', 'MOV-H{u}-4623-OF'), 호기 세그먼트가 없으면 ('', 태그)
+    """
+    parts = str(tag).split('-')
+    if len(parts) >= 2:
+        match = _UNIT_SEGMENT.match(parts[1])
+        if match:
+            return parts[1], '-'.join([parts[0], match.group(1) + '{u}'] + parts[2:])
+    return '', str(tag)
+
+
+def templates_from_tags(tags):
+    """
+    태그 리스트를 템플릿 리스트로 묶기 (처음 나온 순서 유지, 호기 없는 태그는 그대로)
+    """
+    return list(dict.fromkeys(split_unit(tag)[1] for tag in tags))
+
+
+def build_template_index(tag_index):
+    """
+    태그 인덱스에서 템플릿별 호기 → 태그 매핑 생성 (태그 목록 1회 순회)
+
+    Parameters:
+    - tag_index: {tag: 컬럼명} (build_tag_index 결과) 또는 태그 리스트
+
+    Returns:
+    - {템플릿: {호기: 태그}} (호기 세그먼트가 있는 태그만)
+    """
+    index = {}
+    for tag in tag_index:
+        unit, template = split_unit(tag)
+        if unit:
+            index.setdefault(template, {})[unit] = tag
+    return index
+
+
+def expand_template(template, template_index, units=None):
+    """
+    템플릿을 호기별 태그로 전개
+
+    Parameters:
+    - template: 'MOV-H{u}-4623-OF' 형식 (호기 없는 태그면 빈 dict)
+    - template_index: build_template_index 결과
+    - units: 사용할 호기 리스트 (None이면 데이터에 있는 전체)
+
+    Returns:
+    - {호기: 태그} (호기명 순서)
+    """
+    by_unit = template_index.get(template, {})
+    if units is not None:
+        by_unit = {unit: tag for unit, tag in by_unit.items() if unit in units}
+    return dict(sorted(by_unit.items()))
+
+
+def build_unit_frames(df, templates, tag_columns=None, time_column='Date', units=None):
+    """
+    템플릿들의 호기별 데이터를 한 번에 읽어 호기별 DataFrame 생성
+
+    필요한 모든 호기/템플릿 컬럼을 한 번의 컬럼 선택으로 가져온 뒤,
+    호기마다 컬럼명을 템플릿명으로 바꾼 DataFrame을 만든다.
+
+    Parameters:
+    - df: 원본 DataFrame (load_hdf5_with_metadata 결과)
+    - templates: 템플릿 리스트 (호기 없는 항목은 무시)
+    - tag_columns: {tag: 컬럼명} (None이면 build_tag_index(df))
+    - time_column: 시간 컬럼명
+    - units: 사용할 호기 리스트 (None이면 데이터에 있는 전체)
+
+    Returns:
+    - unit_frames: 호기별 DataFrame 리스트 (컬럼=템플릿명 + 시간 컬럼)
+    - unit_labels: 호기 라벨 리스트 (예: ['H1', 'H2', 'H3'])
+    - unit_tags: {호기: {템플릿: 태그}}
+    """
+    if tag_columns is None:
+        tag_columns = build_tag_index(df)
+    template_index = build_template_index(tag_columns)
+
+    unit_tags = {}
+    for template in templates:
+        for unit, tag in expand_template(template, template_index, units).items():
+            if tag_columns.get(tag) in df.columns:
+                unit_tags.setdefault(unit, {})[template] = tag
+
+    unit_labels = sorted(unit_tags)
+    if not unit_labels:
+        return [], [], {}
+
+    # 모든 호기 컬럼을 한 번에 선택 (메타데이터 복사를 피하려고 attrs는 비움)
+    columns = list(dict.fromkeys(tag_columns[tag] for unit in unit_labels for tag in unit_tags[unit].values()))
+    if time_column in df.columns:
+        columns.append(time_column)
+    block = df[columns]
+    block.attrs = {}
+
+    unit_frames = []
+    for unit in unit_labels:
+        data = {template: block[tag_columns[tag]] for template, tag in unit_tags[unit].items()}
+        if time_column in block.columns:
+            data[time_column] = block[time_column]
+        unit_frames.append(pd.DataFrame(data))
+
+    return unit_frames, unit_labels, unit_tags
+
+
+def unit_pyramids(pyramid, unit_labels, unit_tags):
+    """
+    태그 기준 피라미드를 호기별(컬럼=템플릿명) 피라미드 리스트로 변환
+
+    Parameters:
+    - pyramid: build_pyramid 결과 (태그 기준)
+    - unit_labels, unit_tags: build_unit_frames 결과
+    """
+    if not pyramid:
+        return None
+
+    result = []
+    for unit in unit_labels:
+        mapping = {tag: template for template, tag in unit_tags[unit].items()}
+        unit_pyramid = {}
+        for freq, level in pyramid.items():
+            unit_level = {}
+            for stat, frame in level.items():
+                if isinstance(frame, pd.DataFrame):
+                    columns = [tag for tag in mapping if tag in frame.columns]
+                    frame = frame[columns].rename(columns=mapping)
+                unit_level[stat] = frame
+            unit_pyramid[freq] = unit_level
+        result.append(unit_pyramid)
+    return result
+
+
+def visualize_unit_comparison(df, tags, time_column='Date', tag_columns=None, units=None,
+                              pyramid=None, time_range=None, backend='subplots', dpi=None):
+    """
+    호기 간 비교 가시화 (템플릿당 서브플롯 1개, 호기별로 선을 겹쳐 그림)
+
+    Parameters:
+    - df: 원본 DataFrame (load_hdf5_with_metadata 결과)
+    - tags: 템플릿 또는 태그 리스트 (step_tags 등, 호기별 태그는 템플릿으로 묶음)
+    - time_column: 시간 컬럼명
+    - tag_columns: {tag: 컬럼명} (None이면 build_tag_index(df))
+    - units: 비교할 호기 리스트 (None이면 데이터에 있는 전체)
+    - pyramid: 태그 기준 다중 해상도 요약 (build_pyramid 결과)
+    - time_range: 표시 시간 구간 (start, end)
+    - backend: 'subplots', 'stacked' 또는 'density'
+    - dpi: 저장할 해상도 (요약 레벨 선택 기준, None이면 그림 기본 dpi)
+
+    Returns:
+    - dio_fig, analog_fig
+    """
+    templates = [template for template in templates_from_tags(tags) if '{u}' in template]
+    unit_frames, unit_labels, unit_tags = build_unit_frames(df, templates, tag_columns, time_column, units)
+
+    if not unit_frames:
+        print("호기별로 비교할 태그가 없습니다.")
+        return None, None
+
+    # 템플릿 설명은 처음 찾은 호기 태그의 설명 사용
+    descriptions = file_metadata(df)['descriptions']
+    tag_descriptions = {}
+    for unit in unit_labels:
+        for template, tag in unit_tags[unit].items():
+            if template not in tag_descriptions and tag in descriptions:
+                tag_descriptions[template] = descriptions[tag]
+
+    # 신호 종류는 템플릿마다 데이터가 있는 첫 호기 기준으로 판별
+    present = [t for t in templates if any(t in unit_tags[unit] for unit in unit_labels)]
+    dio_signals, analog_signals = [], []
+    for template in present:
+        frame = next(f for f, unit in zip(unit_frames, unit_labels) if template in unit_tags[unit])
+        dio, _ = classify_signals_with_order(frame, [template], [template])
+        (dio_signals if dio else analog_signals).append(template)
+
+    print(f"호기 비교: 템플릿 {len(present)}개 × 호기 {unit_labels}")
+    print(f"DIO 신호: {len(dio_signals)}개, 아날로그 신호: {len(analog_signals)}개")
+
+    # 가시화 모듈은 그림을 그릴 때만 로드 (kpi 등 분석 경로에서 matplotlib을 피함)
+    from .visualization import backend_plotters
+
+    plot_dio, plot_analog = backend_plotters(backend)
+
+    pyramids = unit_pyramids(pyramid, unit_labels, unit_tags)
+    dio_fig = plot_dio(unit_frames, dio_signals, time_column, tag_descriptions, unit_labels,
+                       pyramids=pyramids, time_range=time_range, dpi=dpi)
+    analog_fig = plot_analog(unit_frames, analog_signals, time_column, tag_descriptions, unit_labels,
+                             pyramids=pyramids, time_range=time_range, dpi=dpi)
+
+    return dio_fig, analog_fig
@@ -1,31 +1,71 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from .data_extraction import extract_target_tags, classify_signals_with_order
+from .tag_metadata import tag_descriptions
+from .pyramid import pyramid_window
 
+# matplotlib은 import 비용이 커서(약 0.5초) 그림을 그리는 함수 안에서 처음 쓸 때 로드한다.
+# 이 모듈을 import만 하는 분석/CLI 경로는 matplotlib을 로드하지 않는다.
 
-def visualize_target_tags_multi_ordered(dfs, metadatas, target_tags, time_column='Date', df_labels=None):
+
+def setup_korean_font():
+    """
+    matplotlib 한글 폰트 설정 (Windows: Malgun Gothic, Mac/Linux: AppleGothic)
+
+    그림을 그리기 전에 한 번 호출한다.
+    """
+    import platform
+    import matplotlib.pyplot as plt
+
+    plt.rcParams['font.family'] = 'DejaVu Sans'
+    try:
+        if platform.system() == 'Windows':
+            plt.rcParams['font.family'] = 'Malgun Gothic'
+        else:
+            plt.rcParams['font.family'] = 'AppleGothic'
+    except Exception:
+        # 폰트 설정 실패시 경고 무시
+        import warnings
+        warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
+
+    plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
+
+
+def visualize_target_tags_multi_ordered(dfs, metadatas, target_tags, time_column='Date', df_labels=None,
+                                        pyramids=None, time_range=None, backend='subplots', dpi=None):
     """
     여러 DataFrame의 지정된 태그들을 DIO와 아날로그로 분류하여 가시화 (순서 유지)
 
     Parameters:
     - dfs: DataFrame 리스트 또는 단일 DataFrame
-    - metadatas: 메타데이터 리스트 또는 단일 메타데이터
+    - metadatas: 메타데이터 리스트 또는 단일 메타데이터 (file_metadata 결과 또는 tag_names/column_names dict,
+                 태그 설명은 메타데이터마다 한 번만 만들어 재사용)
     - target_tags: 대상 태그 리스트 (순서 중요)
     - time_column: 시간 컬럼명
     - df_labels: DataFrame 라벨 리스트
+    - pyramids: DataFrame별 다중 해상도 요약 리스트 (build_pyramid 결과, 태그 기준)
+    - time_range: 표시 시간 구간 (start, end)
+    - backend: 'subplots' (신호별 서브플롯), 'stacked' (한 축에 오프셋으로 쌓은 빠른 렌더링)
+               또는 'density' (아날로그를 픽셀 밀도 이미지로, DIO는 stacked)
+    - dpi: 저장할 해상도 (요약 레벨/밀도 이미지 폭 기준, None이면 그림 기본 dpi)
     """
     # 단일 입력인 경우 리스트로 변환
     if isinstance(dfs, pd.DataFrame):
         dfs = [dfs]
     if isinstance(metadatas, dict):
         metadatas = [metadatas]
+    if isinstance(pyramids, dict):
+        pyramids = [pyramids]
 
     # DataFrame 라벨 설정
     if df_labels is None:
         df_labels = [f'DF{i+1}' for i in range(len(dfs))]
 
     # 각 DataFrame에서 태그 추출 및 병합
+    # 태그가 추출된 DataFrame만 남기므로 라벨/피라미드도 같은 위치로 함께 남김
     all_extracted_dfs = []
+    all_labels = []
+    all_pyramids = []
     all_tag_descriptions = {}
 
     for df_idx, (df, metadata) in enumerate(zip(dfs, metadatas)):
@@ -37,17 +77,13 @@ def visualize_target_tags_multi_ordered(dfs, metadatas, target_tags, time_column
             if time_column in df.columns:
                 extracted_df[time_column] = df[time_column]
             all_extracted_dfs.append(extracted_df)
+            all_labels.append(df_labels[df_idx])
+            all_pyramids.append(pyramids[df_idx] if pyramids and df_idx < len(pyramids) else None)
 
-            # 태그 설명 딕셔너리 생성 (첫 번째 DataFrame 기준)
-            if df_idx == 0:
-                tag_names = metadata['tag_names']
-                column_names = metadata['column_names']
-
-                for tag in found_tags:
-                    for i, meta_tag in enumerate(tag_names):
-                        if meta_tag == tag and i < len(column_names):
-                            all_tag_descriptions[tag] = column_names[i]
-                            break
+            # 태그 설명 딕셔너리 생성 (태그가 추출된 첫 번째 DataFrame 기준)
+            if len(all_extracted_dfs) == 1:
+                descriptions = tag_descriptions(metadata)
+                all_tag_descriptions = {tag: descriptions[tag] for tag in found_tags if tag in descriptions}
 
     if not all_extracted_dfs:
         print("추출된 데이터가 없습니다.")
@@ -79,13 +115,19 @@ def visualize_target_tags_multi_ordered(dfs, metadatas, target_tags, time_column
     print(f"아날로그 신호: {len(analog_signals)}개")
 
     # 각각 가시화
-    dio_fig = plot_dio_signals_ordered(all_extracted_dfs, dio_signals, time_column, all_tag_descriptions, df_labels)
-    analog_fig = plot_analog_signals_ordered(all_extracted_dfs, analog_signals, time_column, all_tag_descriptions, df_labels)
+    plot_dio, plot_analog = backend_plotters(backend)
+
+    pyramids = all_pyramids if pyramids else None
+    dio_fig = plot_dio(all_extracted_dfs, dio_signals, time_column, all_tag_descriptions, all_labels,
+                       pyramids=pyramids, time_range=time_range, dpi=dpi)
+    analog_fig = plot_analog(all_extracted_dfs, analog_signals, time_column, all_tag_descriptions, all_labels,
+                             pyramids=pyramids, time_range=time_range, dpi=dpi)
 
     return dio_fig, analog_fig
 
 
-def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descriptions=None, df_labels=None):
+def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descriptions=None, df_labels=None,
+                             pyramids=None, time_range=None, dpi=None):
     """
     DIO 신호들을 순서대로 가시화 (여러 DataFrame 지원)
 
@@ -95,11 +137,16 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
     - time_column: 시간 컬럼명 (표시용, 실제 X축은 인덱스 사용)
     - tag_descriptions: 태그 설명 딕셔너리
     - df_labels: DataFrame 라벨 리스트 (예: ['DF1', 'DF2'])
+    - pyramids: DataFrame별 다중 해상도 요약 리스트 (있으면 표시 구간에 맞는 레벨로 그림)
+    - time_range: 표시 시간 구간 (start, end), None이면 전체
+    - dpi: 저장할 해상도 (요약 레벨 선택 기준, None이면 그림 기본 dpi)
     """
     if not dio_signals:
         print("DIO 신호가 없습니다.")
         return None
 
+    import matplotlib.pyplot as plt
+
     # 단일 DataFrame인 경우 리스트로 변환
     if isinstance(dfs, pd.DataFrame):
         dfs = [dfs]
@@ -122,6 +169,9 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
 
     plt.suptitle('DIO 신호 모니터링 (다중 DataFrame)', fontsize=16, fontweight='bold')
 
+    # 요약 레벨 선택 기준: 저장할 그림의 가로 픽셀 수만큼의 점
+    min_points = int(fig.get_figwidth() * (dpi or fig.dpi))
+
     # dio_signals는 이미 원본 순서대로 정렬되어 있음
     for i, signal in enumerate(dio_signals):
         ax = axes[i]
@@ -131,8 +181,22 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
             if signal not in df.columns:
                 continue
 
+            color = colors[df_idx % len(colors)]
+            linestyle = line_styles[df_idx % len(line_styles)]
+
+            # 요약 레벨이 있으면 구간 내 ON 여부(min~max)와 마지막 상태를 그림
+            x_data, window = _pyramid_trace(df, signal, pyramids, df_idx, time_column, time_range, min_points)
+            if window is not None:
+                ax.fill_between(x_data, window['min'], window['max'], step='post',
+                                color=color, alpha=0.2, linewidth=0)
+                ax.step(x_data, window['last'], where='post', linewidth=1.5,
+                        color=color, linestyle=linestyle,
+                        label=f'{df_labels[df_idx]}', alpha=0.8)
+                continue
+
             # X축은 인덱스 사용 (시간 정보 제거)
-            x_data = range(len(df))
+            i0, i1 = _row_window(df, time_column, time_range)
+            x_data = range(i0, i1)
 
             # 아날로그 데이터 변환
             if isinstance(df[signal], pd.Series):
@@ -142,13 +206,10 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
             else:
                 signal_data = pd.Series(df[signal])
 
-            dio_data = signal_data.map({'ON': 1, 'OFF': 0, '1': 1, '0': 0, 1: 1, 0: 0, True: 1, False: 0})
+            dio_data = signal_data.iloc[i0:i1].map({'ON': 1, 'OFF': 0, '1': 1, '0': 0, 1: 1, 0: 0, True: 1, False: 0})
             dio_data = pd.to_numeric(dio_data, errors='coerce')
 
             # 계단형 플롯
-            color = colors[df_idx % len(colors)]
-            linestyle = line_styles[df_idx % len(line_styles)]
-
             ax.step(x_data, dio_data, where='post', linewidth=1.5,
                     color=color, linestyle=linestyle,
                     label=f'{df_labels[df_idx]}', alpha=0.8)
@@ -174,10 +235,10 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
         if len(dfs) > 1:
             ax.legend(loc='upper right', fontsize=7, framealpha=0.8)
 
-        # 현재 상태 표시 (각 DataFrame별)
+        # 현재 상태 표시 (각 DataFrame별, 표시 구간의 마지막 값)
         for df_idx, df in enumerate(dfs):
             if signal in df.columns:
-                current_val = df[signal].iloc[-1]
+                current_val = _window_last(df, signal, time_column, time_range)
                 current_state = 'ON' if str(current_val).upper() in ['ON', '1', 'TRUE'] else 'OFF'
 
                 # Y 위치를 DataFrame 개수에 따라 조정
@@ -194,24 +255,36 @@ def plot_dio_signals_ordered(dfs, dio_signals, time_column='Date', tag_descripti
 
     # X축 틱을 적절히 조정
     if len(dfs) > 0:
-        max_len = max(len(df) for df in dfs)
-        if max_len > 100:
+        x_start, x_end = 0, max(len(df) for df in dfs)
+
+        # 표시 구간이 지정되면 X축 범위 제한
+        if time_range is not None:
+            x_start, x_end = _row_window(dfs[0], time_column, time_range)
+            axes[-1].set_xlim(x_start, max(x_start, x_end - 1))
+
+        if x_end - x_start > 100:
             # 데이터가 많으면 틱 간격 조정
-            tick_interval = max_len // 10
-            axes[-1].set_xticks(range(0, max_len, tick_interval))
+            tick_interval = (x_end - x_start) // 10
+            axes[-1].set_xticks(range(x_start, x_end, tick_interval))
 
     plt.tight_layout()
     return fig
 
 
-def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_descriptions=None, df_labels=None):
+def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_descriptions=None, df_labels=None,
+                                pyramids=None, time_range=None, dpi=None):
     """
     아날로그 신호들을 순서대로 가시화 (여러 DataFrame 지원)
+
+    pyramids가 주어지면 표시 구간과 그림 폭에 충분한 가장 거친 요약 레벨을
+    min/max 범위 + 평균선으로 그리므로, 이력 길이와 무관하게 그리는 비용이 일정하다.
     """
     if not analog_signals:
         print("아날로그 신호가 없습니다.")
         return None
 
+    import matplotlib.pyplot as plt
+
     # 단일 DataFrame인 경우 리스트로 변환
     if isinstance(dfs, pd.DataFrame):
         dfs = [dfs]
@@ -234,6 +307,9 @@ def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_des
 
     plt.suptitle('아날로그 신호 모니터링 (다중 DataFrame)', fontsize=16, fontweight='bold')
 
+    # 요약 레벨 선택 기준: 저장할 그림의 가로 픽셀 수만큼의 점
+    min_points = int(fig.get_figwidth() * (dpi or fig.dpi))
+
     # analog_signals는 이미 원본 순서대로 정렬되어 있음
     for i, signal in enumerate(analog_signals):
         ax = axes[i]
@@ -243,8 +319,22 @@ def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_des
             if signal not in df.columns:
                 continue
 
+            color = colors[df_idx % len(colors)]
+            linestyle = line_styles[df_idx % len(line_styles)]
+
+            # 요약 레벨이 있으면 min/max 범위와 평균선을 그림
+            x_data, window = _pyramid_trace(df, signal, pyramids, df_idx, time_column, time_range, min_points)
+            if window is not None:
+                ax.fill_between(x_data, window['min'], window['max'], step='post',
+                                color=color, alpha=0.2, linewidth=0)
+                ax.plot(x_data, window['mean'], linewidth=1.5, drawstyle='steps-post',
+                        color=color, linestyle=linestyle,
+                        label=f'{df_labels[df_idx]}', alpha=0.8)
+                continue
+
             # X축은 인덱스 사용 (시간 정보 제거)
-            x_data = range(len(df))
+            i0, i1 = _row_window(df, time_column, time_range)
+            x_data = range(i0, i1)
 
             # 아날로그 데이터 변환
             if isinstance(df[signal], pd.Series):
@@ -254,12 +344,9 @@ def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_des
             else:
                 signal_data = pd.Series(df[signal])
 
-            analog_data = pd.to_numeric(signal_data, errors='coerce')
+            analog_data = pd.to_numeric(signal_data.iloc[i0:i1], errors='coerce')
 
             # 연속형 플롯
-            color = colors[df_idx % len(colors)]
-            linestyle = line_styles[df_idx % len(line_styles)]
-
             ax.plot(x_data, analog_data, linewidth=1.5,
                     color=color, linestyle=linestyle,
                     label=f'{df_labels[df_idx]}', alpha=0.8)
@@ -285,11 +372,387 @@ def plot_analog_signals_ordered(dfs, analog_signals, time_column='Date', tag_des
 
     # X축 틱을 적절히 조정
     if len(dfs) > 0:
-        max_len = max(len(df) for df in dfs)
-        if max_len > 100:
+        x_start, x_end = 0, max(len(df) for df in dfs)
+
+        # 표시 구간이 지정되면 X축 범위 제한
+        if time_range is not None:
+            x_start, x_end = _row_window(dfs[0], time_column, time_range)
+            axes[-1].set_xlim(x_start, max(x_start, x_end - 1))
+
+        if x_end - x_start > 100:
             # 데이터가 많으면 틱 간격 조정
-            tick_interval = max_len // 10
-            axes[-1].set_xticks(range(0, max_len, tick_interval))
+            tick_interval = (x_end - x_start) // 10
+            axes[-1].set_xticks(range(x_start, x_end, tick_interval))
 
     plt.tight_layout()
     return fig
+
+
+# ============================================================================
+# 빠른 렌더링 백엔드 (한 축에 오프셋으로 쌓아 그림)
+# ============================================================================
+#
+# 신호마다 서브플롯/텍스트 상자/범례를 만들고 tight_layout을 계산하는 비용이
+# 태그가 많은 step(60~90개)에서는 데이터보다 크다. 여기서는 모든 신호를 한 축에
+# 행 오프셋으로 쌓아 DataFrame별 LineCollection 하나로 그리고, 태그명/설명과
+# 현재 상태는 축 눈금 라벨로 표시하며, 레이아웃은 고정값을 사용한다.
+
+STACKED_ROW_HEIGHT = 0.28   # 신호 한 행의 높이 (inch)
+STACKED_BAND = 0.8          # 행 안에서 신호가 차지하는 비율
+
+
+def plot_dio_signals_stacked(dfs, dio_signals, time_column='Date', tag_descriptions=None, df_labels=None,
+                             pyramids=None, time_range=None, dpi=None):
+    """
+    DIO 신호들을 한 축에 순서대로 쌓아 가시화 (plot_dio_signals_ordered의 빠른 버전)
+
+    Parameters:
+    - plot_dio_signals_ordered와 동일
+    """
+    if not dio_signals:
+        print("DIO 신호가 없습니다.")
+        return None
+
+    return _plot_signals_stacked(dfs, dio_signals, time_column, tag_descriptions, df_labels, pyramids, time_range,
+                                 title='DIO 신호 모니터링 (다중 DataFrame)', is_dio=True, dpi=dpi,
+                                 colors=['red', 'blue', 'green', 'purple', 'orange', 'brown'])
+
+
+def plot_analog_signals_stacked(dfs, analog_signals, time_column='Date', tag_descriptions=None, df_labels=None,
+                                pyramids=None, time_range=None, dpi=None):
+    """
+    아날로그 신호들을 한 축에 순서대로 쌓아 가시화 (plot_analog_signals_ordered의 빠른 버전)
+
+    각 신호는 자기 행 안에서 min~max로 정규화되며, 실제 범위는 눈금 라벨에 표시한다.
+    """
+    if not analog_signals:
+        print("아날로그 신호가 없습니다.")
+        return None
+
+    return _plot_signals_stacked(dfs, analog_signals, time_column, tag_descriptions, df_labels, pyramids, time_range,
+                                 title='아날로그 신호 모니터링 (다중 DataFrame)', is_dio=False, dpi=dpi,
+                                 colors=['darkgreen', 'darkblue', 'darkred', 'purple', 'orange', 'brown'])
+
+
+def _plot_signals_stacked(dfs, signals, time_column, tag_descriptions, df_labels, pyramids, time_range,
+                          title, is_dio, colors, dpi=None):
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    # 단일 DataFrame인 경우 리스트로 변환
+    if isinstance(dfs, pd.DataFrame):
+        dfs = [dfs]
+
+    # DataFrame 라벨 설정
+    if df_labels is None:
+        df_labels = [f'DF{i+1}' for i in range(len(dfs))]
+
+    n_signals = len(signals)
+    fig_height = max(4, n_signals * STACKED_ROW_HEIGHT + 1.2)
+    fig = plt.figure(figsize=(15, fig_height))
+    ax = fig.add_axes(_stacked_axes_rect(fig_height))
+    fig.suptitle(title, fontsize=16, fontweight='bold', y=1 - 0.25 / fig_height)
+
+    min_points = int(fig.get_figwidth() * (dpi or fig.dpi))
+
+    # 신호별 (X, Y) 준비 - 위에서부터 원본 순서대로 행 배치
+    traces = {df_idx: [] for df_idx in range(len(dfs))}
+    envelopes = {df_idx: [] for df_idx in range(len(dfs))}
+    value_ranges = []
+
+    for i, signal in enumerate(signals):
+        row = n_signals - 1 - i
+        raw_traces = []
+        for df_idx, df in enumerate(dfs):
+            if signal not in df.columns:
+                continue
+
+            x_data, window = _pyramid_trace(df, signal, pyramids, df_idx, time_column, time_range, min_points)
+            if window is not None:
+                x_data = np.asarray(x_data, dtype=float)
+                y_data = window['max' if is_dio else 'mean'].to_numpy(dtype=float)
+                lo, hi = window['min'].to_numpy(dtype=float), window['max'].to_numpy(dtype=float)
+            else:
+                i0, i1 = _row_window(df, time_column, time_range)
+                x_data = np.arange(i0, i1, dtype=float)
+                signal_data = df[signal]
+                if isinstance(signal_data, pd.DataFrame):
+                    signal_data = signal_data.iloc[:, 0]
+                signal_data = signal_data.iloc[i0:i1]
+                if is_dio:
+                    signal_data = signal_data.map({'ON': 1, 'OFF': 0, '1': 1, '0': 0, 1: 1, 0: 0, True: 1, False: 0})
+                y_data = pd.to_numeric(signal_data, errors='coerce').to_numpy(dtype=float)
+                lo = hi = None
+            raw_traces.append((df_idx, x_data, y_data, lo, hi))
+
+        # 행 안에서의 정규화 범위 (DIO는 0/1 고정)
+        if is_dio:
+            vmin, vmax = 0.0, 1.0
+        else:
+            finite = [t[2 if t[3] is None else 3][np.isfinite(t[2 if t[3] is None else 3])] for t in raw_traces]
+            finite += [t[4][np.isfinite(t[4])] for t in raw_traces if t[4] is not None]
+            finite = np.concatenate(finite) if finite else np.array([])
+            vmin, vmax = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+        value_ranges.append((vmin, vmax))
+        scale = STACKED_BAND / (vmax - vmin) if vmax > vmin else 0.0
+        base = row + (1 - STACKED_BAND) / 2 + (STACKED_BAND / 2 if scale == 0.0 else 0.0)
+
+        for df_idx, x_data, y_data, lo, hi in raw_traces:
+            y_plot = base + (y_data - vmin) * scale
+            if is_dio:
+                # 계단형 좌표 (where='post')
+                x_plot, y_plot = np.repeat(x_data, 2)[1:], np.repeat(y_plot, 2)[:-1]
+            else:
+                x_plot = x_data
+            traces[df_idx].append(np.column_stack([x_plot, y_plot]))
+            if lo is not None and not is_dio:
+                envelopes[df_idx].append(np.column_stack([x_data, base + (lo - vmin) * scale]))
+                envelopes[df_idx].append(np.column_stack([x_data, base + (hi - vmin) * scale]))
+
+    # DataFrame별 LineCollection 하나로 그림
+    for df_idx in range(len(dfs)):
+        color = colors[df_idx % len(colors)]
+        if envelopes[df_idx]:
+            ax.add_collection(LineCollection(envelopes[df_idx], colors=color, linewidths=0.5, alpha=0.3))
+        if traces[df_idx]:
+            ax.add_collection(LineCollection(traces[df_idx], colors=color, linewidths=1.0, alpha=0.8,
+                                             label=df_labels[df_idx]))
+
+    # 행 구분선과 태그 라벨 (왼쪽: 태그명/설명, 오른쪽: 범위 또는 현재 상태)
+    rows = np.arange(n_signals)
+    ax.hlines(rows[1:], 0, 1, transform=ax.get_yaxis_transform(), colors='lightgray', linewidths=0.5)
+    ax.set_ylim(0, n_signals)
+    ax.set_yticks(rows + 0.5)
+    ax.set_yticklabels([_stacked_label(s, tag_descriptions) for s in reversed(signals)], fontsize=7)
+
+    right = ax.twinx()
+    right.set_ylim(0, n_signals)
+    right.set_yticks(rows + 0.5)
+    if is_dio:
+        right_labels = [_current_state_label(dfs, s, df_labels, time_column, time_range) for s in signals]
+    else:
+        right_labels = [f'{vmin:.4g} ~ {vmax:.4g}' for vmin, vmax in value_ranges]
+    right.set_yticklabels(list(reversed(right_labels)), fontsize=7)
+
+    # X축 설정 - 인덱스 기반
+    x_start, x_end = 0, max(len(df) for df in dfs)
+    if time_range is not None:
+        x_start, x_end = _row_window(dfs[0], time_column, time_range)
+    ax.set_xlim(x_start, max(x_start + 1, x_end - 1))
+    ax.set_xlabel('데이터 포인트 (인덱스)', fontsize=12)
+    ax.tick_params(axis='x', labelsize=8)
+    ax.grid(True, axis='x', alpha=0.3)
+
+    if len(dfs) > 1:
+        ax.legend(loc='upper right', fontsize=7, framealpha=0.8)
+
+    return fig
+
+
+# ============================================================================
+# 밀도(래스터) 백엔드 (여러 달을 겹친 아날로그 신호)
+# ============================================================================
+#
+# 여러 DataFrame의 선을 겹쳐 그리면 선이 서로 덮여 분포를 알 수 없다.
+# 여기서는 샘플을 (신호 행, 세로 픽셀, 가로 픽셀) 캔버스에 np.bincount로 바로 누적하고,
+# 픽셀별 개수를 log 스케일 농도로 바꿔 imshow 한 번으로 그린다.
+# 그리는 비용은 캔버스 크기로 정해지고 샘플 수, DataFrame 수와는 무관하다
+# (누적은 샘플 수에 비례하는 NumPy 연산 한 번).
+# 픽셀 색은 DataFrame별 개수로 섞고(어느 달이 많은지), 진하기는 전체 개수로 정한다.
+# 샘플이 가로 픽셀보다 적은 짧은 구간은 점으로 보이므로 stacked 백엔드가 낫다.
+
+DENSITY_ROW_PIXELS = 40     # 신호 한 행의 세로 픽셀 수
+
+
+def plot_analog_signals_density(dfs, analog_signals, time_column='Date', tag_descriptions=None, df_labels=None,
+                                pyramids=None, time_range=None, row_pixels=DENSITY_ROW_PIXELS, dpi=None):
+    """
+    아날로그 신호들을 픽셀 밀도 이미지로 가시화 (여러 DataFrame을 겹칠 때 선 대신 분포 표시)
+
+    Parameters:
+    - plot_analog_signals_ordered와 동일 (pyramids는 사용하지 않음, 원본 샘플을 누적)
+    - row_pixels: 신호 한 행의 세로 픽셀 수
+    """
+    if not analog_signals:
+        print("아날로그 신호가 없습니다.")
+        return None
+
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgb
+    from matplotlib.patches import Patch
+
+    # 단일 DataFrame인 경우 리스트로 변환
+    if isinstance(dfs, pd.DataFrame):
+        dfs = [dfs]
+
+    # DataFrame 라벨 설정
+    if df_labels is None:
+        df_labels = [f'DF{i+1}' for i in range(len(dfs))]
+
+    colors = ['darkgreen', 'darkblue', 'darkred', 'purple', 'orange', 'brown']
+
+    n_signals = len(analog_signals)
+    fig_height = max(4, n_signals * STACKED_ROW_HEIGHT + 1.2)
+    fig = plt.figure(figsize=(15, fig_height))
+    rect = _stacked_axes_rect(fig_height)
+    ax = fig.add_axes(rect)
+    fig.suptitle('아날로그 신호 밀도 (다중 DataFrame)', fontsize=16, fontweight='bold', y=1 - 0.25 / fig_height)
+
+    # X축 범위 (인덱스 기반, 다른 백엔드와 같음)와 캔버스 크기 (축의 가로 픽셀 수)
+    x_start, x_end = 0, max(len(df) for df in dfs)
+    if time_range is not None:
+        x_start, x_end = _row_window(dfs[0], time_column, time_range)
+    x_end = max(x_start + 1, x_end)
+    width = max(1, int(fig.get_figwidth() * (dpi or fig.dpi) * rect[2]))
+    height = n_signals * row_pixels
+
+    # 신호별 값과 행 안에서의 정규화 범위 (모든 DataFrame 공통)
+    samples = []
+    value_ranges = []
+    for signal in analog_signals:
+        per_df = []
+        for df_idx, df in enumerate(dfs):
+            if signal not in df.columns:
+                continue
+            i0, i1 = _row_window(df, time_column, time_range)
+            i0, i1 = max(i0, x_start), min(i1, x_end)
+            signal_data = df[signal]
+            if isinstance(signal_data, pd.DataFrame):
+                signal_data = signal_data.iloc[:, 0]
+            values = pd.to_numeric(signal_data.iloc[i0:i1], errors='coerce').to_numpy(dtype=float)
+            per_df.append((df_idx, i0, values))
+        finite = [v[np.isfinite(v)] for _, _, v in per_df]
+        finite = np.concatenate(finite) if finite else np.array([])
+        value_ranges.append((float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0))
+        samples.append(per_df)
+
+    # 신호 한 행(row_pixels × width)씩 DataFrame별 개수를 누적해 미리 할당한 이미지의 그 행을 채움
+    # (개수는 uint32, 색은 float32라 메모리는 이미지 하나 + 한 행 분량)
+    # 색: 픽셀의 DataFrame별 개수로 가중 평균한 색, 농도: 행마다 log(1 + 전체 개수)를 최대값으로 정규화
+    palette = np.array([to_rgb(colors[i % len(colors)]) for i in range(len(dfs))], dtype=np.float32)
+    image = np.ones((height, width, 3), dtype=np.float32)
+    counts = np.zeros((len(dfs), row_pixels * width), dtype=np.uint32)
+    for row, (per_df, (vmin, vmax)) in enumerate(zip(samples, value_ranges)):
+        counts[:] = 0
+        for df_idx, i0, values in per_df:
+            valid = np.isfinite(values)
+            px = ((np.flatnonzero(valid) + (i0 - x_start)) * width // (x_end - x_start)).clip(0, width - 1)
+            if vmax > vmin:
+                py = ((vmax - values[valid]) / (vmax - vmin) * (row_pixels - 1)).round().astype(np.int64)
+            else:
+                py = np.full(px.shape, row_pixels // 2, dtype=np.int64)
+            counts[df_idx] += np.bincount(py * width + px, minlength=row_pixels * width).astype(np.uint32)
+
+        total = counts.sum(axis=0, dtype=np.uint32)
+        peak = np.log1p(np.float32(total.max()))
+        if peak == 0:
+            continue
+        mixed = (palette.T @ counts).T / np.maximum(total, 1)[:, None]
+        density = np.log1p(total.astype(np.float32)) / peak
+
+        # 흰 바탕에서 농도만큼 섞인 색으로 (위에서부터 원본 순서대로 행 배치)
+        block = image[row * row_pixels:(row + 1) * row_pixels].reshape(-1, 3)
+        block[:] = 1.0 - density[:, None] * (1.0 - mixed)
+
+    ax.imshow(image, aspect='auto', interpolation='nearest', extent=(x_start, x_end, 0, n_signals))
+
+    # 행 구분선과 태그 라벨 (왼쪽: 태그명/설명, 오른쪽: 범위)
+    rows = np.arange(n_signals)
+    ax.hlines(rows[1:], x_start, x_end, colors='lightgray', linewidths=0.5)
+    ax.set_ylim(0, n_signals)
+    ax.set_yticks(rows + 0.5)
+    ax.set_yticklabels([_stacked_label(s, tag_descriptions) for s in reversed(analog_signals)], fontsize=7)
+
+    right = ax.twinx()
+    right.set_ylim(0, n_signals)
+    right.set_yticks(rows + 0.5)
+    right.set_yticklabels([f'{vmin:.4g} ~ {vmax:.4g}' for vmin, vmax in reversed(value_ranges)], fontsize=7)
+
+    ax.set_xlim(x_start, x_end)
+    ax.set_xlabel('데이터 포인트 (인덱스)', fontsize=12)
+    ax.tick_params(axis='x', labelsize=8)
+
+    if len(dfs) > 1:
+        handles = [Patch(color=colors[i % len(colors)], label=label) for i, label in enumerate(df_labels)]
+        ax.legend(handles=handles, loc='upper right', fontsize=7, framealpha=0.8)
+
+    return fig
+
+
+def backend_plotters(backend='subplots'):
+    """
+    렌더링 백엔드 이름 → (DIO 플롯 함수, 아날로그 플롯 함수)
+
+    - 'subplots': 신호별 서브플롯 (plot_*_signals_ordered)
+    - 'stacked' : 한 축에 오프셋으로 쌓은 빠른 렌더링
+    - 'density' : 아날로그는 픽셀 밀도 이미지, DIO는 stacked
+    """
+    if backend == 'stacked':
+        return plot_dio_signals_stacked, plot_analog_signals_stacked
+    if backend == 'density':
+        return plot_dio_signals_stacked, plot_analog_signals_density
+    return plot_dio_signals_ordered, plot_analog_signals_ordered
+
+
+def _stacked_axes_rect(fig_height):
+    # 고정 레이아웃: 왼쪽은 태그 라벨, 오른쪽은 상태/범위 라벨, 위는 제목, 아래는 X축 라벨 공간
+    top, bottom = 0.6 / fig_height, 0.6 / fig_height
+    return [0.2, bottom, 0.68, 1 - top - bottom]
+
+
+def _stacked_label(signal, tag_descriptions):
+    if tag_descriptions and signal in tag_descriptions:
+        return f'{signal}  {tag_descriptions[signal]}'
+    return signal
+
+
+def _current_state_label(dfs, signal, df_labels, time_column='Date', time_range=None):
+    # 현재 상태 표시 (각 DataFrame별, 표시 구간의 마지막 값)
+    states = []
+    for df_idx, df in enumerate(dfs):
+        if signal in df.columns:
+            current_val = _window_last(df, signal, time_column, time_range)
+            current_state = 'ON' if str(current_val).upper() in ['ON', '1', 'TRUE'] else 'OFF'
+            states.append(f'{df_labels[df_idx]}: {current_state}')
+    return '  '.join(states)
+
+
+def _row_window(df, time_column, time_range):
+    """
+    time_range에 해당하는 행 범위 (i0, i1) 반환 (X축 인덱스 기준, 시간 컬럼은 정렬되어 있다고 가정)
+    """
+    if time_range is None or time_column not in df.columns:
+        return 0, len(df)
+    times = df[time_column]
+    i0 = times.searchsorted(pd.Timestamp(time_range[0]), side='left')
+    i1 = times.searchsorted(pd.Timestamp(time_range[1]), side='right')
+    return int(i0), int(i1)
+
+
+def _window_last(df, signal, time_column, time_range):
+    # 표시 구간(time_range)의 마지막 값 (구간에 행이 없으면 None)
+    i0, i1 = _row_window(df, time_column, time_range)
+    return df[signal].iloc[i1 - 1] if i1 > i0 else None
+
+
+def _pyramid_trace(df, signal, pyramids, df_idx, time_column, time_range, min_points):
+    """
+    피라미드에서 표시 구간에 맞는 레벨의 요약을 찾아 (X 위치, 요약 DataFrame) 반환
+
+    버킷 시작 시각을 원본 시간 컬럼에서 찾아 인덱스 기반 X축 위치로 바꾸므로
+    원본을 그릴 때와 같은 축을 공유한다. 사용할 레벨이 없으면 (None, None).
+    """
+    if not pyramids or df_idx >= len(pyramids) or not pyramids[df_idx] or time_column not in df.columns:
+        return None, None
+
+    if time_range is None:
+        start, end = df[time_column].iloc[0], df[time_column].iloc[-1]
+    else:
+        start, end = time_range
+
+    freq, window = pyramid_window(pyramids[df_idx], signal, start, end, min_points)
+    if window is None:
+        return None, None
+
+    x_data = df[time_column].searchsorted(window.index)
+    return x_data, window